@@ -1,71 +1,292 @@
-import sys
+#!/usr/bin/env python3
+"""
+StudyHub Data Inspector
+=======================
+
+Profiles a workbook, a CSV file, a directory of CSVs/workbooks or the whole
+public/ tree without loading any sheet into memory. Rows are streamed
+(read-only openpyxl for .xlsx, csv.reader for .csv) and each sheet or file
+gets:
+
+- row and column counts, byte size (file size; compressed/XML size per sheet)
+- per column: null rate, distinct values (exact up to DISTINCT_EXACT, then
+  a bounded k-minimum-values estimate, shown as ~N), the longest value and
+  the total value bytes
+- with --sample N, a uniform reservoir sample of N rows
+
+Memory per column is bounded, so gigabyte-scale inputs are fine.
+The content-hashed copies under public/hashed/ (scripts/asset_manifest.py)
+are skipped.
+
+Usage:
+    python inspect_data.py                       # the whole public/ tree
+    python inspect_data.py public/data/subjects/physics.xlsx --sample 5
+    python inspect_data.py public/questionnaire --json report.json
+"""
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
 import os
+import posixpath
+import random
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+import xlsx_reader  # noqa: E402
+from asset_manifest import HASHED_DIR  # noqa: E402
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_PATH = BASE_DIR / 'public'
+SUFFIXES = {'.xlsx', '.csv'}
+
+DISTINCT_EXACT = 1024     # k for the k-minimum-values sketch; exact below this
+PREVIEW_CHARS = 40
+
+
+# ============================================================================
+# COLUMN PROFILES
+# ============================================================================
+
+class DistinctCounter:
+    """Exact distinct count up to k values, then a k-minimum-values estimate"""
+
+    def __init__(self, k=DISTINCT_EXACT):
+        self.k = k
+        self.heap = []      # max-heap (negated) of the k smallest hashes
+        self.members = set()
+
+    def add(self, text):
+        h = int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+        if h in self.members:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, -h)
+            self.members.add(h)
+        elif h < -self.heap[0]:
+            self.members.discard(-heapq.heappushpop(self.heap, -h))
+            self.members.add(h)
+
+    @property
+    def exact(self):
+        return len(self.heap) < self.k
+
+    def estimate(self):
+        if self.exact:
+            return len(self.heap)
+        return int((self.k - 1) / (-self.heap[0] / 2 ** 64))
+
+class ColumnProfile:
+    def __init__(self, name):
+        self.name = name
+        self.nulls = 0
+        self.value_bytes = 0
+        self.longest = ''
+        self.longest_len = 0
+        self.distinct = DistinctCounter()
+
+    def add(self, value):
+        if value is None or value == '':
+            self.nulls += 1
+            return
+        text = value if isinstance(value, str) else str(value)
+        self.value_bytes += len(text.encode('utf-8'))
+        if len(text) > self.longest_len:
+            self.longest_len = len(text)
+            self.longest = text[:PREVIEW_CHARS]
+        self.distinct.add(text)
+
+    def summary(self, rows):
+        return {
+            'column': self.name,
+            'null_rate': round(self.nulls / rows, 4) if rows else 0.0,
+            'distinct': self.distinct.estimate(),
+            'distinct_exact': self.distinct.exact,
+            'longest': self.longest_len,
+            'longest_preview': self.longest,
+            'value_bytes': self.value_bytes,
+        }
+
+def profile_rows(rows, sample_size=0, rng=None):
+    """Profile an iterator of rows (header first); returns the summary dict"""
+    header = next(rows, None)
+    if header is None:
+        return {'rows': 0, 'columns': [], 'sample': []}
+    names = [str(v) if v not in (None, '') else f'col_{i}' for i, v in enumerate(header)]
+    columns = [ColumnProfile(name) for name in names]
+    reservoir = []
+    count = 0
+
+    for row in rows:
+        if not any(v not in (None, '') for v in row):
+            continue
+        count += 1
+        if len(row) > len(columns):
+            # Values beyond the header: profile them under generated names
+            columns += [ColumnProfile(f'col_{i}') for i in range(len(columns), len(row))]
+        for column, value in zip(columns, row):
+            column.add(value)
+        for column in columns[len(row):]:
+            column.add(None)
 
-def install_and_import(package):
-    import importlib
+        if sample_size:
+            if len(reservoir) < sample_size:
+                reservoir.append(row)
+            else:
+                slot = rng.randrange(count)
+                if slot < sample_size:
+                    reservoir[slot] = row
+
+    names = [column.name for column in columns]
+    return {
+        'rows': count,
+        'columns': [column.summary(count) for column in columns],
+        'sample': [{name: _jsonable(value) for name, value in zip(names, row)} for row in reservoir],
+    }
+
+def _jsonable(value):
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def _sheet_sizes(path):
+    """{sheet name: (compressed, uncompressed)} for a workbook's worksheet XML parts"""
+    ns = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+          'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+          'p': 'http://schemas.openxmlformats.org/package/2006/relationships'}
     try:
-        importlib.import_module(package)
-    except ImportError:
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-    finally:
-        globals()[package] = importlib.import_module(package)
+        with zipfile.ZipFile(path) as archive:
+            rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+            targets = {rel.get('Id'): rel.get('Target') for rel in rels.findall('p:Relationship', ns)}
+            book = ET.fromstring(archive.read('xl/workbook.xml'))
+            sizes = {}
+            for sheet in book.findall('m:sheets/m:sheet', ns):
+                target = targets.get(sheet.get(f"{{{ns['r']}}}id"), '')
+                name = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                try:
+                    info = archive.getinfo(name)
+                    sizes[sheet.get('name')] = (info.compress_size, info.file_size)
+                except KeyError:
+                    pass
+            return sizes
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return {}
 
-try:
-    import pandas as pd
-except ImportError:
-    print("Pandas not found. Attempting to inspect with openpyxl directly if available, or just failing gracefully.")
+def _csv_rows(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        yield from csv.reader(f)
+
+def inspect_workbook(path, sample_size=0, rng=None):
+    sizes = _sheet_sizes(path)
+    workbook = xlsx_reader.open_read_only(path)
     try:
-        import openpyxl
-    except ImportError:
-        print("openpyxl not found either.")
+        sheets = []
+        for name in workbook.sheetnames:
+            report = profile_rows(xlsx_reader.iter_sheet_rows(workbook, name), sample_size, rng)
+            compressed, uncompressed = sizes.get(name, (None, None))
+            sheets.append({'sheet': name, 'compressed_bytes': compressed, 'xml_bytes': uncompressed, **report})
+    finally:
+        workbook.close()
+    return {'path': str(path), 'kind': 'workbook', 'bytes': path.stat().st_size, 'sheets': sheets}
 
-try:
-    from docx import Document
-except ImportError:
-    print("python-docx not found.")
-    Document = None
+def inspect_csv(path, sample_size=0, rng=None):
+    report = profile_rows(_csv_rows(path), sample_size, rng)
+    return {'path': str(path), 'kind': 'csv', 'bytes': path.stat().st_size, **report}
 
-excel_path = r"C:\Code\Harshi-App\build\data\subjects\physics.xlsx"
-docx_path = r"D:\ChatGpt\Harshi\Comprehensive study guide\1.4.1 Comprehensive Guide Format for Grade 8 Physics.docx"
+def collect_files(path):
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(p for p in path.rglob('*')
+                  if p.is_file() and p.suffix.lower() in SUFFIXES and not p.name.startswith('~$')
+                  and p.relative_to(path).parts[0] != HASHED_DIR)
 
-print(f"--- Inspecting Excel: {excel_path} ---")
-if os.path.exists(excel_path):
-    try:
-        # Try reading with pandas
-        try:
-            df = pd.read_excel(excel_path)
-            print("Columns:", df.columns.tolist())
-            print("First 2 rows:")
-            print(df.head(2).to_string())
-        except Exception as e:
-            print(f"Pandas read failed: {e}")
-            # Fallback to openpyxl
-            import openpyxl
-            wb = openpyxl.load_workbook(excel_path)
-            sheet = wb.active
-            print("OpenPyXL - Sheet Names:", wb.sheetnames)
-            print("OpenPyXL - First Row (Values):")
-            for row in sheet.iter_rows(min_row=1, max_row=1, values_only=True):
-                print(row)
-    except Exception as e:
-        print(f"Failed to read Excel: {e}")
-else:
-    print("Excel file not found.")
-
-print(f"\n--- Inspecting Docx: {docx_path} ---")
-if os.path.exists(docx_path):
-    if Document:
+def inspect_path(path, sample_size=0, seed=None):
+    rng = random.Random(seed)
+    reports = []
+    for file_path in collect_files(path):
         try:
-            doc = Document(docx_path)
-            full_text = []
-            for para in doc.paragraphs:
-                full_text.append(para.text)
-            print("Docx Content Sample (first 1000 chars):")
-            print("\n".join(full_text)[:1000])
+            if file_path.suffix.lower() == '.xlsx':
+                reports.append(inspect_workbook(file_path, sample_size, rng))
+            else:
+                reports.append(inspect_csv(file_path, sample_size, rng))
         except Exception as e:
-            print(f"Failed to read Docx: {e}")
-    else:
-        print("python-docx library not available to read docx.")
-else:
-    print("Docx file not found.")
+            reports.append({'path': str(file_path), 'kind': 'error', 'error': str(e)})
+    return reports
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _size(num):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num < 1024 or unit == 'GB':
+            return f"{num:.0f} {unit}" if unit == 'B' else f"{num:.1f} {unit}"
+        num /= 1024
+
+def _print_table(report, indent):
+    print(f"{indent}{report['rows']} rows, {len(report['columns'])} columns")
+    if report['columns']:
+        width = min(max(len(c['column']) for c in report['columns']), 28)
+        print(f"{indent}{'column':{width}}  {'nulls':>6}  {'distinct':>9}  {'bytes':>9}  longest")
+        for c in report['columns']:
+            distinct = str(c['distinct']) if c['distinct_exact'] else f"~{c['distinct']}"
+            preview = c['longest_preview'].replace('\n', ' ')
+            print(f"{indent}{c['column'][:width]:{width}}  {c['null_rate']:>6.1%}  {distinct:>9}  "
+                  f"{_size(c['value_bytes']):>9}  {c['longest']} {preview!r}")
+    for i, row in enumerate(report['sample'], 1):
+        print(f"{indent}sample {i}: {json.dumps(row, ensure_ascii=False)}")
+
+def print_report(reports, root):
+    root = Path(root)
+    for report in reports:
+        path = Path(report['path'])
+        label = path.relative_to(root) if path.is_relative_to(root) and path != root else path.name
+        if report['kind'] == 'error':
+            print(f"\n[ERROR] {label}: {report['error']}")
+            continue
+        print(f"\n=== {label} ({_size(report['bytes'])}) ===")
+        if report['kind'] == 'workbook':
+            for sheet in report['sheets']:
+                sizes = f", {_size(sheet['compressed_bytes'])} compressed / {_size(sheet['xml_bytes'])} XML" \
+                    if sheet['xml_bytes'] is not None else ''
+                print(f"  [{sheet['sheet']}]{sizes}")
+                _print_table(sheet, '    ')
+        else:
+            _print_table(report, '  ')
+
+    files = [r for r in reports if r['kind'] != 'error']
+    rows = sum(sum(s['rows'] for s in r['sheets']) if r['kind'] == 'workbook' else r['rows'] for r in files)
+    print(f"\n[*] {len(files)} files, {rows} rows, {_size(sum(r['bytes'] for r in files))}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile workbooks and CSV trees in bounded memory')
+    parser.add_argument('path', nargs='?', default=str(DEFAULT_PATH), help='Workbook, CSV file or directory (default: public/)')
+    parser.add_argument('--sample', type=int, default=0, metavar='N', help='Reservoir-sample N rows per sheet/file')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for --sample')
+    parser.add_argument('--json', metavar='PATH', help='Also write the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Error: {args.path} not found")
+        sys.exit(1)
+
+    reports = inspect_path(args.path, args.sample, args.seed)
+    print_report(reports, args.path)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"[+] Created: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+/* eslint-disable no-restricted-globals */
+/**
+ * Data service worker for Harshi-App
+ * Serves the content trees (CSV/JSON/HTML under questionnaire/, studyguide/,
+ * Handout/ and data/) network-first, falling back to the copies cached by
+ * src/services/precache.js when the network is slow or offline.
+ */
+
+const DATA_CACHE = 'studyhub-data';
+const NETWORK_TIMEOUT_MS = 4000;
+const DATA_PATH = /\/(questionnaire|studyguide|Handout|data)\/.*\.(csv|json|html)$/;
+
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(self.clients.claim()));
+
+const withTimeout = (promise, ms) => new Promise((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error('timeout')), ms);
+    promise.then(
+        value => { clearTimeout(timer); resolve(value); },
+        error => { clearTimeout(timer); reject(error); }
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin || !DATA_PATH.test(url.pathname)) {
+        return;
+    }
+
+    event.respondWith((async () => {
+        const cache = await caches.open(DATA_CACHE);
+        const network = fetch(request);
+        try {
+            const response = await withTimeout(network, NETWORK_TIMEOUT_MS);
+            if (response.ok && !request.headers.has('Range')) {
+                cache.put(url.pathname, response.clone());
+            }
+            return response;
+        } catch (error) {
+            const cached = await cache.match(url.pathname);
+            return cached || network;
+        }
+    })());
+});
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Content-Hashed Asset Manifest for Harshi-App
+Copies every generated content file (questionnaire/, studyguide/, Handout/
+CSV and JSON, plus data/achievements.json) under public/hashed/ with a name
+that carries its content hash, e.g.
+hashed/questionnaire/Physics/Newtons_Laws/questions.3fa2c1d9e0.csv, and
+writes public/content-manifest.json mapping logical paths to hashed ones.
+Keeping the copies out of the content trees means tools walking those trees
+only ever see logical files.
+
+Hashed files never change, so they can be served with
+`Cache-Control: public, max-age=31536000, immutable`; only the small manifest
+needs a short TTL (e.g. `max-age=60`). The client resolves paths through the
+manifest (src/services/assetManifest.js) and falls back to the logical files,
+which are still written, when it is missing.
+
+Each run is a generation, recorded in content-manifest.history.json. Hashed
+files that are no longer referenced by any of the last KEEP_GENERATIONS
+generations are deleted, so clients holding an older manifest keep working
+for a few builds.
+
+Once a manifest exists, every converter run refreshes it (refresh()), so it
+never points at content older than the logical files.
+
+Usage:
+    python scripts/asset_manifest.py [--keep-generations N]
+    python scripts/convert_to_csv.py --hashed [--keep-generations N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+PUBLIC_DIR = BASE_DIR / 'public'
+MANIFEST_NAME = 'content-manifest.json'
+HISTORY_NAME = 'content-manifest.history.json'
+
+# Trees (and single files) under public/ whose CSV/JSON artifacts are hashed
+CONTENT_TREES = ['questionnaire', 'studyguide', 'Handout']
+CONTENT_FILES = ['data/achievements.json']
+ASSET_SUFFIXES = {'.csv', '.json'}
+
+HASHED_DIR = 'hashed'
+HASH_LENGTH = 10
+KEEP_GENERATIONS = 3
+
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def hashed_path(logical, data):
+    """Relative path of a logical asset's hashed copy, e.g. hashed/studyguide/.../content.<hash>.csv"""
+    path = Path(HASHED_DIR) / logical
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+def logical_assets(public_dir):
+    """Un-hashed content files under public_dir, as sorted POSIX paths relative to it"""
+    paths = [public_dir / name for name in CONTENT_FILES if (public_dir / name).is_file()]
+    for tree in CONTENT_TREES:
+        if (public_dir / tree).is_dir():
+            paths += [p for p in (public_dir / tree).rglob('*') if p.is_file() and p.suffix in ASSET_SUFFIXES]
+    return sorted(p.relative_to(public_dir).as_posix() for p in paths)
+
+def write_hashed(public_dir, logical):
+    """Write the hashed copy of one logical asset (if new); returns its relative path"""
+    data = (public_dir / logical).read_bytes()
+    relative = hashed_path(logical, data)
+    target = public_dir / relative
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+    return relative
+
+
+# ============================================================================
+# MANIFEST + GENERATIONS
+# ============================================================================
+
+def _write_json(path, data, indent=None):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, sort_keys=True, separators=(',', ':') if indent is None else None)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def load_history(public_dir):
+    try:
+        with open(public_dir / HISTORY_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f).get('generations', [])
+    except (OSError, ValueError):
+        return []
+
+def collect_garbage(public_dir, generations, keep):
+    """Delete hashed files only referenced by generations older than the last `keep`"""
+    kept, dropped = generations[-keep:], generations[:-keep]
+    live = {path for generation in kept for path in generation['files']}
+    removed = 0
+    for path in {path for generation in dropped for path in generation['files']} - live:
+        try:
+            (public_dir / path).unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+        # Drop directories the GC emptied, up to (not including) hashed/
+        parent = (public_dir / path).parent
+        while parent != public_dir / HASHED_DIR and parent.is_relative_to(public_dir / HASHED_DIR):
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+    return kept, removed
+
+def publish(public_dir=PUBLIC_DIR, keep_generations=KEEP_GENERATIONS):
+    """Hash every content asset, write the manifest, and GC old generations"""
+    public_dir = Path(public_dir)
+    print("\n[*] Writing content-hashed assets...")
+
+    assets = {logical: write_hashed(public_dir, logical) for logical in logical_assets(public_dir)}
+
+    generations = load_history(public_dir)
+    files = sorted(set(assets.values()))
+    if generations and generations[-1]['files'] == files:
+        generation = generations[-1]['generation']  # nothing changed: same generation
+    else:
+        generation = (generations[-1]['generation'] + 1) if generations else 1
+        generations.append({'generation': generation, 'files': files})
+    generations, removed = collect_garbage(public_dir, generations, max(1, keep_generations))
+
+    _write_json(public_dir / MANIFEST_NAME, {'generation': generation, 'assets': assets})
+    _write_json(public_dir / HISTORY_NAME, {'generations': generations}, indent=2)
+
+    print(f"  [+] Created: {public_dir / MANIFEST_NAME} "
+          f"(generation {generation}, {len(assets)} assets, {removed} stale files removed)")
+    return assets
+
+def refresh(public_dir=PUBLIC_DIR, keep_generations=KEEP_GENERATIONS):
+    """publish() again if a manifest was published before, so it never goes stale; else a no-op"""
+    if (Path(public_dir) / MANIFEST_NAME).exists():
+        return publish(public_dir, keep_generations)
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Write content-hashed copies of the public content files')
+    parser.add_argument('--keep-generations', type=int, default=KEEP_GENERATIONS,
+                        help='Builds whose hashed files are kept')
+    parser.add_argument('--public-dir', default=str(PUBLIC_DIR), help='Public directory')
+    args = parser.parse_args()
+    publish(args.public_dir, args.keep_generations)
+
+if __name__ == '__main__':
+    main()
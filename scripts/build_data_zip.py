@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+data.zip Builder for Harshi-App
+Regenerates public/data.zip from the data tree so it never drifts from it:
+
+- Deterministic: entries sorted by name, fixed timestamps and attributes,
+  fixed compression level; the same inputs always give the same bytes
+- Incremental: entries whose source hash is unchanged are copied as raw
+  compressed bytes from the previous archive instead of being re-deflated
+- Per entry, deflate is only used when it saves at least MIN_DEFLATE_SAVING
+  of the entry size; otherwise the entry is stored
+- public/data.zip.json indexes every entry's data offset and length, so the
+  client can fetch one workbook with an HTTP Range request
+  (see src/services/dataArchive.js)
+
+Usage:
+    python scripts/build_data_zip.py [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+PUBLIC_DIR = BASE_DIR / 'public'
+ZIP_PATH = PUBLIC_DIR / 'data.zip'
+INDEX_PATH = PUBLIC_DIR / 'data.zip.json'
+INDEX_VERSION = 1
+
+# (archive prefix, source directory, glob)
+ZIP_SOURCES = [
+    ('data/', PUBLIC_DIR / 'data', '*.xlsx'),
+    ('data/subjects/', PUBLIC_DIR / 'data' / 'subjects', '*.xlsx'),
+    ('data/topics/', PUBLIC_DIR / 'data' / 'topics', '*.xlsx'),
+    ('', BASE_DIR, 'GOOGLE_SHEETS_SCHEMA.md'),
+]
+
+COMPRESSION_LEVEL = 9
+MIN_DEFLATE_SAVING = 0.05  # deflate must shrink an entry by at least 5%
+
+STORED, DEFLATED = 0, 8
+DOS_TIME, DOS_DATE = 0, (1 << 5) | 1  # 1980-01-01 00:00:00
+FILE_ATTRS = (0o100644 << 16)
+DIR_ATTRS = (0o40755 << 16) | 0x10
+VERSION_MADE_BY = (3 << 8) | 20  # unix, 2.0
+VERSION_NEEDED = 20
+UTF8_FLAG = 0x800
+
+
+# ============================================================================
+# ENTRIES
+# ============================================================================
+
+def collect_sources():
+    """{archive name: source path} for every file that belongs in data.zip"""
+    sources = {}
+    for prefix, directory, pattern in ZIP_SOURCES:
+        for path in sorted(directory.glob(pattern)):
+            if path.is_file():
+                sources[prefix + path.name] = path
+    return sources
+
+def archive_names(sources):
+    """File names plus their parent directory entries, sorted"""
+    names = set(sources)
+    for name in sources:
+        parts = name.split('/')[:-1]
+        names.update('/'.join(parts[:i]) + '/' for i in range(1, len(parts) + 1))
+    return sorted(names)
+
+def compress_entry(data):
+    """(method, payload) choosing stored vs deflate by size benefit"""
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    if len(deflated) <= len(data) * (1 - MIN_DEFLATE_SAVING):
+        return DEFLATED, deflated
+    return STORED, data
+
+def load_previous():
+    """(index entries, archive bytes) of the last build, or ({}, None)"""
+    try:
+        with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        archive = ZIP_PATH.read_bytes()
+    except (OSError, ValueError):
+        return {}, None
+    if index.get('version') != INDEX_VERSION or index.get('archive_sha256') != hashlib.sha256(archive).hexdigest():
+        return {}, None
+    return index['entries'], archive
+
+
+# ============================================================================
+# ZIP WRITER
+# ============================================================================
+
+def _local_header(name_bytes, flags, method, crc, compressed_size, size):
+    return struct.pack('<IHHHHHIIIHH', 0x04034b50, VERSION_NEEDED, flags, method, DOS_TIME, DOS_DATE,
+                       crc, compressed_size, size, len(name_bytes), 0) + name_bytes
+
+def _central_header(name_bytes, flags, method, crc, compressed_size, size, attrs, offset):
+    return struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, VERSION_MADE_BY, VERSION_NEEDED, flags, method,
+                       DOS_TIME, DOS_DATE, crc, compressed_size, size, len(name_bytes), 0, 0, 0, 0,
+                       attrs, offset) + name_bytes
+
+def build_archive(sources, force=False):
+    """Return (archive bytes, index entries, reused entry count)"""
+    previous, previous_archive = ({}, None) if force else load_previous()
+    out = bytearray()
+    central = bytearray()
+    entries = {}
+    reused = 0
+
+    names = archive_names(sources)
+    for name in names:
+        name_bytes = name.encode('utf-8')
+        flags = 0 if name.isascii() else UTF8_FLAG
+        header_offset = len(out)
+
+        if name.endswith('/'):
+            out += _local_header(name_bytes, flags, STORED, 0, 0, 0)
+            central += _central_header(name_bytes, flags, STORED, 0, 0, 0, DIR_ATTRS, header_offset)
+            continue
+
+        data = sources[name].read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        old = previous.get(name)
+        if old and old['sha256'] == digest:
+            method = DEFLATED if old['method'] == 'deflate' else STORED
+            payload = previous_archive[old['offset']:old['offset'] + old['length']]
+            crc = old['crc32']
+            reused += 1
+        else:
+            method, payload = compress_entry(data)
+            crc = zlib.crc32(data)
+
+        out += _local_header(name_bytes, flags, method, crc, len(payload), len(data))
+        entries[name] = {
+            'offset': len(out),
+            'length': len(payload),
+            'size': len(data),
+            'method': 'deflate' if method == DEFLATED else 'stored',
+            'crc32': crc,
+            'sha256': digest,
+        }
+        out += payload
+        central += _central_header(name_bytes, flags, method, crc, len(payload), len(data), FILE_ATTRS, header_offset)
+
+    central_offset = len(out)
+    out += central
+    out += struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(names), len(names), len(central), central_offset, 0)
+    return bytes(out), entries, reused
+
+def _write_if_changed(path, data):
+    if path.exists() and path.read_bytes() == data:
+        return False
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+def build(force=False):
+    sources = collect_sources()
+    archive, entries, reused = build_archive(sources, force)
+    index = {
+        'version': INDEX_VERSION,
+        'archive': ZIP_PATH.name,
+        'archive_size': len(archive),
+        'archive_sha256': hashlib.sha256(archive).hexdigest(),
+        'entries': entries,
+    }
+    index_bytes = (json.dumps(index, indent=1, sort_keys=True) + '\n').encode('utf-8')
+
+    changed = _write_if_changed(ZIP_PATH, archive)
+    _write_if_changed(INDEX_PATH, index_bytes)
+    return len(entries), reused, len(archive), changed
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild public/data.zip and its entry index')
+    parser.add_argument('--force', action='store_true', help='Re-compress every entry')
+    args = parser.parse_args()
+
+    print("[*] Building data.zip...")
+    count, reused, size, changed = build(args.force)
+    print(f"  {count} entries ({reused} reused, {count - reused} compressed), {size} bytes")
+    print(f"[+] {ZIP_PATH.relative_to(BASE_DIR)} {'updated' if changed else 'unchanged'}; "
+          f"index: {INDEX_PATH.relative_to(BASE_DIR)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Precache Manifest Builder for Harshi-App
+Walks the generated public/ data trees and writes public/precache-manifest.json
+for the service worker (public/service-worker.js) and the idle-time
+prefetcher (src/services/precache.js). Each entry records URL, revision
+(content hash) and size, ordered in the order students need the data:
+
+1. critical: master indices and app-wide data the dashboard loads first
+2. topics:   per subject (Subjects sheet order), each topic's
+             questionnaire/ and studyguide/ files by Topics.order_index;
+             files outside any known topic come last
+3. handouts: Handout/ trees and the pre-rendered handout fragments
+
+When public/content-manifest.json exists (convert_to_csv.py --hashed), the
+hashed URLs the client actually requests are listed instead of the logical
+ones. The client prefetches entries in order until --budget bytes are used.
+
+Usage:
+    python scripts/build_precache.py [--budget BYTES]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from asset_manifest import MANIFEST_NAME
+from convert_to_csv import DATA_DIR, read_excel_sheet, to_int
+
+BASE_DIR = Path(__file__).parent.parent
+
+PUBLIC_DIR = BASE_DIR / 'public'
+OUTPUT_PATH = PUBLIC_DIR / 'precache-manifest.json'
+MANIFEST_VERSION = 1
+
+TOPIC_TREES = ['questionnaire', 'studyguide']
+HANDOUT_TREES = ['Handout', 'data/handouts']
+DATA_SUFFIXES = {'.csv', '.json', '.html'}
+CRITICAL_FILES = ['data/achievements.json', 'data/handouts/index.json']
+
+# Default prefetch budget; the client may lower it (e.g. on metered connections)
+DEFAULT_BUDGET = 5 * 1024 * 1024
+
+
+# ============================================================================
+# ORDERING
+# ============================================================================
+
+def topic_order(master_path=DATA_DIR / 'StudyHub_Master.xlsx'):
+    """[(subject_key, topic_id)] in Subjects sheet order, topics by order_index"""
+    subjects = [row['subject_key'] for row in read_excel_sheet(master_path, 'Subjects') if row.get('subject_key')]
+    topics = [row for row in read_excel_sheet(master_path, 'Topics') if row.get('topic_id')]
+    rank = {key: i for i, key in enumerate(subjects)}
+    topics.sort(key=lambda row: (rank.get(row.get('subject_key'), len(rank)), to_int(row.get('order_index'), 0)))
+    return [(row.get('subject_key', ''), row['topic_id']) for row in topics]
+
+def topic_folders(public_dir, tree):
+    """{topic_id: 'tree/Subject/folder'} from a tree's master index (or a folder named after the topic)"""
+    folders = {}
+    for name in ('master-index.csv', '_master_index.csv'):
+        path = public_dir / tree / name
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('topic_id'):
+                    subject_dir = public_dir / tree / (row.get('subject_key') or '').title()
+                    for folder in (row.get('topic_folder'), row['topic_id']):
+                        if folder and (subject_dir / folder).is_dir():
+                            folders.setdefault(row['topic_id'], (subject_dir / folder).relative_to(public_dir).as_posix())
+                            break
+    return folders
+
+def handout_fragments(public_dir):
+    """{topic_id: [fragment paths]} from the render_handouts.py index"""
+    try:
+        with open(public_dir / 'data' / 'handouts' / 'index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {topic_id: [public_dir / 'data' / 'handouts' / entry['file']]
+            for topic_id, entry in index.get('topics', {}).items()}
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def _data_files(root):
+    if not root.is_dir():
+        return []
+    return sorted(p for p in root.rglob('*') if p.is_file() and p.suffix in DATA_SUFFIXES)
+
+def _entry(public_dir, path, tier, assets):
+    logical = path.relative_to(public_dir).as_posix()
+    url = assets.get(logical, logical)
+    data = (public_dir / url).read_bytes()
+    return {'url': url, 'revision': hashlib.sha256(data).hexdigest()[:12], 'size': len(data), 'tier': tier}
+
+def build_entries(public_dir=PUBLIC_DIR, master_path=DATA_DIR / 'StudyHub_Master.xlsx'):
+    public_dir = Path(public_dir)
+    assets = {}
+    if (public_dir / MANIFEST_NAME).exists():
+        with open(public_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            assets = json.load(f).get('assets', {})
+
+    ordered = []  # (tier, path)
+    seen = set()
+
+    def add(tier, path):
+        if path not in seen and path.exists():
+            seen.add(path)
+            ordered.append((tier, path))
+
+    # 1. Dashboard-critical: master indices and app-wide data
+    for tree in TOPIC_TREES + ['Handout']:
+        for path in sorted((public_dir / tree).glob('*.csv')):
+            add('critical', path)
+    for name in CRITICAL_FILES:
+        add('critical', public_dir / name)
+
+    # 2. Topics in study order, then anything outside a known topic
+    folders = {tree: topic_folders(public_dir, tree) for tree in TOPIC_TREES}
+    for _, topic_id in topic_order(master_path):
+        for tree in TOPIC_TREES:
+            if topic_id in folders[tree]:
+                for path in _data_files(public_dir / folders[tree][topic_id]):
+                    add('topics', path)
+    for tree in TOPIC_TREES:
+        for path in _data_files(public_dir / tree):
+            add('topics', path)
+
+    # 3. Handouts (largest data, needed last), also in study order
+    handout_folders = topic_folders(public_dir, 'Handout')
+    fragments = handout_fragments(public_dir)
+    for _, topic_id in topic_order(master_path):
+        for path in fragments.get(topic_id, []):
+            add('handouts', path)
+        if topic_id in handout_folders:
+            for path in _data_files(public_dir / handout_folders[topic_id]):
+                add('handouts', path)
+    for tree in HANDOUT_TREES:
+        for path in _data_files(public_dir / tree):
+            add('handouts', path)
+
+    return [_entry(public_dir, path, tier, assets) for tier, path in ordered]
+
+def build_manifest(public_dir=PUBLIC_DIR, output_path=OUTPUT_PATH, budget=DEFAULT_BUDGET):
+    print("[*] Building precache manifest...")
+    entries = build_entries(public_dir)
+    revision = hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    manifest = {'version': MANIFEST_VERSION, 'revision': revision, 'budget': budget, 'entries': entries}
+
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+        f.write('\n')
+    os.replace(tmp_path, output_path)
+
+    for tier in ('critical', 'topics', 'handouts'):
+        tier_entries = [e for e in entries if e['tier'] == tier]
+        print(f"  {tier:9} {len(tier_entries):4} files {sum(e['size'] for e in tier_entries):>9} bytes")
+    print(f"  [+] Created: {output_path} (revision {revision}, budget {budget} bytes)")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the service-worker precache manifest')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='Default prefetch budget in bytes')
+    parser.add_argument('-o', '--output', default=str(OUTPUT_PATH), help='Manifest path')
+    args = parser.parse_args()
+    build_manifest(output_path=args.output, budget=args.budget)
+
+if __name__ == '__main__':
+    main()
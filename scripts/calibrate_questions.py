@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Question Calibration Engine for Harshi-App
+Fits per-question difficulty (and discrimination) from exported quiz-attempt
+logs and writes the calibrated difficulty back into the Quiz_Questions sheets
+of the subject workbooks and the questionnaire CSVs, replacing the
+hand-entered 'difficulty' labels.
+
+Attempt logs are CSV or Parquet with columns:
+    question_id, correct (1/0/true/false), time (seconds, optional),
+    student_id (optional; also accepted: user_id, session_id)
+
+Model: 2PL IRT, P(correct) = sigmoid(a_q * (theta_s - b_q)), fitted by joint
+maximum likelihood with damped Newton steps. Every step is a handful of
+np.bincount group sums over the attempt arrays, so a million attempts take
+well under a second per iteration. Without a student column abilities cannot
+be separated and the fit reduces to a Rasch model with theta = 0 (a = 1).
+
+The fit runs until the item parameters move less than TOLERANCE or
+--max-iterations is reached; a fit that hits the cap is reported as not
+converged and nothing is written back.
+
+Written back per question with at least --min-attempts attempts:
+    difficulty          easy / medium / hard from b (DIFFICULTY_BANDS)
+    irt_difficulty      b (logits, students centred at 0)
+    irt_discrimination  a
+
+Usage:
+    python scripts/calibrate_questions.py attempts.csv [--report calibration.csv] [--dry-run]
+                                          [--max-iterations 500]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from convert_to_csv import DATA_DIR, QUESTIONNAIRE_DIR
+
+BASE_DIR = Path(__file__).parent.parent
+
+STUDENT_COLUMNS = ['student_id', 'user_id', 'session_id']
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'correct'}
+
+# Upper bound of b for each label
+DIFFICULTY_BANDS = [(-0.5, 'easy'), (0.5, 'medium'), (np.inf, 'hard')]
+
+MIN_ATTEMPTS = 30
+MAX_ITERATIONS = 500
+TOLERANCE = 3e-3
+MAX_STEP = 1.0
+PRIOR_PRECISION = 0.01      # weak N(0, 10^2) prior keeps all-correct/all-wrong items finite
+DISCRIMINATION_RANGE = (0.2, 4.0)
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_attempts(paths):
+    """Concatenate attempt logs into (question codes, student codes, correct, time, question ids)"""
+    frames = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix == '.parquet':
+            frame = pd.read_parquet(path)
+        else:
+            header = pd.read_csv(path, nrows=0).columns
+            usecols = [c for c in ['question_id', 'correct', 'time'] + STUDENT_COLUMNS if c in header]
+            frame = pd.read_csv(path, usecols=usecols, dtype={c: 'string' for c in usecols if c != 'time'})
+        frames.append(frame)
+    attempts = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    missing = {'question_id', 'correct'} - set(attempts.columns)
+    if missing:
+        raise ValueError(f"attempt log is missing column(s): {', '.join(sorted(missing))}")
+
+    attempts = attempts.dropna(subset=['question_id', 'correct'])
+    correct = attempts['correct'].astype('string').str.strip().str.lower().isin(TRUE_VALUES).to_numpy(np.float64)
+    question_codes, question_ids = pd.factorize(attempts['question_id'], sort=True)
+
+    student_column = next((c for c in STUDENT_COLUMNS if c in attempts.columns), None)
+    if student_column:
+        student_codes, _ = pd.factorize(attempts[student_column].fillna(''))
+    else:
+        student_codes = np.zeros(len(attempts), dtype=np.int64)
+
+    times = (pd.to_numeric(attempts['time'], errors='coerce').to_numpy(np.float64)
+             if 'time' in attempts.columns else np.full(len(attempts), np.nan))
+    return question_codes, student_codes, correct, times, np.asarray(question_ids, dtype=object), student_column
+
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+def fit_irt(questions, students, correct, n_questions, n_students, two_pl=True,
+            max_iterations=MAX_ITERATIONS):
+    """
+    Joint MLE for the 2PL model. Returns (b, a, theta, iterations, converged).
+    Each iteration takes one damped Newton step per parameter block (b, a,
+    theta) in turn; gradients and curvatures are bincount sums of the
+    residuals r = y - p and weights w = p(1 - p). Iteration stops once the
+    item parameters (the only ones written back) move less than TOLERANCE;
+    converged is False when max_iterations is reached first.
+    """
+    counts = np.bincount(questions, minlength=n_questions).astype(np.float64)
+    p_correct = (np.bincount(questions, weights=correct, minlength=n_questions) + 0.5) / (counts + 1.0)
+    b = -np.log(p_correct / (1 - p_correct))
+    a = np.ones(n_questions)
+    theta = np.zeros(n_students)
+    fit_theta = n_students > 1
+    fit_a = two_pl and fit_theta
+    converged = False
+
+    for iteration in range(1, max_iterations + 1):
+        # Difficulty: dLL/db = -a * sum(r), -d2LL/db2 = a^2 * sum(w)
+        p = _sigmoid(a[questions] * (theta[students] - b[questions]))
+        grad = -a * np.bincount(questions, weights=correct - p, minlength=n_questions) - PRIOR_PRECISION * b
+        hess = a * a * np.bincount(questions, weights=p * (1 - p), minlength=n_questions) + PRIOR_PRECISION
+        step = np.clip(grad / hess, -MAX_STEP, MAX_STEP)
+        b += step
+        change = np.abs(step).max()
+
+        if fit_a:
+            # Discrimination: dLL/da = sum(r * (theta - b)), -d2LL/da2 = sum(w * (theta - b)^2)
+            spread = theta[students] - b[questions]
+            p = _sigmoid(a[questions] * spread)
+            grad = np.bincount(questions, weights=(correct - p) * spread, minlength=n_questions) - PRIOR_PRECISION * (a - 1)
+            hess = np.bincount(questions, weights=p * (1 - p) * spread * spread, minlength=n_questions) + PRIOR_PRECISION
+            new_a = np.clip(a + np.clip(grad / hess, -MAX_STEP, MAX_STEP), *DISCRIMINATION_RANGE)
+            change = max(change, np.abs(new_a - a).max())
+            a = new_a
+
+        if fit_theta:
+            # Ability: dLL/dtheta = sum(a * r), -d2LL/dtheta2 = sum(a^2 * w)
+            a_attempt = a[questions]
+            p = _sigmoid(a_attempt * (theta[students] - b[questions]))
+            grad = np.bincount(students, weights=a_attempt * (correct - p), minlength=n_students) - PRIOR_PRECISION * theta
+            hess = np.bincount(students, weights=a_attempt * a_attempt * p * (1 - p), minlength=n_students) + PRIOR_PRECISION
+            theta += np.clip(grad / hess, -MAX_STEP, MAX_STEP)
+            shift = theta.mean()  # identify the scale: students centred at 0
+            theta -= shift
+            b -= shift
+
+        if change < TOLERANCE:
+            converged = True
+            break
+    return b, a, theta, iteration, converged
+
+def difficulty_label(b):
+    for upper, label in DIFFICULTY_BANDS:
+        if b < upper:
+            return label
+    return DIFFICULTY_BANDS[-1][1]
+
+def calibrate(paths, two_pl=True, max_iterations=MAX_ITERATIONS):
+    """Return (per-question calibration DataFrame, run stats)"""
+    start = time.perf_counter()
+    questions, students, correct, times, question_ids, student_column = load_attempts(paths)
+    loaded = time.perf_counter()
+
+    n_questions, n_students = len(question_ids), int(students.max()) + 1 if len(students) else 0
+    b, a, theta, iterations, converged = fit_irt(questions, students, correct, n_questions, n_students,
+                                                 two_pl, max_iterations)
+    fitted = time.perf_counter()
+
+    counts = np.bincount(questions, minlength=n_questions)
+    frame = pd.DataFrame({
+        'question_id': question_ids,
+        'attempts': counts,
+        'p_correct': np.bincount(questions, weights=correct, minlength=n_questions) / np.maximum(counts, 1),
+        'irt_difficulty': np.round(b, 3),
+        'irt_discrimination': np.round(a, 3),
+    })
+    if not np.isnan(times).all():
+        frame['median_time'] = pd.Series(times).groupby(questions).median().reindex(range(n_questions)).to_numpy()
+    frame['difficulty'] = [difficulty_label(value) for value in b]
+
+    stats = {'attempts': len(correct), 'questions': n_questions,
+             'students': n_students if student_column else 0, 'iterations': iterations,
+             'converged': converged,
+             'load_seconds': round(loaded - start, 2), 'fit_seconds': round(fitted - loaded, 2)}
+    return frame, stats
+
+
+# ============================================================================
+# WRITE BACK
+# ============================================================================
+
+WRITE_COLUMNS = ['difficulty', 'irt_difficulty', 'irt_discrimination']
+
+def update_workbook(path, calibration):
+    """Update Quiz_Questions rows in place (columns are added when missing); returns rows updated"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path)
+    if 'Quiz_Questions' not in wb.sheetnames:
+        return 0
+    ws = wb['Quiz_Questions']
+    header = [cell.value for cell in ws[1]]
+    if 'question_id' not in header:
+        return 0
+    for column in WRITE_COLUMNS:
+        if column not in header:
+            header.append(column)
+            ws.cell(row=1, column=len(header), value=column)
+    key_index = header.index('question_id') + 1
+    column_index = {column: header.index(column) + 1 for column in WRITE_COLUMNS}
+
+    updated = 0
+    for row in range(2, ws.max_row + 1):
+        key = ws.cell(row=row, column=key_index).value
+        values = calibration.get(str(key).strip()) if key is not None else None
+        if values:
+            for column, index in column_index.items():
+                ws.cell(row=row, column=index, value=values[column])
+            updated += 1
+
+    if updated:
+        tmp_path = path.with_name(path.name + '.tmp')
+        wb.save(tmp_path)
+        os.replace(tmp_path, path)
+    return updated
+
+def update_csv(path, calibration):
+    """Update questions.csv rows (either header style); returns rows updated"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+        newline = f.newlines if isinstance(f.newlines, str) else '\r\n'
+    key_column = 'question_id' if 'question_id' in fieldnames else 'id'
+    if key_column not in fieldnames:
+        return 0
+
+    updated = 0
+    for row in rows:
+        values = calibration.get(row.get(key_column, ''))
+        if values:
+            row['difficulty'] = values['difficulty']
+            updated += 1
+    if updated:
+        if 'difficulty' not in fieldnames:
+            fieldnames.append('difficulty')
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore', lineterminator=newline)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_path, path)
+    return updated
+
+def write_back(frame, min_attempts):
+    eligible = frame[frame['attempts'] >= min_attempts]
+    calibration = {row.question_id: {'difficulty': row.difficulty, 'irt_difficulty': float(row.irt_difficulty),
+                                     'irt_discrimination': float(row.irt_discrimination)}
+                   for row in eligible.itertuples(index=False)}
+    print(f"  {len(calibration)} of {len(frame)} questions have at least {min_attempts} attempts")
+
+    for workbook in sorted((DATA_DIR / 'subjects').glob('*.xlsx')):
+        count = update_workbook(workbook, calibration)
+        if count:
+            print(f"  [+] {workbook.relative_to(BASE_DIR)}: {count} questions")
+    for csv_path in sorted(QUESTIONNAIRE_DIR.glob('*/*/questions.csv')):
+        count = update_csv(csv_path, calibration)
+        if count:
+            print(f"  [+] {csv_path.relative_to(BASE_DIR)}: {count} questions")
+
+def main():
+    parser = argparse.ArgumentParser(description='Calibrate question difficulty from quiz-attempt logs')
+    parser.add_argument('attempts', nargs='+', help='Attempt logs (CSV or Parquet)')
+    parser.add_argument('--min-attempts', type=int, default=MIN_ATTEMPTS,
+                        help='Only write back questions with at least this many attempts')
+    parser.add_argument('--max-iterations', type=int, default=MAX_ITERATIONS,
+                        help='Give up (and write nothing) if the fit has not converged after this many iterations')
+    parser.add_argument('--rasch', action='store_true', help='Fix discrimination at 1 (1PL)')
+    parser.add_argument('--report', help='Write the per-question calibration table to this CSV')
+    parser.add_argument('--dry-run', action='store_true', help='Do not modify workbooks or CSVs')
+    args = parser.parse_args()
+
+    print("[*] Calibrating questions...")
+    frame, stats = calibrate(args.attempts, two_pl=not args.rasch, max_iterations=args.max_iterations)
+    print(f"  {stats['attempts']} attempts, {stats['questions']} questions, {stats['students']} students; "
+          f"{stats['iterations']} iterations (load {stats['load_seconds']}s, fit {stats['fit_seconds']}s)")
+    if not stats['converged']:
+        print(f"  [ERROR] Fit did not converge within {args.max_iterations} iterations "
+              f"(tolerance {TOLERANCE}); no labels written. Re-run with a higher --max-iterations")
+    if not stats['students']:
+        print("  [WARN] No student column; fitted a Rasch model with all abilities at 0")
+
+    if args.report:
+        frame.to_csv(args.report, index=False)
+        print(f"  [+] Report: {args.report}")
+    if not stats['converged']:
+        sys.exit(1)
+    if args.dry_run:
+        print(frame.groupby('difficulty').size().to_string())
+        return
+
+    print("\n[*] Writing calibrated difficulty...")
+    write_back(frame, args.min_attempts)
+    print("\n[+] Calibration complete!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Referential Integrity Checker for Harshi-App
+Checks, in one pass over all sources, that every reference between the data
+workbooks and the public CSV trees resolves:
+
+- Topics.subject_key -> Subjects; *.topic_id -> Topics; Study_Content.section_id -> Topic_Sections
+- Primary keys are unique within each sheet (across master + subject workbooks)
+- IDs are unique within public/questionnaire, public/studyguide and public/Handout
+- CSV topic_id values and master-index rows point at known topics, and every
+  master-index topic_folder exists on disk
+- studyguide content.csv section_id values exist in the folder's sections.csv
+
+Sources are read in parallel, key sets are built once, and every foreign key
+is a hash lookup, so the check stays linear in the number of rows.
+
+Exit codes: 0 = clean, 1 = integrity errors, 2 = a source could not be read.
+
+Usage:
+    python scripts/check_integrity.py [--report integrity.json] [--quiet]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from content_db import CSV_TREES, PRIMARY_KEYS, read_workbook_sheets
+from convert_to_csv import DATA_DIR
+
+BASE_DIR = Path(__file__).parent.parent
+
+PUBLIC_DIR = BASE_DIR / 'public'
+
+# (sheet, column) -> (referenced sheet, referenced column)
+FOREIGN_KEYS = [
+    ('Topics', 'subject_key', 'Subjects', 'subject_key'),
+    ('Topic_Sections', 'topic_id', 'Topics', 'topic_id'),
+    ('Learning_Objectives', 'topic_id', 'Topics', 'topic_id'),
+    ('Key_Terms', 'topic_id', 'Topics', 'topic_id'),
+    ('Formulas', 'topic_id', 'Topics', 'topic_id'),
+    ('Quiz_Questions', 'topic_id', 'Topics', 'topic_id'),
+    ('Study_Content', 'section_id', 'Topic_Sections', 'section_id'),
+]
+
+CSV_ID_COLUMNS = ['question_id', 'content_id', 'section_id', 'id']
+MASTER_INDEX_NAMES = {'master-index.csv', '_master_index.csv'}
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_workbook(path):
+    return str(path.relative_to(BASE_DIR)), dict(read_workbook_sheets(path))
+
+def load_csv(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return str(path.relative_to(BASE_DIR)), list(csv.DictReader(f))
+
+def load_sources(workbooks, csv_files, workers):
+    """Read every workbook and CSV concurrently; returns (sheets, csv_rows, read_errors)"""
+    sheets = defaultdict(list)  # sheet -> [(source, row_number, row)]
+    csv_rows = {}               # relative path -> rows
+    read_errors = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        workbook_jobs = [(p, executor.submit(load_workbook, p)) for p in workbooks]
+        csv_jobs = [(p, executor.submit(load_csv, p)) for p in csv_files]
+
+        for path, job in workbook_jobs:
+            try:
+                source, data = job.result()
+            except Exception as e:
+                read_errors.append({'source': str(path), 'message': str(e)})
+                continue
+            for sheet_name, rows in data.items():
+                sheets[sheet_name].extend((source, i, row) for i, row in enumerate(rows, 2))
+
+        for path, job in csv_jobs:
+            try:
+                source, rows = job.result()
+            except Exception as e:
+                read_errors.append({'source': str(path), 'message': str(e)})
+                continue
+            csv_rows[source] = rows
+
+    return sheets, csv_rows, read_errors
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+class Report:
+    def __init__(self):
+        self.errors = []
+        self.checked = 0
+
+    def error(self, check, source, row, column, value, message):
+        self.errors.append({'check': check, 'source': source, 'row': row, 'column': column,
+                            'value': value, 'message': message})
+
+def check_workbooks(sheets, report):
+    keys = {}
+    for sheet_name, key_column in PRIMARY_KEYS.items():
+        seen = {}
+        for source, row_num, row in sheets.get(sheet_name, []):
+            report.checked += 1
+            key = row.get(key_column, '')
+            if not key:
+                report.error('missing_key', source, row_num, key_column, key,
+                             f"{sheet_name} row has no {key_column}")
+            elif key in seen:
+                report.error('duplicate_key', source, row_num, key_column, key,
+                             f"{sheet_name}.{key_column} '{key}' already defined in {seen[key]}")
+            else:
+                seen[key] = source
+        keys[(sheet_name, key_column)] = set(seen)
+    keys[('Subjects', 'subject_key')] = {row.get('subject_key', '') for _, _, row in sheets.get('Subjects', [])}
+
+    for sheet_name, column, ref_sheet, ref_column in FOREIGN_KEYS:
+        valid = keys[(ref_sheet, ref_column)]
+        for source, row_num, row in sheets.get(sheet_name, []):
+            report.checked += 1
+            value = row.get(column, '')
+            if value not in valid:
+                report.error('foreign_key', source, row_num, column, value,
+                             f"{sheet_name}.{column} '{value}' not found in {ref_sheet}.{ref_column}")
+    return keys[('Topics', 'topic_id')]
+
+def _id_column(rows):
+    columns = rows[0].keys() if rows else ()
+    return next((c for c in CSV_ID_COLUMNS if c in columns), None)
+
+def check_csv_trees(csv_rows, topic_ids, report):
+    ids_by_tree = defaultdict(dict)  # tree -> {id: source}
+    sections_by_folder = {}
+
+    for source, rows in csv_rows.items():
+        if source.endswith('/sections.csv'):
+            sections_by_folder[str(Path(source).parent)] = {r.get('section_id', '') for r in rows}
+
+    for source, rows in sorted(csv_rows.items()):
+        parts = Path(source).parts  # public/<tree>/...
+        tree = parts[1]
+        name = parts[-1]
+
+        if name in MASTER_INDEX_NAMES:
+            for row_num, row in enumerate(rows, 2):
+                report.checked += 1
+                if topic_ids and row.get('topic_id', '') not in topic_ids:
+                    report.error('foreign_key', source, row_num, 'topic_id', row.get('topic_id', ''),
+                                 f"master index topic '{row.get('topic_id', '')}' not found in Topics")
+                subject_dir = (row.get('subject_key', '') or '').title()
+                folder = PUBLIC_DIR / tree / subject_dir / row.get('topic_folder', '')
+                if not folder.is_dir():
+                    report.error('missing_folder', source, row_num, 'topic_folder', row.get('topic_folder', ''),
+                                 f"topic folder {folder.relative_to(BASE_DIR)} does not exist")
+            continue
+
+        id_column = _id_column(rows)
+        sections = sections_by_folder.get(str(Path(source).parent))
+        for row_num, row in enumerate(rows, 2):
+            report.checked += 1
+            if id_column:
+                value = row.get(id_column) or ''
+                key = (name, value)
+                if not value:
+                    report.error('missing_key', source, row_num, id_column, value, f"row has no {id_column}")
+                elif key in ids_by_tree[tree]:
+                    report.error('duplicate_key', source, row_num, id_column, value,
+                                 f"{id_column} '{value}' already used in {ids_by_tree[tree][key]}")
+                else:
+                    ids_by_tree[tree][key] = source
+
+            topic_id = row.get('topic_id')
+            if topic_id and topic_ids and topic_id not in topic_ids:
+                report.error('foreign_key', source, row_num, 'topic_id', topic_id,
+                             f"topic_id '{topic_id}' not found in Topics")
+
+            section_id = row.get('section_id')
+            if name == 'content.csv' and section_id and sections is not None and section_id not in sections:
+                report.error('foreign_key', source, row_num, 'section_id', section_id,
+                             f"section_id '{section_id}' not found in sections.csv")
+
+def run_checks(workbooks, csv_files, workers=8):
+    start = time.perf_counter()
+    report = Report()
+    sheets, csv_rows, read_errors = load_sources(workbooks, csv_files, workers)
+    topic_ids = check_workbooks(sheets, report)
+    check_csv_trees(csv_rows, topic_ids, report)
+
+    return {
+        'summary': {
+            'sources': len(workbooks) + len(csv_files),
+            'rows_checked': report.checked,
+            'errors': len(report.errors),
+            'read_errors': len(read_errors),
+            'seconds': round(time.perf_counter() - start, 3),
+        },
+        'read_errors': read_errors,
+        'errors': report.errors,
+    }
+
+def default_sources():
+    workbooks = [DATA_DIR / 'StudyHub_Master.xlsx'] + sorted((DATA_DIR / 'subjects').glob('*.xlsx'))
+    csv_files = sorted(p for tree in CSV_TREES for p in (PUBLIC_DIR / tree).rglob('*.csv'))
+    return [p for p in workbooks if p.exists()], csv_files
+
+def main():
+    parser = argparse.ArgumentParser(description='Check referential integrity across workbooks and CSV trees')
+    parser.add_argument('--report', help='Write the JSON report to this file (default: stdout)')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel readers')
+    parser.add_argument('--quiet', action='store_true', help='Only print the summary line')
+    args = parser.parse_args()
+
+    workbooks, csv_files = default_sources()
+    result = run_checks(workbooks, csv_files, args.workers)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    elif not args.quiet:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    summary = result['summary']
+    print(f"[*] Integrity: {summary['rows_checked']} rows from {summary['sources']} sources, "
+          f"{summary['errors']} errors, {summary['read_errors']} read errors ({summary['seconds']}s)",
+          file=sys.stderr)
+
+    if result['read_errors']:
+        sys.exit(2)
+    sys.exit(1 if result['errors'] else 0)
+
+if __name__ == '__main__':
+    main()
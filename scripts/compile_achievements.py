@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Achievement Condition Compiler for Harshi-App
+Parses every Achievements.unlock_condition into a small typed JSON AST and
+writes public/data/achievements.json:
+
+    {
+      "version": 1,
+      "achievements": {"streak-5": {"condition": "streak >= 5",
+                                    "ast": {"kind": "compare", "field": "streak", "op": ">=", "value": 5},
+                                    "fields": ["streak"]}, ...},
+      "dependencies": {"streak": ["streak-10", "streak-5"], "topics": [...], ...}
+    }
+
+"dependencies" maps each progress field (top-level keys of the client's
+progress state) to the achievements that read it, so the client only
+re-evaluates achievements whose inputs changed
+(src/services/achievementRules.js).
+
+AST nodes:
+    {"kind": "always"}
+    {"kind": "compare", "field": F, "op": OP, "value": N}
+        progress[F] (dotted path) OP N
+    {"kind": "collection", "field": F, "metric": M|null, "op": OP|null, "value": N|null,
+     "quantifier": "any"|"all"|{"atLeast": N}}
+        entries of the progress[F] map (entry[M] when metric is set)
+    {"kind": "subjects", "metric": "progress"|"accessed", "op": OP|null, "value": N|null,
+     "quantifier": "any"|"all"}
+        per-subject values derived from progress.topics
+
+Any condition that matches no rule is a build error (exit code 1).
+
+Usage:
+    python scripts/compile_achievements.py [--source workbook.xlsx|--sample] [-o public/data/achievements.json]
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from convert_to_csv import DATA_DIR, read_excel_sheet
+
+BASE_DIR = Path(__file__).parent.parent
+
+OUTPUT_PATH = DATA_DIR / 'achievements.json'
+RULES_VERSION = 1
+
+OPERATORS = {'=': '==', '==': '==', '>=': '>=', '<=': '<=', '>': '>', '<': '<', '!=': '!='}
+OP = r'(==|>=|<=|!=|=|>|<)'
+NUMBER = r'(\d+(?:\.\d+)?)'
+
+# Scalar progress fields conditions may compare (name in the sheet -> progress path)
+SCALAR_FIELDS = {
+    'streak': 'streak',
+    'xp': 'xp',
+    'study time': 'studyTimeMinutes',
+    'study minutes': 'studyTimeMinutes',
+    'correct answers': 'stats.totalCorrect',
+    'questions answered': 'stats.totalQuestions',
+}
+
+# (collection word in the sheet) -> (progress field, metric read from each entry)
+COLLECTIONS = {
+    'topic': ('topics', 'progress'),
+    'quiz': ('quizScores', None),
+}
+
+# Subject values are derived from progress.topics
+DERIVED_FIELDS = {'subjects': ['topics']}
+
+class ConditionError(ValueError):
+    pass
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+def _singular(word):
+    return {'quizzes': 'quiz'}.get(word, word[:-1] if word.endswith('s') else word)
+
+def _compare(field, op, value):
+    return {'kind': 'compare', 'field': field, 'op': OPERATORS[op], 'value': _number(value)}
+
+def _collection(word, quantifier, op=None, value=None, metric_word=None):
+    field, metric = COLLECTIONS[_singular(word)]
+    if metric_word and metric_word not in ('progress', 'score'):
+        raise ConditionError(f"unknown {word} metric '{metric_word}'")
+    return {'kind': 'collection', 'field': field, 'metric': metric,
+            'op': OPERATORS[op] if op else None, 'value': _number(value) if value else None,
+            'quantifier': quantifier}
+
+def _subjects(quantifier, metric, op=None, value=None):
+    return {'kind': 'subjects', 'metric': metric, 'op': OPERATORS[op] if op else None,
+            'value': _number(value) if value else None, 'quantifier': quantifier}
+
+def _complete(word, count):
+    """'complete' means a topic at 100% progress, or any recorded quiz score"""
+    at_least = {'atLeast': 1 if count in (None, 'any', 'a', 'your first') else int(count)}
+    if _singular(word) == 'topic':
+        return _collection(word, at_least, '==', '100')
+    return _collection(word, at_least)
+
+# (pattern, builder(match)) tried in order against the lowercased condition
+RULES = [
+    (r'^login for the first time$|^first login$', lambda m: {'kind': 'always'}),
+    (rf'^({"|".join(SCALAR_FIELDS)})\s*{OP}\s*{NUMBER}$',
+     lambda m: _compare(SCALAR_FIELDS[m[1]], m[2], m[3])),
+    (rf'^(any|all) (topics?|quiz|quizzes) (progress|score)\s*{OP}\s*{NUMBER}$',
+     lambda m: _collection(m[2], m[1], m[4], m[5], m[3])),
+    (rf'^(any|all) subjects? progress\s*{OP}\s*{NUMBER}$',
+     lambda m: _subjects(m[1], 'progress', m[2], m[3])),
+    (r'^(any|all) subjects? (?:accessed|studied)$', lambda m: _subjects(m[1], 'accessed')),
+    (r'^complete (any|a|your first|\d+) (topics?|quiz|quizzes)$', lambda m: _complete(m[2], m[1])),
+    # snake_case conditions written by ContentGenerator.generateDefaultAchievements
+    (r'^complete_(\d+)_(topics?|quiz|quizzes)$', lambda m: _complete(m[2], m[1])),
+    (r'^correct_(\d+)_(?:quiz|quizzes|questions)$', lambda m: _compare('stats.totalCorrect', '>=', m[1])),
+    (r'^streak_(\d+)_days?$', lambda m: _compare('streak', '>=', m[1])),
+    (r'^study_all_subjects$', lambda m: _subjects('all', 'accessed')),
+]
+COMPILED_RULES = [(re.compile(pattern), build) for pattern, build in RULES]
+
+def parse_condition(condition):
+    """Compile one unlock_condition string to its AST; raises ConditionError"""
+    text = re.sub(r'\s+', ' ', (condition or '').strip().lower())
+    if not text:
+        raise ConditionError('empty condition')
+    for pattern, build in COMPILED_RULES:
+        match = pattern.match(text)
+        if match:
+            return build(match)
+    raise ConditionError('no rule matches')
+
+def condition_fields(ast):
+    """Top-level progress fields an AST reads"""
+    if ast['kind'] == 'always':
+        return []
+    if ast['kind'] == 'subjects':
+        return list(DERIVED_FIELDS['subjects'])
+    return [ast['field'].split('.')[0]]
+
+
+# ============================================================================
+# COMPILER
+# ============================================================================
+
+def compile_achievements(rows):
+    """Return (rules document, errors) for Achievements rows"""
+    achievements = {}
+    dependencies = {}
+    errors = []
+
+    for row in rows:
+        achievement_id = row.get('achievement_id', '')
+        condition = row.get('unlock_condition', '')
+        try:
+            ast = parse_condition(condition)
+        except ConditionError as e:
+            errors.append(f"{achievement_id or '<no id>'}: cannot parse unlock_condition '{condition}' ({e})")
+            continue
+        fields = condition_fields(ast)
+        achievements[achievement_id] = {'condition': condition, 'ast': ast, 'fields': fields}
+        for field in fields:
+            dependencies.setdefault(field, []).append(achievement_id)
+
+    document = {
+        'version': RULES_VERSION,
+        'achievements': achievements,
+        'dependencies': {field: sorted(ids) for field, ids in sorted(dependencies.items())},
+    }
+    return document, errors
+
+def write_rules(rows, output_path=OUTPUT_PATH):
+    """Compile and write the rules file; returns the list of errors (nothing is written on error)"""
+    document, errors = compile_achievements(rows)
+    if errors:
+        return errors
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"  [+] Created: {output_path} ({len(document['achievements'])} achievements, "
+          f"{len(document['dependencies'])} progress fields)")
+    return []
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile achievement unlock conditions')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--source', default=str(DATA_DIR / 'StudyHub_Master.xlsx'),
+                        help='Workbook with an Achievements sheet')
+    source.add_argument('--sample', action='store_true', help="Compile setup_data.SAMPLE_DATA['Achievements']")
+    parser.add_argument('-o', '--output', default=str(OUTPUT_PATH), help='Output JSON path')
+    args = parser.parse_args()
+
+    if args.sample:
+        from setup_data import SAMPLE_DATA
+        rows = SAMPLE_DATA['Achievements']
+    else:
+        rows = read_excel_sheet(Path(args.source), 'Achievements')
+
+    print("[*] Compiling achievement conditions...")
+    errors = write_rules(rows, args.output)
+    for error in errors:
+        print(f"  [ERROR] {error}")
+    sys.exit(1 if errors else 0)
+
+if __name__ == '__main__':
+    main()
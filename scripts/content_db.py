@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+SQLite Content Store for Harshi-App
+Loads every SHEET_SCHEMAS sheet from the master/subject workbooks plus the
+public CSV trees into one indexed SQLite file, so tools answer cross-sheet
+questions with SQL instead of re-parsing XLSX and scanning lists.
+
+- One table per sheet (primary key = the sheet's id column)
+- topic_id / section_id / subject_key indexed on every table that has them;
+  rows that only carry section_id get topic_id and subject_key resolved
+  (subject_key falls back to the source subject workbook's stem, as the
+  workbook-mode converters do, when the topic is not in Topics)
+- csv_rows: every row of public/questionnaire, public/studyguide and
+  public/Handout, keyed by tree/subject/topic folder/file/row
+
+The file is written with a small page size and no WAL so it can be served
+statically and opened by sql.js (WASM) over HTTP range requests.
+
+Usage:
+    python scripts/content_db.py [-o public/data/studyhub.db]
+    python setup_data.py build-db -o public/data/studyhub.db
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import parse_cache
+from schema_registry import SHEET_SCHEMAS
+from convert_to_csv import DATA_DIR, clean_column, sheet_records
+
+BASE_DIR = Path(__file__).parent.parent
+
+DEFAULT_DB = DATA_DIR / 'studyhub.db'
+MASTER_WORKBOOK = 'StudyHub_Master.xlsx'
+CSV_TREES = ['questionnaire', 'studyguide', 'Handout']
+PAGE_SIZE = 4096
+
+PRIMARY_KEYS = {
+    'Subjects': 'subject_id',
+    'Topics': 'topic_id',
+    'Topic_Sections': 'section_id',
+    'Learning_Objectives': 'objective_id',
+    'Key_Terms': 'term_id',
+    'Study_Content': 'content_id',
+    'Formulas': 'formula_id',
+    'Quiz_Questions': 'question_id',
+    'Achievements': 'achievement_id',
+}
+
+INTEGER_COLUMNS = {'order_index', 'duration_minutes', 'xp_reward'}
+INDEXED_COLUMNS = ['topic_id', 'section_id', 'subject_key']
+
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+def table_columns(sheet_name):
+    """Schema columns plus the resolved join columns every content table gets"""
+    columns = list(SHEET_SCHEMAS[sheet_name]['columns'])
+    if sheet_name not in ('Subjects', 'Achievements'):
+        for column in ('topic_id', 'subject_key'):
+            if column not in columns:
+                columns.append(column)
+    return columns + ['source']
+
+def create_schema(conn):
+    for sheet_name in SHEET_SCHEMAS:
+        columns = table_columns(sheet_name)
+        definitions = ', '.join(
+            f'"{c}" INTEGER' if c in INTEGER_COLUMNS else f'"{c}" TEXT' for c in columns)
+        conn.execute(f'CREATE TABLE "{sheet_name}" ({definitions}, '
+                     f'PRIMARY KEY ("{PRIMARY_KEYS[sheet_name]}"))')
+        for column in INDEXED_COLUMNS:
+            if column in columns and column != PRIMARY_KEYS[sheet_name]:
+                conn.execute(f'CREATE INDEX "idx_{sheet_name}_{column}" ON "{sheet_name}" ("{column}")')
+
+    conn.execute('''
+        CREATE TABLE csv_rows (
+            tree TEXT, subject TEXT, topic_folder TEXT, file TEXT, row_index INTEGER,
+            row_id TEXT, topic_id TEXT, section_id TEXT, content_type TEXT, data TEXT,
+            PRIMARY KEY (tree, subject, topic_folder, file, row_index)
+        )''')
+    for column in ('row_id', 'topic_id', 'section_id'):
+        conn.execute(f'CREATE INDEX idx_csv_rows_{column} ON csv_rows ({column})')
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _value(column, value):
+    if value == '':
+        return None
+    if column in INTEGER_COLUMNS:
+        try:
+            return int(float(value))
+        except ValueError:
+            return value
+    return value
+
+def read_workbook_sheets(file_path):
+    """Yield (sheet_name, rows) for each schema sheet in a workbook (through the parse cache)"""
+    sheets = parse_cache.load_sheets(file_path)
+    for sheet_name in SHEET_SCHEMAS:
+        if sheet_name not in sheets:
+            continue
+        header, rows = sheets[sheet_name]
+        yield sheet_name, sheet_records([h.lower().replace(' ', '_') for h in clean_column(header)], rows)
+
+def load_workbook_rows(conn, file_path):
+    """Insert every schema sheet found in a workbook; later files win on duplicate keys"""
+    loaded = 0
+    for sheet_name, rows in read_workbook_sheets(file_path):
+        columns = table_columns(sheet_name)
+        placeholders = ', '.join('?' for _ in columns)
+        conn.executemany(
+            f'INSERT OR REPLACE INTO "{sheet_name}" VALUES ({placeholders})',
+            ([_value(c, row.get(c, '')) for c in columns[:-1]] + [file_path.name] for row in rows))
+        loaded += len(rows)
+    return loaded
+
+def resolve_join_columns(conn):
+    """
+    Fill topic_id from Topic_Sections (or id prefix) and subject_key from
+    Topics, else from the source workbook's stem. Returns {sheet: count} of
+    the rows Topics could not place.
+    """
+    conn.execute('''
+        UPDATE Study_Content SET topic_id = (
+            SELECT s.topic_id FROM Topic_Sections s WHERE s.section_id = Study_Content.section_id)
+        WHERE topic_id IS NULL''')
+    conn.execute('''
+        UPDATE Study_Content SET topic_id = (
+            SELECT t.topic_id FROM Topics t
+            WHERE Study_Content.section_id LIKE t.topic_id || '%'
+            ORDER BY length(t.topic_id) DESC LIMIT 1)
+        WHERE topic_id IS NULL''')
+    unplaced = {}
+    for sheet_name in SHEET_SCHEMAS:
+        if sheet_name in ('Subjects', 'Topics', 'Achievements'):
+            continue
+        conn.execute(f'''
+            UPDATE "{sheet_name}" SET subject_key = (
+                SELECT t.subject_key FROM Topics t WHERE t.topic_id = "{sheet_name}".topic_id)
+            WHERE subject_key IS NULL''')
+        cursor = conn.execute(f'''
+            UPDATE "{sheet_name}" SET subject_key = substr(source, 1, length(source) - 5)
+            WHERE subject_key IS NULL AND source LIKE '%.xlsx' AND source != ?''', (MASTER_WORKBOOK,))
+        if cursor.rowcount:
+            unplaced[sheet_name] = cursor.rowcount
+    return unplaced
+
+def load_csv_tree(conn, tree_dir, tree):
+    """Insert every CSV below public/<tree>/<Subject>/<topic_folder>/ plus the master index"""
+    loaded = 0
+    for csv_path in sorted(tree_dir.rglob('*.csv')):
+        relative = csv_path.relative_to(tree_dir).parts
+        subject, topic_folder = (relative[0], relative[1]) if len(relative) == 3 else ('', '')
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            batch = []
+            for index, row in enumerate(csv.DictReader(f)):
+                row_id = next((row[k] for k in ('question_id', 'content_id', 'section_id', 'topic_id')
+                               if row.get(k)), '')
+                batch.append((tree, subject, topic_folder, csv_path.name, index, row_id,
+                              row.get('topic_id') or None, row.get('section_id') or None,
+                              row.get('content_type') or None, json.dumps(row, ensure_ascii=False)))
+        conn.executemany('INSERT OR REPLACE INTO csv_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', batch)
+        loaded += len(batch)
+    return loaded
+
+def build_database(db_path=DEFAULT_DB, workbooks=None, public_dir=None, page_size=PAGE_SIZE):
+    """
+    Build the content DB from workbooks (default: master + subject workbooks)
+    and the CSV trees under public_dir (None to skip). Written to a temp file
+    and swapped in atomically.
+    """
+    if workbooks is None:
+        workbooks = [DATA_DIR / 'StudyHub_Master.xlsx'] + sorted((DATA_DIR / 'subjects').glob('*.xlsx'))
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(f'PRAGMA page_size = {page_size}')
+        conn.execute('PRAGMA journal_mode = DELETE')
+        create_schema(conn)
+        populate(conn, workbooks, public_dir)
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return db_path
+
+def populate(conn, workbooks, public_dir=None, verbose=True):
+    for workbook in workbooks:
+        count = load_workbook_rows(conn, Path(workbook))
+        if verbose:
+            print(f"  [+] {Path(workbook).name}: {count} rows")
+    unplaced = resolve_join_columns(conn)
+    if verbose:
+        for sheet_name, count in unplaced.items():
+            print(f"  [WARN] {sheet_name}: {count} rows with a topic missing from Topics; "
+                  f"subject taken from their workbook")
+    if public_dir:
+        for tree in CSV_TREES:
+            if (Path(public_dir) / tree).exists():
+                count = load_csv_tree(conn, Path(public_dir) / tree, tree)
+                if verbose:
+                    print(f"  [+] public/{tree}: {count} CSV rows")
+
+def open_workbook_db(file_path):
+    """In-memory content DB for a single workbook (used when a tool is handed an .xlsx)"""
+    conn = sqlite3.connect(':memory:')
+    create_schema(conn)
+    populate(conn, [Path(file_path)], verbose=False)
+    return conn
+
+def connect(path):
+    """Open a content DB (.db) or load a workbook into memory; rows come back as sqlite3.Row"""
+    path = Path(path)
+    conn = sqlite3.connect(path) if path.suffix == '.db' else open_workbook_db(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def sheet_rows(conn, sheet_name, subject_key=None):
+    """Rows of one sheet as string dicts (same shape as read_excel_sheet)"""
+    return list(iter_sheet_rows(conn, sheet_name, subject_key))
+
+def iter_sheet_rows(conn, sheet_name, subject_key=None):
+    """sheet_rows as a generator over the cursor"""
+    columns = table_columns(sheet_name)[:-1]
+    query = 'SELECT {} FROM "{}"'.format(', '.join(f'"{c}"' for c in columns), sheet_name)
+    params = ()
+    if subject_key is not None:
+        query += ' WHERE subject_key = ?'
+        params = (subject_key,)
+    query += ' ORDER BY rowid'  # workbook order
+    for row in conn.execute(query, params):
+        yield {c: '' if v is None else str(v) for c, v in zip(columns, row)}
+
+def subject_keys(conn):
+    """Every subject_key in Topics or on a content row (including workbook-stem fallbacks)"""
+    selects = ' UNION '.join(f'SELECT subject_key FROM "{sheet_name}"' for sheet_name in SHEET_SCHEMAS
+                             if sheet_name not in ('Subjects', 'Achievements'))
+    return [row[0] for row in conn.execute(
+        f'SELECT DISTINCT subject_key FROM ({selects}) WHERE subject_key IS NOT NULL ORDER BY 1')]
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the StudyHub SQLite content store')
+    parser.add_argument('workbooks', nargs='*', help='Workbooks to load (default: master + subject workbooks)')
+    parser.add_argument('-o', '--output', default=str(DEFAULT_DB), help='Output database path')
+    parser.add_argument('--no-csv', action='store_true', help='Skip the public CSV trees')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help='SQLite page size (HTTP range granularity)')
+    args = parser.parse_args()
+
+    print("[*] Building content database...")
+    db_path = build_database(args.output, [Path(p) for p in args.workbooks] or None,
+                             None if args.no_csv else BASE_DIR / 'public', args.page_size)
+    print(f"\n[+] Content database written: {db_path} ({db_path.stat().st_size} bytes)")
+
+if __name__ == '__main__':
+    main()
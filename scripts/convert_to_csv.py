@@ -4,12 +4,30 @@ Excel to CSV Conversion Script for Harshi-App Restructuring
 Converts Excel files to CSV format organized by Subject/Topic
 """
 
-import openpyxl
 import csv
+import itertools
+import json
 import os
+import re
+import sys
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List
 
+# Hand the command to the resident data daemon when it is running (scripts/data_daemon.py)
+if __name__ == '__main__':
+    from data_daemon import forward
+    _exit_code = forward('convert_to_csv', sys.argv[1:])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
+
+import asset_manifest
+import parse_cache
+import schema_registry
+import xlsx_reader
+from render_formulas import rendered_formula_url
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'public' / 'data'
@@ -17,6 +35,19 @@ QUESTIONNAIRE_DIR = BASE_DIR / 'public' / 'questionnaire'
 STUDYGUIDE_DIR = BASE_DIR / 'public' / 'studyguide'
 HANDOUT_DIR = BASE_DIR / 'public' / 'Handout'
 
+# Canonical output columns (the frontend reads these names as delivered)
+QUIZ_FIELDNAMES = schema_registry.csv_columns('questionnaire/questions.csv')
+CONTENT_FIELDNAMES = schema_registry.csv_columns('studyguide/content.csv')
+
+DEFAULT_QUESTION_TYPE = 'mcq'
+DEFAULT_DIFFICULTY = 'medium'
+DEFAULT_XP_REWARD = 10
+OPTION_SEPARATORS = re.compile(r'[|,]')  # same as the client's /[|,]/
+
+# Streaming mode (--stream): rows cleaned per chunk, output files kept open per pool
+STREAM_CHUNK_ROWS = 1024
+MAX_OPEN_FILES = 64
+
 def clean_cell_value(cell):
     """Clean cell value, handle None and empty strings"""
     if cell is None:
@@ -24,35 +55,172 @@ def clean_cell_value(cell):
     value = str(cell).strip()
     return value if value != "None" else ""
 
+def clean_column(values):
+    """clean_cell_value over a whole column"""
+    cleaned = [value.strip() if type(value) is str else "" if value is None else str(value).strip()
+               for value in values]
+    return ["" if value == "None" else value for value in cleaned]
+
+def sheet_records(header, rows):
+    """Non-empty rows of a parsed sheet as dicts of cleaned values, cleaned column by column"""
+    headers = clean_column(header)
+    keep = [i for i, name in enumerate(headers) if name]
+    if not keep or not rows:
+        return []
+    names = [headers[i] for i in keep]
+    columns = [clean_column([row[i] if i < len(row) else None for row in rows]) for i in keep]
+    records = (dict(zip(names, values)) for values in zip(*columns))
+    return [record for record in records if any(record.values())]
+
 def read_excel_sheet(file_path, sheet_name):
-    """Read Excel sheet and return as list of dictionaries"""
+    """Read Excel sheet (through the shared parse cache) and return as list of dictionaries"""
     try:
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        if sheet_name not in wb.sheetnames:
+        sheet = parse_cache.read_sheet(file_path, sheet_name)
+        if sheet is None:
             print(f"  [WARN] Sheet '{sheet_name}' not found in {file_path.name}")
             return []
         
-        ws = wb[sheet_name]
-        data = []
-        
-        # Get header row
-        headers = [clean_cell_value(cell.value) for cell in ws[1]]
-        
-        # Read data rows
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_dict = {}
-            for i, value in enumerate(row):
-                if i < len(headers) and headers[i]:
-                    row_dict[headers[i]] = clean_cell_value(value)
-            if any(row_dict.values()):  # Skip empty rows
-                data.append(row_dict)
-        
-        wb.close()
-        return data
+        header, rows = sheet
+        return sheet_records(header, rows)
     except Exception as e:
         print(f"  [ERROR] Error reading {file_path.name}/{sheet_name}: {e}")
         return []
 
+def iter_excel_sheet(file_path, sheet_name, workbook=None, chunk_size=STREAM_CHUNK_ROWS):
+    """
+    read_excel_sheet as a generator: rows streamed from the workbook (or an
+    already open xlsx_reader.open_read_only workbook) and cleaned a chunk at a time
+    """
+    book = workbook or xlsx_reader.open_read_only(file_path)
+    try:
+        rows = xlsx_reader.iter_sheet_rows(book, sheet_name)
+        try:
+            header = next(rows, ())
+        except KeyError:
+            print(f"  [WARN] Sheet '{sheet_name}' not found in {file_path.name}")
+            return
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield from sheet_records(header, chunk)
+    finally:
+        if workbook is None:
+            book.close()
+
+def to_int(value, default=None):
+    """Parse an integer cell ('3', '3.0', 3) or return default when blank/invalid"""
+    if value in (None, ''):
+        return default
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+def parse_options(value):
+    """
+    Split an options cell on every '|' and every ',' (mixed separators
+    included), dropping blanks: the rule of parseOptions() in
+    unifiedDataService.js, so the typed JSON matches the CSV fallback
+    """
+    if not value:
+        return []
+    return [option.strip() for option in OPTION_SEPARATORS.split(value) if option.strip()]
+
+def normalize_quiz_question(row):
+    """Resolve a raw Quiz_Questions row into canonical, typed fields"""
+    options = [row.get(key, '') for key in ('option_a', 'option_b', 'option_c', 'option_d')]
+    if not any(options):
+        options = (parse_options(row.get('options', '')) + ['', '', '', ''])[:4]
+
+    return {
+        'question_id': row.get('question_id', '') or row.get('id', ''),
+        'topic_id': row.get('topic_id', ''),
+        'question_type': (row.get('question_type', '') or row.get('type', '')).lower().strip() or DEFAULT_QUESTION_TYPE,
+        'question_text': row.get('question_text', '') or row.get('question', ''),
+        'option_a': options[0],
+        'option_b': options[1],
+        'option_c': options[2],
+        'option_d': options[3],
+        'correct_answer': row.get('correct_answer', '') or row.get('answer', ''),
+        'explanation': row.get('explanation', ''),
+        'difficulty': (row.get('difficulty', '') or DEFAULT_DIFFICULTY).lower(),
+        'hint': row.get('hint', ''),
+        'xp_reward': to_int(row.get('xp_reward'), DEFAULT_XP_REWARD),
+        'image_url': row.get('image_url', ''),
+    }
+
+def question_to_json(question):
+    """JSON form of a normalized question: options as a ready-to-use array"""
+    item = dict(question)
+    item['options'] = [item[key] for key in ('option_a', 'option_b', 'option_c', 'option_d') if item[key]]
+    return item
+
+def study_content_item(item, topic_id):
+    """Content row for a Study_Content row (svg_url is filled in by the caller)"""
+    return {
+        'content_id': item.get('content_id', ''),
+        'topic_id': topic_id,
+        'section_id': item.get('section_id', ''),
+        'content_type': (item.get('content_type', '') or 'text').lower(),
+        'title': item.get('content_title', ''),
+        'content': item.get('content_text', ''),
+        'url': item.get('video_url', '') or item.get('image_url', ''),
+        'svg_url': '',
+        'order_index': to_int(item.get('order_index'))
+    }
+
+def formula_content_item(formula):
+    """Content row for a Formulas row (svg_url is filled in by the caller)"""
+    return {
+        'content_id': formula.get('formula_id', ''),
+        'topic_id': formula.get('topic_id', ''),
+        'section_id': '',
+        'content_type': 'formula',
+        'title': formula.get('formula_label', ''),
+        'content': formula.get('formula_text', ''),
+        'url': '',
+        'svg_url': '',
+        'order_index': to_int(formula.get('order_index'))
+    }
+
+def key_term_content_item(term):
+    """Content row for a Key_Terms row"""
+    return {
+        'content_id': term.get('term_id', ''),
+        'topic_id': term.get('topic_id', ''),
+        'section_id': '',
+        'content_type': 'key_term',
+        'title': term.get('term', ''),
+        'content': term.get('definition', ''),
+        'url': '',
+        'svg_url': '',
+        'order_index': None
+    }
+
+def sort_content_items(content_items, section_order):
+    """
+    Stable sort by (section order, order_index). Rows without a section
+    (formulas, key terms) follow the sectioned content; rows without an
+    order_index keep their relative position at the end of their section
+    and are then numbered after the last explicit order_index.
+    """
+    unsectioned = len(section_order)
+
+    def sort_key(item):
+        order = item['order_index']
+        return (section_order.get(item['section_id'], unsectioned), order is None, order or 0)
+
+    ordered = sorted(content_items, key=sort_key)
+
+    last_order = {}
+    for item in ordered:
+        group = item['section_id']
+        if item['order_index'] is None:
+            item['order_index'] = last_order.get(group, 0) + 1
+        last_order[group] = item['order_index']
+    return ordered
+
 def write_csv(file_path, data, fieldnames):
     """Write data to CSV file"""
     if not data:
@@ -70,18 +238,116 @@ def write_csv(file_path, data, fieldnames):
         print(f"  [+] Created: {file_path.relative_to(BASE_DIR)}")
     except Exception as e:
         print(f"  [ERROR] Error writing {file_path}: {e}")
+        return
+
+    schema_name = schema_registry.csv_schema_name(file_path)
+    if schema_name:
+        report_csv_issues(file_path, schema_registry.validate_rows(
+            schema_name, fieldnames, [[row.get(c, '') for c in fieldnames] for row in data]))
+
+def report_csv_issues(file_path, issues):
+    for severity, row_num, message in issues:
+        where = f"row {row_num}" if row_num else 'header'
+        print(f"  [{'ERROR' if severity == 'error' else 'WARN'}] {file_path.name} {where}: {message}")
+
+def write_json(file_path, data):
+    """Write typed rows next to their CSV so the client can use them as delivered"""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        print(f"  [+] Created: {file_path.relative_to(BASE_DIR)}")
+    except Exception as e:
+        print(f"  [ERROR] Error writing {file_path}: {e}")
+
+class FileHandlePool:
+    """
+    Text files written incrementally, with at most max_open of them open at
+    once. The least recently used file is closed when the pool is full and
+    reopened for append on its next write.
+    """
+
+    def __init__(self, max_open=MAX_OPEN_FILES):
+        self.max_open = max(1, max_open)
+        self.handles = OrderedDict()
+        self.started = set()
+
+    def get(self, path):
+        handle = self.handles.get(path)
+        if handle is not None:
+            self.handles.move_to_end(path)
+            return handle
+        if len(self.handles) >= self.max_open:
+            _, oldest = self.handles.popitem(last=False)
+            oldest.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(path, 'a' if path in self.started else 'w', newline='', encoding='utf-8')
+        self.started.add(path)
+        self.handles[path] = handle
+        return handle
+
+    def discard(self, path):
+        """Forget a file so its next write starts it over"""
+        handle = self.handles.pop(path, None)
+        if handle is not None:
+            handle.close()
+        self.started.discard(path)
+
+    def close(self):
+        while self.handles:
+            self.handles.popitem()[1].close()
 
-def get_subject_topic_mapping():
-    """Read master file and get subject/topic mapping"""
-    master_file = DATA_DIR / 'StudyHub_Master.xlsx'
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_subject_sources(db_path=None, stream=False):
+    """
+    Yield (subject_key, read_sheet) for each subject, where read_sheet(name)
+    returns that subject's rows: from the subject workbooks, or from a content
+    DB built by content_db.py when db_path is given. With stream=True,
+    read_sheet returns an iterator instead of a list.
+    """
+    if db_path:
+        import content_db
+        read_rows = content_db.iter_sheet_rows if stream else content_db.sheet_rows
+        conn = content_db.connect(db_path)
+        try:
+            for subject_key in content_db.subject_keys(conn):
+                yield subject_key, lambda sheet, key=subject_key: read_rows(conn, sheet, key)
+        finally:
+            conn.close()
+        return
+
+    for subject_file in (DATA_DIR / 'subjects').glob('*.xlsx'):
+        if not stream:
+            yield subject_file.stem, lambda sheet, path=subject_file: read_excel_sheet(path, sheet)
+            continue
+        # One read-only workbook per subject: openpyxl scans every sheet each time one is opened
+        workbook = xlsx_reader.open_read_only(subject_file)
+        try:
+            yield subject_file.stem, lambda sheet, path=subject_file: iter_excel_sheet(path, sheet, workbook)
+        finally:
+            workbook.close()
+
+def get_subject_topic_mapping(db_path=None):
+    """Read master file (or content DB) and get subject/topic mapping"""
+    if db_path:
+        import content_db
+        conn = content_db.connect(db_path)
+        subjects_data = content_db.sheet_rows(conn, 'Subjects')
+        topics_data = content_db.sheet_rows(conn, 'Topics')
+        conn.close()
+    else:
+        master_file = DATA_DIR / 'StudyHub_Master.xlsx'
+        subjects_data = read_excel_sheet(master_file, 'Subjects')
+        topics_data = read_excel_sheet(master_file, 'Topics')
     
-    # Read Subjects
-    subjects_data = read_excel_sheet(master_file, 'Subjects')
     subjects = {s['subject_key']: s['name'] for s in subjects_data if 'subject_key' in s and 'name' in s}
     
-    # Read Topics
-    topics_data = read_excel_sheet(master_file, 'Topics')
-    
     # Build mapping: {subject_key: {topic_id: topic_name}}
     mapping = {}
     for topic in topics_data:
@@ -120,139 +386,251 @@ def create_master_indices(subjects, mapping):
     write_csv(STUDYGUIDE_DIR / '_master_index.csv', index_data, fieldnames)
     write_csv(HANDOUT_DIR / '_master_index.csv', index_data, fieldnames)
 
-def convert_quiz_questions():
+def topic_questions(quiz_rows):
+    """Yield (topic_id, question) for each Quiz_Questions row that has a topic"""
+    for row in quiz_rows:
+        question = normalize_quiz_question(row)
+        question['topic_name'] = row.get('topic_name', '')
+        if question['topic_id']:
+            yield question['topic_id'], question
+
+def questionnaire_dir(subject_key, topic_id, topic_name):
+    topic_folder = (topic_name or topic_id).replace(' ', '_').replace("'", "")
+    return QUESTIONNAIRE_DIR / subject_key.title() / topic_folder
+
+def section_index(sections):
+    """({section_id: topic_id}, {section_id: position}) from Topic_Sections rows"""
+    sections = list(sections)
+    section_topics = {s.get('section_id', ''): s.get('topic_id', '') for s in sections}
+    section_order = {}
+    for s in sorted(sections, key=lambda s: to_int(s.get('order_index'), 0)):
+        section_order.setdefault(s.get('section_id', ''), len(section_order))
+    return section_topics, section_order
+
+def topic_content(study_content, formulas, key_terms, section_topics):
+    """Yield (topic_id, content item) for study content, then formulas, then key terms"""
+    # Study_Content rows only carry section_id; resolve the topic from Topic_Sections
+    for item in study_content:
+        section_id = item.get('section_id', '')
+        topic_id = item.get('topic_id', '') or section_topics.get(section_id, '')
+        if not topic_id:
+            continue
+        entry = study_content_item(item, topic_id)
+        if entry['content_type'] == 'formula':
+            entry['svg_url'] = rendered_formula_url(entry['content'])
+        yield topic_id, entry
+    
+    # Add formulas as content
+    for formula in formulas:
+        topic_id = formula.get('topic_id', '')
+        if not topic_id:
+            continue
+        entry = formula_content_item(formula)
+        entry['svg_url'] = rendered_formula_url(entry['content'])
+        yield topic_id, entry
+    
+    # Add key terms
+    for term in key_terms:
+        topic_id = term.get('topic_id', '')
+        if topic_id:
+            yield topic_id, key_term_content_item(term)
+
+def studyguide_dir(subject_key, topic_id):
+    topic_name = topic_id.replace('-', ' ').replace('_', ' ').title()
+    topic_folder = topic_name.replace(' ', '_').replace("'", "")
+    return STUDYGUIDE_DIR / subject_key.title() / topic_folder
+
+def convert_quiz_questions(db_path=None):
     """Convert Quiz_Questions from all subject files"""
     print("\n[*] Converting Quiz Questions...")
     
-    subjects_dir = DATA_DIR / 'subjects'
-    
-    for subject_file in subjects_dir.glob('*.xlsx'):
-        subject_key = subject_file.stem  # e.g., 'physics'
+    for subject_key, read_sheet in iter_subject_sources(db_path):  # e.g., 'physics'
         print(f"\n  Processing {subject_key}...")
         
-        quiz_data = read_excel_sheet(subject_file, 'Quiz_Questions')
-        
         # Group by topic_id
         by_topic = {}
-        for question in quiz_data:
-            topic_id = question.get('topic_id', '')
-            if not topic_id:
-                continue
-            if topic_id not in by_topic:
-                by_topic[topic_id] = []
-            by_topic[topic_id].append(question)
+        for topic_id, question in topic_questions(read_sheet('Quiz_Questions')):
+            by_topic.setdefault(topic_id, []).append(question)
         
         # Write CSV per topic
         for topic_id, questions in by_topic.items():
             # Get topic name from questions or use topic_id
-            topic_name = questions[0].get('topic_name', topic_id) if questions else topic_id
-            topic_folder = topic_name.replace(' ', '_').replace("'", "")
-            
-            output_path = QUESTIONNAIRE_DIR / subject_key.title() / topic_folder / 'questions.csv'
-            
-            fieldnames = ['question_id', 'topic_id', 'question_text', 'option_a', 'option_b', 
-                         'option_c', 'option_d', 'correct_answer', 'explanation', 'difficulty', 'hint', 'xp_reward']
+            output_dir = questionnaire_dir(subject_key, topic_id, questions[0].get('topic_name'))
             
-            write_csv(output_path, questions, fieldnames)
+            write_csv(output_dir / 'questions.csv', questions, QUIZ_FIELDNAMES)
+            write_json(output_dir / 'questions.json',
+                       [question_to_json({k: q[k] for k in QUIZ_FIELDNAMES}) for q in questions])
 
-def convert_study_content():
+def convert_study_content(db_path=None):
     """Convert Study_Content, Formulas, Key_Terms from all subject files"""
     print("\n[*] Converting Study Content...")
     
-    subjects_dir = DATA_DIR / 'subjects'
-    
-    for subject_file in subjects_dir.glob('*.xlsx'):
-        subject_key = subject_file.stem
+    for subject_key, read_sheet in iter_subject_sources(db_path):
         print(f"\n  Processing {subject_key}...")
         
-        # Read all study-related sheets
-        study_content = read_excel_sheet(subject_file, 'Study_Content')
-        formulas = read_excel_sheet(subject_file, 'Formulas')
-        key_terms = read_excel_sheet(subject_file, 'Key_Terms')
+        section_topics, section_order = section_index(read_sheet('Topic_Sections'))
         
         # Group by topic_id
         by_topic = {}
-        
-        # Add study content
-        for item in study_content:
-            topic_id = item.get('topic_id', '')
-            if not topic_id:
-                continue
-            if topic_id not in by_topic:
-                by_topic[topic_id] = []
-            by_topic[topic_id].append({
-                'content_id': item.get('content_id', ''),
-                'content_type': item.get('content_type', 'text'),
-                'title': item.get('content_title', ''),
-                'content': item.get('content_text', ''),
-                'url': item.get('video_url', '') or item.get('image_url', ''),
-                'order_index': item.get('order_index', '')
-            })
-        
-        # Add formulas as content
-        for formula in formulas:
-            topic_id = formula.get('topic_id', '')
-            if not topic_id:
-                continue
-            if topic_id not in by_topic:
-                by_topic[topic_id] = []
-            by_topic[topic_id].append({
-                'content_id': formula.get('formula_id', ''),
-                'content_type': 'formula',
-                'title': formula.get('formula_label', ''),
-                'content': formula.get('formula_text', ''),
-                'url': '',
-                'order_index': formula.get('order_index', '')
-            })
-        
-        # Add key terms
-        for term in key_terms:
-            topic_id = term.get('topic_id', '')
-            if not topic_id:
-                continue
-            if topic_id not in by_topic:
-                by_topic[topic_id] = []
-            by_topic[topic_id].append({
-                'content_id': term.get('term_id', ''),
-                'content_type': 'key_term',
-                'title': term.get('term', ''),
-                'content': term.get('definition', ''),
-                'url': '',
-                'order_index': ''
-            })
+        for topic_id, entry in topic_content(read_sheet('Study_Content'), read_sheet('Formulas'),
+                                             read_sheet('Key_Terms'), section_topics):
+            by_topic.setdefault(topic_id, []).append(entry)
         
         # Write CSV per topic
         for topic_id, content_items in by_topic.items():
-            # Get topic name
-            topic_name = topic_id.replace('-', ' ').replace('_', ' ').title()
-            if content_items and 'topic_name' in content_items[0]:
-                topic_name = content_items[0].get('topic_name', topic_name)
-            topic_folder = topic_name.replace(' ', '_').replace("'", "")
+            content_items = sort_content_items(content_items, section_order)
+            output_dir = studyguide_dir(subject_key, topic_id)
             
-            output_path = STUDYGUIDE_DIR / subject_key.title() / topic_folder / 'content.csv'
+            write_csv(output_dir / 'content.csv', content_items, CONTENT_FIELDNAMES)
+            write_json(output_dir / 'content.json', content_items)
+
+def stream_quiz_questions(db_path=None, max_open=MAX_OPEN_FILES):
+    """
+    convert_quiz_questions without holding a sheet in memory: each row goes
+    straight to its topic's questions.csv/questions.json through a bounded
+    pool of open files. Output is byte-identical to the in-memory path.
+    """
+    print("\n[*] Converting Quiz Questions (streaming)...")
+    
+    for subject_key, read_sheet in iter_subject_sources(db_path, stream=True):
+        print(f"\n  Processing {subject_key}...")
+        
+        topics = {}  # topic_id -> output paths, row count and validation issues (None once replaced)
+        owners = {}  # output dir -> topic_id (a later topic with the same folder replaces it, as in memory)
+        with FileHandlePool(max_open) as pool:
+            for topic_id, question in topic_questions(read_sheet('Quiz_Questions')):
+                if topic_id in topics and topics[topic_id] is None:
+                    continue
+                topic = topics.get(topic_id)
+                if topic is None:
+                    output_dir = questionnaire_dir(subject_key, topic_id, question.get('topic_name'))
+                    replaced = owners.get(output_dir)
+                    if replaced:
+                        pool.discard(topics[replaced]['csv'])
+                        pool.discard(topics[replaced]['json'])
+                        topics[replaced] = None
+                    owners[output_dir] = topic_id
+                    csv_path = output_dir / 'questions.csv'
+                    schema_name = schema_registry.csv_schema_name(csv_path)
+                    validator = schema_name and schema_registry.compile_validator(schema_name, QUIZ_FIELDNAMES)
+                    topic = topics[topic_id] = {
+                        'csv': csv_path, 'json': output_dir / 'questions.json', 'rows': 0, 'validator': validator,
+                        'issues': [(severity, None, message) for severity, message in validator.header_issues]
+                                  if validator else []}
+                    csv.writer(pool.get(topic['csv'])).writerow(QUIZ_FIELDNAMES)
+                
+                values = [question.get(c, '') for c in QUIZ_FIELDNAMES]
+                csv.writer(pool.get(topic['csv'])).writerow(values)
+                item = question_to_json({k: question[k] for k in QUIZ_FIELDNAMES})
+                pool.get(topic['json']).write(('[' if topic['rows'] == 0 else ',')
+                                              + json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+                if topic['validator']:
+                    topic['issues'] += topic['validator'].validate([values], topic['rows'] + 2)
+                topic['rows'] += 1
             
-            fieldnames = ['content_id', 'content_type', 'title', 'content', 'url', 'order_index']
+            topics = {topic_id: topic for topic_id, topic in topics.items() if topic}
+            for topic in topics.values():
+                pool.get(topic['json']).write(']')
+        
+        for topic in topics.values():
+            for path in (topic['csv'], topic['json']):
+                print(f"  [+] Created: {path.relative_to(BASE_DIR)}")
+            report_csv_issues(topic['csv'], topic['issues'])
+
+def stream_study_content(db_path=None, max_open=MAX_OPEN_FILES):
+    """
+    convert_study_content without holding a sheet in memory. Content rows are
+    spilled to one temporary file per topic (through a bounded pool of open
+    files) as they are read, then each topic is loaded, sorted and written on
+    its own, so peak memory is one topic rather than the whole subject.
+    """
+    print("\n[*] Converting Study Content (streaming)...")
+    
+    for subject_key, read_sheet in iter_subject_sources(db_path, stream=True):
+        print(f"\n  Processing {subject_key}...")
+        
+        section_topics, section_order = section_index(read_sheet('Topic_Sections'))
+        
+        with tempfile.TemporaryDirectory(prefix='studyhub-spill-') as spill_dir:
+            spills = {}  # topic_id -> spill file, in first-seen order
+            with FileHandlePool(max_open) as pool:
+                for topic_id, entry in topic_content(read_sheet('Study_Content'), read_sheet('Formulas'),
+                                                     read_sheet('Key_Terms'), section_topics):
+                    spill = spills.setdefault(topic_id, Path(spill_dir) / f'{len(spills)}.jsonl')
+                    pool.get(spill).write(json.dumps(entry, ensure_ascii=False) + '\n')
             
-            write_csv(output_path, content_items, fieldnames)
+            for topic_id, spill in spills.items():
+                with open(spill, 'r', encoding='utf-8') as f:
+                    content_items = [json.loads(line) for line in f]
+                content_items = sort_content_items(content_items, section_order)
+                output_dir = studyguide_dir(subject_key, topic_id)
+                
+                write_csv(output_dir / 'content.csv', content_items, CONTENT_FIELDNAMES)
+                write_json(output_dir / 'content.json', content_items)
+
+def compile_achievement_rules(db_path=None):
+    """Compile Achievements.unlock_condition into public/data/achievements.json"""
+    from compile_achievements import write_rules
+    
+    print("\n[*] Compiling achievement conditions...")
+    if db_path:
+        import content_db
+        conn = content_db.connect(db_path)
+        achievements = content_db.sheet_rows(conn, 'Achievements')
+        conn.close()
+    else:
+        achievements = read_excel_sheet(DATA_DIR / 'StudyHub_Master.xlsx', 'Achievements')
+    
+    errors = write_rules(achievements)
+    if errors:
+        for error in errors:
+            print(f"  [ERROR] {error}")
+        raise SystemExit(1)
 
 def main():
     """Main conversion function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Convert Excel data to the public CSV trees')
+    parser.add_argument('--db', help='Read from a content DB (scripts/content_db.py) instead of the workbooks')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream rows to per-topic files instead of loading whole sheets (flat memory)')
+    parser.add_argument('--max-open-files', type=int, default=MAX_OPEN_FILES,
+                        help='Output files kept open at once in --stream mode')
+    parser.add_argument('--hashed', action='store_true',
+                        help='Also write content-hashed copies and public/content-manifest.json '
+                             '(scripts/asset_manifest.py); refreshed on every run once it exists')
+    parser.add_argument('--keep-generations', type=int, default=asset_manifest.KEEP_GENERATIONS,
+                        help='Builds whose hashed files are kept')
+    args = parser.parse_args()
+    
     print("[*] Starting Excel to CSV Conversion...")
     print(f"[*] Base Directory: {BASE_DIR}")
     
     # Step 1: Get subject/topic mapping
     print("\n[*] Reading master data...")
-    subjects, mapping = get_subject_topic_mapping()
+    subjects, mapping = get_subject_topic_mapping(args.db)
     print(f"  Found {len(subjects)} subjects, {sum(len(t) for t in mapping.values())} topics")
     
     # Step 2: Create master indices
     create_master_indices(subjects, mapping)
     
-    # Step 3: Convert quiz questions
-    convert_quiz_questions()
+    # Steps 3-4: Convert quiz questions and study content
+    if args.stream:
+        stream_quiz_questions(args.db, args.max_open_files)
+        stream_study_content(args.db, args.max_open_files)
+    else:
+        convert_quiz_questions(args.db)
+        convert_study_content(args.db)
+    
+    # Step 5: Compile achievement unlock conditions (fails the build on unparseable conditions)
+    compile_achievement_rules(args.db)
     
-    # Step 4: Convert study content
-    convert_study_content()
+    # Step 6: Content-hashed copies + manifest for immutable caching (kept current once published)
+    if args.hashed:
+        asset_manifest.publish(BASE_DIR / 'public', args.keep_generations)
+    else:
+        asset_manifest.refresh(BASE_DIR / 'public', args.keep_generations)
     
     print("\n[+] Conversion complete!")
     print(f"\n[*] Output directories:")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+CSV to Excel Reverse Conversion Script for Harshi-App
+Folds hand edits made in the public CSV trees back into the subject
+workbooks (the reverse of convert_to_csv.py):
+
+- questionnaire/<Subject>/<folder>/questions.csv -> Quiz_Questions
+- studyguide/<Subject>/<folder>/sections.csv     -> Topic_Sections
+- studyguide/<Subject>/<folder>/content.csv      -> Study_Content, plus Formulas
+  (unsectioned 'formula' rows) and Key_Terms (unsectioned 'key_term' rows)
+
+Subjects are folded one at a time: a subject's CSV rows are read into a
+primary-key map, then its existing workbook is streamed sheet by sheet
+(read-only openpyxl) and merged against that map. A CSV row only replaces the
+columns it carries, so workbook-only columns (formula variables, image vs.
+video URL, ...) and sheets the CSVs never see (Learning_Objectives) survive;
+unknown keys are appended. Workbooks are written row by row in openpyxl
+write_only mode and swapped in atomically. Memory is bounded by one subject's
+CSV rows, not by the workbook or the whole tree. Subjects and Topics live in
+StudyHub_Master.xlsx, which is not touched.
+
+Afterwards every CSV row is run back through the forward conversion row
+builders against the written workbook, and per-file row counts and per-row
+content hashes are compared (exit code 1 on any mismatch).
+
+Usage:
+    python scripts/csv_to_excel.py [--output-dir DIR] [--subject physics] [--no-verify]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from openpyxl import Workbook
+
+import parse_cache
+import xlsx_reader
+from content_db import INTEGER_COLUMNS, PRIMARY_KEYS
+from schema_registry import SHEET_SCHEMAS, get_schema
+from convert_to_csv import (
+    DATA_DIR, QUESTIONNAIRE_DIR, STUDYGUIDE_DIR, formula_content_item, key_term_content_item,
+    normalize_quiz_question, parse_options, read_excel_sheet, study_content_item, to_int,
+)
+
+BASE_DIR = Path(__file__).parent.parent
+
+OPTION_COLUMNS = ['option_a', 'option_b', 'option_c', 'option_d']
+
+# Alternate CSV header -> workbook column
+QUESTION_ALIASES = get_schema('questionnaire/questions.csv')['aliases']
+CONTENT_ALIASES = {'title': 'content_title', 'content': 'content_text'}
+
+# content.csv column (either style) -> forward-conversion field
+CONTENT_FIELDS = {'content_title': 'title', 'content_text': 'content', 'video_url': 'url', 'image_url': 'url'}
+
+# Regenerated by the forward conversion, never folded back
+DERIVED_COLUMNS = {'svg_url'}
+
+
+# ============================================================================
+# CSV -> SHEET ROWS
+# ============================================================================
+
+def question_sheet_row(row):
+    """Quiz_Questions row for a questions.csv row (either header style)"""
+    sheet_row = {}
+    for column, value in row.items():
+        if column is None or column in DERIVED_COLUMNS:
+            continue
+        column = QUESTION_ALIASES.get(column, column)
+        if column == 'options':
+            if not any(row.get(c) for c in OPTION_COLUMNS):
+                sheet_row.update(zip(OPTION_COLUMNS, (parse_options(value) + ['', '', '', ''])[:4]))
+        else:
+            sheet_row[column] = value
+    return 'Quiz_Questions', sheet_row
+
+def content_sheet_row(row):
+    """(sheet, row) for a content.csv row (either header style)"""
+    item = {CONTENT_ALIASES.get(c, c): v for c, v in row.items() if c is not None and c not in DERIVED_COLUMNS}
+    content_type = (item.get('content_type', '') or 'text').lower()
+
+    if content_type == 'key_term' and not item.get('section_id'):
+        renames = {'content_id': 'term_id', 'topic_id': 'topic_id',
+                   'content_title': 'term', 'content_text': 'definition'}
+        return 'Key_Terms', {renames[c]: v for c, v in item.items() if c in renames}
+
+    if content_type == 'formula' and not item.get('section_id'):
+        renames = {'content_id': 'formula_id', 'topic_id': 'topic_id', 'content_title': 'formula_label',
+                   'content_text': 'formula_text', 'order_index': 'order_index'}
+        return 'Formulas', {renames[c]: v for c, v in item.items() if c in renames}
+
+    return 'Study_Content', item
+
+def apply_url(existing, row):
+    """Forward conversion collapses video_url/image_url into 'url'; put it back where it came from"""
+    if 'url' not in row:
+        return row
+    row = dict(row)
+    url = row.pop('url')
+    is_video = existing.get('video_url') or (row.get('content_type') or existing.get('content_type')) == 'video'
+    row['video_url' if is_video else 'image_url'] = url
+    return row
+
+def cell_value(column, value):
+    if value == '':
+        return None
+    if column in INTEGER_COLUMNS:
+        number = to_int(value)
+        return value if number is None else number
+    return value
+
+def folder_topics(tree_dir):
+    """topic_folder -> topic_id from a tree's master-index.csv"""
+    index_path = tree_dir / 'master-index.csv'
+    if not index_path.exists():
+        return {}
+    with open(index_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return {row.get('topic_folder', ''): row.get('topic_id', '') for row in csv.DictReader(f)}
+
+def iter_tree_csvs(subjects=None):
+    """Yield (csv_path, subject_key, default_topic_id, row_mapper) for every foldable CSV"""
+    mappers = [(QUESTIONNAIRE_DIR, 'questions.csv', question_sheet_row),
+               (STUDYGUIDE_DIR, 'sections.csv', lambda row: ('Topic_Sections', dict(row))),
+               (STUDYGUIDE_DIR, 'content.csv', content_sheet_row)]
+    for tree_dir, file_name, mapper in mappers:
+        topics = folder_topics(tree_dir)
+        for csv_path in sorted(tree_dir.glob(f'*/*/{file_name}')):
+            subject_key = csv_path.parent.parent.name.lower()
+            if subjects and subject_key not in subjects:
+                continue
+            folder = csv_path.parent.name
+            yield csv_path, subject_key, topics.get(folder) or folder.lower().replace('_', '-'), mapper
+
+def tree_subjects(subjects=None):
+    """Subject keys that have foldable CSVs, sorted"""
+    return sorted({subject_key for _, subject_key, _, _ in iter_tree_csvs(subjects)})
+
+def collect_updates(subjects=None):
+    """Read the CSV trees into {subject: {sheet: {key: (row, default_topic_id)}}}, later rows winning"""
+    updates = defaultdict(lambda: defaultdict(dict))
+    for csv_path, subject_key, topic_id, mapper in iter_tree_csvs(subjects):
+        count = 0
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for line, row in enumerate(csv.DictReader(f), 2):
+                if None in row:
+                    print(f"  [WARN] {csv_path.relative_to(BASE_DIR)} row {line}: "
+                          f"{len(row[None])} unquoted extra field(s), skipped")
+                    continue
+                sheet_name, sheet_row = mapper(row)
+                key = sheet_row.get(PRIMARY_KEYS[sheet_name], '')
+                if not key:
+                    print(f"  [WARN] {csv_path.relative_to(BASE_DIR)}: row without {PRIMARY_KEYS[sheet_name]} skipped")
+                    continue
+                if key in updates[subject_key][sheet_name]:
+                    print(f"  [WARN] {sheet_name} '{key}' appears more than once; "
+                          f"{csv_path.relative_to(BASE_DIR)} wins")
+                updates[subject_key][sheet_name][key] = (sheet_row, topic_id)
+                count += 1
+        print(f"  [+] {csv_path.relative_to(BASE_DIR)}: {count} rows")
+    return updates
+
+
+# ============================================================================
+# MERGE + WRITE
+# ============================================================================
+
+def base_sheets(workbook_path):
+    """Yield (sheet, header, row iterator of dicts) streamed from an existing workbook"""
+    if not workbook_path.exists():
+        return
+    workbook = xlsx_reader.open_read_only(workbook_path)
+    try:
+        for sheet_name in workbook.sheetnames:
+            rows = xlsx_reader.iter_sheet_rows(workbook, sheet_name)
+            columns = [(i, h) for i, h in enumerate(next(rows, ())) if h is not None]
+            header = [h for _, h in columns]
+            sheet_rows = ({h: row[i] if i < len(row) else None for i, h in columns}
+                          for row in rows if any(v not in (None, '') for v in row))
+            yield sheet_name, header, sheet_rows
+    finally:
+        workbook.close()
+
+def merge_row(existing, update, topic_id, header):
+    merged = dict(existing)
+    for column, value in apply_url(existing, update).items():
+        merged[column] = cell_value(column, value)
+    if 'topic_id' in header and not merged.get('topic_id'):
+        merged['topic_id'] = topic_id
+    return merged
+
+def merged_sheets(sheets, updates):
+    """
+    Yield (sheet_name, header, row iterator) with CSV updates merged in by
+    primary key; `sheets` is base_sheets(), consumed one sheet at a time.
+    Sheets only the CSVs have are added after the workbook's own.
+    """
+    seen = set()
+    for sheet_name, header, rows in sheets:
+        seen.add(sheet_name)
+        yield _merge_sheet(sheet_name, header, rows, updates)
+    for sheet_name in SHEET_SCHEMAS:
+        if sheet_name in updates and sheet_name not in seen:
+            yield _merge_sheet(sheet_name, [], [], updates)
+
+def _merge_sheet(sheet_name, header, rows, updates):
+    pending = dict(updates.get(sheet_name, {}))
+    if pending:
+        header = list(header)
+        extra = list(SHEET_SCHEMAS[sheet_name]['columns'])
+        for row, _ in pending.values():
+            extra.extend(apply_url({}, row))
+        header.extend(dict.fromkeys(c for c in extra if c not in header))
+
+    def merged_rows(rows=rows, pending=pending, header=header, key_column=PRIMARY_KEYS.get(sheet_name)):
+        for row in rows:
+            key = row.get(key_column) if key_column else None
+            if key is not None and str(key).strip() in pending:
+                update, topic_id = pending.pop(str(key).strip())
+                yield merge_row(row, update, topic_id, header)
+            else:
+                yield row
+        for update, topic_id in pending.values():
+            yield merge_row({}, update, topic_id, header)
+
+    return sheet_name, header, merged_rows()
+
+def write_workbook(output_path, sheets):
+    """Stream sheets into a write_only workbook; returns {sheet: rows written}"""
+    wb = Workbook(write_only=True)
+    counts = {}
+    for sheet_name, header, rows in sheets:
+        ws = wb.create_sheet(sheet_name)
+        ws.append(header)
+        counts[sheet_name] = 0
+        for row in rows:
+            ws.append([row.get(column) for column in header])
+            counts[sheet_name] += 1
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    wb.save(tmp_path)
+    os.replace(tmp_path, output_path)
+    return counts
+
+
+# ============================================================================
+# ROUND-TRIP CHECK
+# ============================================================================
+
+def row_hash(fields):
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+def _content_fields(row):
+    """A content.csv row in forward-conversion form (whichever header style it uses)"""
+    item = {CONTENT_ALIASES.get(c, c): v for c, v in row.items() if c is not None}
+    return {
+        'content_id': item.get('content_id', ''),
+        'topic_id': item.get('topic_id', ''),
+        'section_id': item.get('section_id', ''),
+        'content_type': (item.get('content_type', '') or 'text').lower(),
+        'title': item.get('content_title', ''),
+        'content': item.get('content_text', ''),
+        'url': item.get('url', '') or item.get('video_url', '') or item.get('image_url', ''),
+        'order_index': to_int(item.get('order_index')),
+    }
+
+def forward_fields(file_name, row, lookup, section_topics):
+    """(expected, actual) forward-conversion fields for one CSV row; actual is None if the key is missing"""
+    sheet_name, sheet_row = {'questions.csv': question_sheet_row, 'content.csv': content_sheet_row,
+                             'sections.csv': lambda r: ('Topic_Sections', dict(r))}[file_name](row)
+    source = lookup.get(sheet_name, {}).get(sheet_row.get(PRIMARY_KEYS[sheet_name], ''))
+
+    if file_name == 'questions.csv':
+        carried = set(sheet_row) & set(normalize_quiz_question({}))
+        expected = {k: v for k, v in normalize_quiz_question(sheet_row).items() if k in carried}
+        actual = source and {k: v for k, v in normalize_quiz_question(source).items() if k in carried}
+        return expected, actual
+
+    if file_name == 'sections.csv':
+        expected = {k: to_int(v) if k in INTEGER_COLUMNS else v for k, v in sheet_row.items() if k}
+        actual = source and {k: to_int(source.get(k)) if k in INTEGER_COLUMNS else source.get(k, '')
+                             for k in expected}
+        return expected, actual
+
+    fields = _content_fields(row)
+    carried = {CONTENT_FIELDS.get(c, c) for c in row if c} & set(fields)
+    if source is None:
+        return {k: fields[k] for k in carried}, None
+
+    if sheet_name == 'Key_Terms':
+        forward = key_term_content_item(source)
+        carried.discard('order_index')  # key terms are numbered by the forward sort
+    elif sheet_name == 'Formulas':
+        forward = formula_content_item(source)
+    else:
+        forward = study_content_item(source, source.get('topic_id', '') or
+                                     section_topics.get(source.get('section_id', ''), ''))
+    if fields['order_index'] is None:
+        carried.discard('order_index')
+    return {k: fields[k] for k in carried}, {k: forward[k] for k in carried}
+
+def verify(output_dir, subjects=None):
+    """Compare every CSV row with the written workbooks; returns a list of mismatch messages"""
+    problems = []
+    for subject_key in tree_subjects(subjects):
+        problems += verify_subject(output_dir, subject_key)
+    return problems
+
+def verify_subject(output_dir, subject_key):
+    problems = []
+    workbook = output_dir / f'{subject_key}.xlsx'
+    lookup = {}
+    for sheet_name, key_column in PRIMARY_KEYS.items():
+        if workbook.exists() and sheet_name in parse_cache.sheet_names(workbook):
+            lookup[sheet_name] = {row.get(key_column, ''): row for row in read_excel_sheet(workbook, sheet_name)}
+    section_topics = {k: r.get('topic_id', '') for k, r in lookup.get('Topic_Sections', {}).items()}
+
+    for csv_path, _, _, _ in iter_tree_csvs({subject_key}):
+        relative = csv_path.relative_to(BASE_DIR)
+        rows = found = 0
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                if None in row:  # malformed, reported and skipped when collecting
+                    continue
+                rows += 1
+                expected, actual = forward_fields(csv_path.name, row, lookup, section_topics)
+                if actual is None:
+                    continue
+                found += 1
+                if row_hash(expected) != row_hash(actual):
+                    changed = sorted(k for k in expected if expected[k] != actual.get(k))
+                    problems.append(f"{relative} row {rows + 1}: hash mismatch in {', '.join(changed)}")
+        if found != rows:
+            problems.append(f"{relative}: {rows} CSV rows, {found} found in {subject_key}.xlsx")
+    return problems
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Fold the public CSV trees back into the subject workbooks')
+    parser.add_argument('--output-dir', default=str(DATA_DIR / 'subjects'),
+                        help='Where to write <subject>.xlsx (default: public/data/subjects, in place)')
+    parser.add_argument('--subject', action='append', help='Only this subject key (repeatable)')
+    parser.add_argument('--no-verify', action='store_true', help='Skip the round-trip check')
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    subjects = set(args.subject) if args.subject else None
+
+    for subject_key in tree_subjects(subjects):
+        print(f"[*] Folding {subject_key}...")
+        updates = collect_updates({subject_key})[subject_key]
+        source = DATA_DIR / 'subjects' / f'{subject_key}.xlsx'
+        output_path = output_dir / f'{subject_key}.xlsx'
+        counts = write_workbook(output_path, merged_sheets(base_sheets(source), updates))
+        summary = ', '.join(f'{name} {count}' for name, count in counts.items())
+        print(f"  [+] {output_path}: {summary}")
+
+    if args.no_verify:
+        return
+
+    print("\n[*] Verifying round trip...")
+    problems = verify(output_dir, subjects)
+    for problem in problems:
+        print(f"  [ERROR] {problem}")
+    if problems:
+        sys.exit(1)
+    print("  [+] Row counts and content hashes match the CSV trees")
+
+if __name__ == '__main__':
+    main()
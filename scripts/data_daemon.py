@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Resident Data Daemon for Harshi-App
+Keeps the data tools imported and their parsed workbooks in memory between
+commands, so repeated `setup_data.py validate / validate-coverage /
+export-json ...` and `convert_to_csv.py` runs skip interpreter start-up,
+imports and XLSX parsing.
+
+The daemon listens on a Unix socket (.cache/studyhub-daemon.sock, or
+STUDYHUB_DAEMON_SOCKET). setup_data.py and convert_to_csv.py check for it
+before their heavy imports: when it is running they forward their arguments
+and working directory, stream back its output and exit with its exit code;
+otherwise they run as before. STUDYHUB_NO_DAEMON=1 always runs locally.
+
+Parsed sheets live in parse_cache's in-process memo, keyed by each file's
+content hash (memoized by size and mtime), so an edited workbook is
+re-parsed on the next command and its old sheets are dropped. Commands run
+one at a time. When a tool's own source changes, the daemon exits and the
+client runs the command locally.
+
+The tools read their settings (STUDYHUB_XLSX_ENGINE, STUDYHUB_PARSE_CACHE_*,
+REACT_APP_SHEET_ID, ...) when imported, so the client sends its STUDYHUB_* and
+REACT_APP_* variables along and the daemon declines commands whose values
+differ from its own; those run locally.
+
+Protocol: one JSON request line, then JSON response lines
+({"out": text} ... then {"exit": code}, or {"stale": true} / {"env": [names]}).
+
+Usage:
+    python scripts/data_daemon.py start [--detach] [--no-warm]
+    python scripts/data_daemon.py status
+    python scripts/data_daemon.py stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = BASE_DIR / 'scripts'
+SOCKET_PATH = Path(os.environ.get('STUDYHUB_DAEMON_SOCKET', BASE_DIR / '.cache' / 'studyhub-daemon.sock'))
+LOG_PATH = BASE_DIR / '.cache' / 'studyhub-daemon.log'
+CONNECT_TIMEOUT = 0.5
+
+# Environment variables the tools read; a forwarded command must match the daemon's
+ENV_PREFIXES = ('STUDYHUB_', 'REACT_APP_')
+CLIENT_ONLY_ENV = {'STUDYHUB_NO_DAEMON', 'STUDYHUB_DAEMON_SOCKET'}
+
+# Tools the daemon can run: name -> module (imported from BASE_DIR or scripts/)
+TOOLS = {
+    'setup_data': 'setup_data',
+    'convert_to_csv': 'convert_to_csv',
+}
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def tool_env(environ=None):
+    """The STUDYHUB_* / REACT_APP_* settings that can change what a tool does"""
+    environ = os.environ if environ is None else environ
+    return {k: v for k, v in environ.items() if k.startswith(ENV_PREFIXES) and k not in CLIENT_ONLY_ENV}
+
+def _connect(timeout=CONNECT_TIMEOUT):
+    """Connected socket to a running daemon, or None"""
+    if not hasattr(socket, 'AF_UNIX') or not SOCKET_PATH.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(SOCKET_PATH))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+def _request(sock, payload):
+    sock.sendall((json.dumps(payload) + '\n').encode('utf-8'))
+    with sock.makefile('r', encoding='utf-8') as stream:
+        for line in stream:
+            yield json.loads(line)
+
+def forward(tool, argv):
+    """
+    Run `tool argv` in the daemon, streaming its output to stdout. Returns the
+    exit code, or None when there is no daemon (or it is stale, or runs with
+    different settings) and the caller should run the command itself.
+    """
+    if os.environ.get('STUDYHUB_NO_DAEMON'):
+        return None
+    sock = _connect()
+    if sock is None:
+        return None
+    try:
+        request = {'tool': tool, 'argv': list(argv), 'cwd': os.getcwd(), 'env': tool_env()}
+        for message in _request(sock, request):
+            if 'out' in message:
+                sys.stdout.write(message['out'])
+                sys.stdout.flush()
+            elif 'exit' in message:
+                return message['exit']
+            elif message.get('stale') or 'env' in message:
+                return None
+    except (OSError, ValueError):
+        pass
+    finally:
+        sock.close()
+    return None
+
+def control(command):
+    """Send status/stop to the daemon; returns its reply or None if it is not running"""
+    sock = _connect()
+    if sock is None:
+        return None
+    try:
+        return next(_request(sock, {'command': command}), None)
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class _StreamWriter:
+    """File-like stdout/stderr that forwards writes to the client as {"out": text}"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.broken = False
+
+    def write(self, text):
+        if text and not self.broken:
+            try:
+                self.sock.sendall((json.dumps({'out': text}) + '\n').encode('utf-8'))
+            except OSError:
+                self.broken = True  # client went away; let the command finish
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class DataDaemon:
+    def __init__(self, socket_path=SOCKET_PATH):
+        self.socket_path = Path(socket_path)
+        self.started = time.time()
+        self.requests = 0
+        self.sources = {}  # repo source file -> mtime_ns when it was first loaded
+        self.scanned = set()  # modules already checked for being repo code
+        self.env = tool_env()
+        self.running = True
+
+    # -- tools --------------------------------------------------------------
+
+    def load_tools(self):
+        import importlib
+
+        for path in (str(BASE_DIR), str(SCRIPTS_DIR)):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+        for module_name in TOOLS.values():
+            importlib.import_module(module_name)
+        self.track_sources()
+
+    def track_sources(self):
+        """Start watching repo modules loaded since the last call (e.g. helpers imported lazily)"""
+        root = str(BASE_DIR.resolve()) + os.sep
+        for name, module in list(sys.modules.items()):
+            if name in self.scanned:
+                continue
+            self.scanned.add(name)
+            path = getattr(module, '__file__', None)
+            if path and os.path.realpath(path).startswith(root):
+                try:
+                    self.sources.setdefault(path, os.stat(path).st_mtime_ns)
+                except OSError:
+                    pass
+
+    def is_stale(self):
+        for path, mtime in self.sources.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def warm(self):
+        """Parse the data workbooks up front so the first command is already fast"""
+        import parse_cache
+
+        workbooks = sorted((BASE_DIR / 'public' / 'data').rglob('*.xlsx'))
+        started = time.perf_counter()
+        for path in workbooks:
+            try:
+                parse_cache.load_sheets(path)
+            except Exception as e:
+                print(f"  [WARN] Could not load {path.name}: {e}")
+        print(f"  [+] Warmed {len(workbooks)} workbooks in {time.perf_counter() - started:.2f}s")
+
+    def run_tool(self, tool, argv, cwd, writer):
+        import contextlib
+        import traceback
+
+        module = sys.modules[TOOLS[tool]]
+        saved_argv, saved_cwd = sys.argv, os.getcwd()
+        sys.argv = [module.__file__] + list(argv)
+        exit_code = 0
+        try:
+            os.chdir(cwd)
+            with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                try:
+                    module.main()
+                except SystemExit as e:
+                    if isinstance(e.code, int) or e.code is None:
+                        exit_code = e.code or 0
+                    else:
+                        print(e.code)
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+        finally:
+            sys.argv = saved_argv
+            os.chdir(saved_cwd)
+        return exit_code
+
+    # -- socket -------------------------------------------------------------
+
+    def handle(self, conn):
+        with conn, conn.makefile('r', encoding='utf-8') as stream:
+            line = stream.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            reply = lambda message: conn.sendall((json.dumps(message) + '\n').encode('utf-8'))  # noqa: E731
+
+            command = request.get('command')
+            if command == 'status':
+                import parse_cache
+                reply({'pid': os.getpid(), 'uptime': round(time.time() - self.started, 1),
+                       'requests': self.requests, 'workbooks': len(parse_cache._loaded)})
+                return
+            if command == 'stop':
+                reply({'stopped': True})
+                self.running = False
+                return
+
+            tool = request.get('tool')
+            if tool not in TOOLS:
+                reply({'out': f"[ERROR] Unknown tool: {tool}\n"})
+                reply({'exit': 2})
+                return
+            client_env = request.get('env', {})
+            if client_env != self.env:
+                # Settings are read at import time; the client runs this one itself
+                differing = sorted(k for k in set(client_env) | set(self.env) if client_env.get(k) != self.env.get(k))
+                reply({'env': differing})
+                print(f"  [*] {tool}: environment differs ({', '.join(differing)}), run locally", flush=True)
+                return
+            if self.is_stale():
+                # Tool code changed since start-up: let the client run it fresh, and exit
+                reply({'stale': True})
+                self.running = False
+                return
+
+            self.requests += 1
+            started = time.perf_counter()
+            exit_code = self.run_tool(tool, request.get('argv', []), request.get('cwd', str(BASE_DIR)),
+                                      _StreamWriter(conn))
+            try:
+                reply({'exit': exit_code})
+            except OSError:
+                pass
+            print(f"  [*] {tool} {' '.join(request.get('argv', []))} -> {exit_code} "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)", flush=True)
+            self.track_sources()
+
+    def serve(self, warm=True):
+        if control('status') is not None:
+            print(f"[ERROR] A daemon is already running on {self.socket_path}")
+            return 1
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # left over from a daemon that did not shut down cleanly
+
+        print(f"[*] Starting data daemon (pid {os.getpid()})...", flush=True)
+        self.load_tools()
+        if warm:
+            self.warm()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # socket only reachable by this user
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        server.settimeout(1.0)
+        print(f"  [+] Listening on {self.socket_path}", flush=True)
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                try:
+                    self.handle(conn)
+                except (OSError, ValueError) as e:
+                    print(f"  [WARN] Request failed: {e}", flush=True)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            print("[*] Data daemon stopped", flush=True)
+        return 0
+
+def start_detached(warm=True):
+    import subprocess
+
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    command = [sys.executable, str(Path(__file__).resolve()), 'start'] + ([] if warm else ['--no-warm'])
+    with open(LOG_PATH, 'a', encoding='utf-8') as log:
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                   start_new_session=True, cwd=str(BASE_DIR))
+    for _ in range(600):  # wait for the socket (warming can take a while on big workbooks)
+        if control('status') is not None:
+            print(f"[+] Data daemon running (pid {process.pid}), log: {LOG_PATH}")
+            return 0
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    print(f"[ERROR] Data daemon did not start, see {LOG_PATH}")
+    return 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident daemon that keeps the data tools and workbooks hot')
+    sub = parser.add_subparsers(dest='command', required=True)
+    start_parser = sub.add_parser('start', help='Run the daemon (in the foreground unless --detach)')
+    start_parser.add_argument('--detach', action='store_true', help='Run in the background, logging to .cache/')
+    start_parser.add_argument('--no-warm', action='store_true', help='Do not pre-parse public/data workbooks')
+    sub.add_parser('status', help='Show whether the daemon is running')
+    sub.add_parser('stop', help='Stop a running daemon')
+    args = parser.parse_args()
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("[ERROR] Unix sockets are not available on this platform")
+        return 1
+
+    if args.command == 'start':
+        if args.detach:
+            return start_detached(warm=not args.no_warm)
+        return DataDaemon().serve(warm=not args.no_warm)
+
+    reply = control('status' if args.command == 'status' else 'stop')
+    if reply is None:
+        print("[*] Data daemon is not running")
+        return 1 if args.command == 'status' else 0
+    if args.command == 'status':
+        print(f"[*] Data daemon running: pid {reply['pid']}, up {reply['uptime']}s, "
+              f"{reply['requests']} commands, {reply['workbooks']} workbooks in memory")
+    else:
+        print("[+] Data daemon stopped")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
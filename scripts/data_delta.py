@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Row-Level Delta Feeds for Harshi-App
+Compares two versions of the content by primary key and per-row hash (one
+pass over each side) and emits per-topic patches, so a client that already
+has version N downloads a few kilobytes instead of every topic file.
+
+- Inputs: a build (a public/ directory with questionnaire/, studyguide/ and
+  Handout/ CSV trees), a workbook (.xlsx, topics by topic_id), or a stored
+  snapshot (.json.gz)
+- Patch:  {topic: {file: file_patch}}, where file_patch is one of
+    {"delete": [key], "update": [[key, row]], "insert": [[key, row]], "order": [key]}
+        applied as: drop deletes, replace updates in place, append inserts,
+        then reorder by "order" when present
+    {"columns": [...], "key": column, "rows": [row]}   (new file or changed columns)
+    {"removed": true}
+  Rows are value lists in the file's column order.
+
+`publish` keeps a version chain in public/data/deltas: versions.json lists
+{from, to, file} patches up to the current version, and snapshot.json.gz
+holds the last published rows for the next diff. Past --depth patches, the
+oldest are squashed into one; a client whose version is not the start of
+any patch reloads everything.
+
+Usage:
+    python scripts/data_delta.py diff OLD NEW [-o patch.json]
+    python scripts/data_delta.py publish [public_dir] [--depth N]
+    python setup_data.py diff OLD NEW [-o patch.json]
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import parse_cache
+from content_db import PRIMARY_KEYS
+from convert_to_csv import DATA_DIR, clean_column, sheet_records
+
+BASE_DIR = Path(__file__).parent.parent
+
+CSV_TREES = ['questionnaire', 'studyguide', 'Handout']
+DELTA_DIR = DATA_DIR / 'deltas'
+SQUASH_DEPTH = 10
+SHARED_TOPIC = '_shared'
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def _key_column(columns):
+    """First id-like column ('id' or '*_id'), else the first column"""
+    for column in columns:
+        if column == 'id' or column.endswith('_id'):
+            return column
+    return columns[0] if columns else None
+
+def keyed_rows(columns, rows, key_column):
+    """{key: row} in row order; repeated keys get '#n' suffixes, blank keys their row index"""
+    index = columns.index(key_column) if key_column in columns else None
+    keyed = {}
+    for i, row in enumerate(rows):
+        key = row[index] if index is not None and index < len(row) else ''
+        key = key or f'#{i}'
+        if key in keyed:
+            n = 2
+            while f'{key}#{n}' in keyed:
+                n += 1
+            key = f'{key}#{n}'
+        keyed[key] = list(row)
+    return keyed
+
+def _file_entry(columns, rows, key_column=None):
+    key_column = key_column if key_column in columns else _key_column(columns)
+    return {'columns': columns, 'key': key_column, 'rows': keyed_rows(columns, rows, key_column)}
+
+def load_build(public_dir):
+    """{topic: {file: entry}} for the CSV trees of a build; topic = tree/Subject/folder"""
+    public_dir = Path(public_dir)
+    snapshot = {}
+    for tree in CSV_TREES:
+        for path in sorted((public_dir / tree).rglob('*.csv')):
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                columns = next(reader, [])
+                rows = [row for row in reader if any(row)]
+            topic = path.parent.relative_to(public_dir).as_posix()
+            snapshot.setdefault(topic, {})[path.name] = _file_entry(columns, rows)
+    return snapshot
+
+def load_workbook(path):
+    """{topic_id: {sheet: entry}} for a workbook; rows without a topic go to SHARED_TOPIC"""
+    sheets = parse_cache.load_sheets(path)
+    section_topics = {}
+    if 'Topic_Sections' in sheets:
+        section_topics = {row.get('section_id', ''): row.get('topic_id', '')
+                          for row in sheet_records(*sheets['Topic_Sections'])}
+
+    snapshot = {}
+    for sheet_name, (header, rows) in sheets.items():
+        columns = [c for c in clean_column(header) if c]
+        by_topic = {}
+        for record in sheet_records(header, rows):
+            topic = record.get('topic_id') or section_topics.get(record.get('section_id', '')) or SHARED_TOPIC
+            by_topic.setdefault(topic, []).append([record.get(c, '') for c in columns])
+        for topic, topic_rows in by_topic.items():
+            snapshot.setdefault(topic, {})[sheet_name] = _file_entry(columns, topic_rows,
+                                                                     PRIMARY_KEYS.get(sheet_name))
+    return snapshot
+
+def save_snapshot(snapshot, path):
+    data = {topic: {name: {'columns': e['columns'], 'key': e['key'], 'rows': list(e['rows'].values())}
+                    for name, e in files.items()}
+            for topic, files in snapshot.items()}
+    tmp_path = path.with_name(path.name + '.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_stored_snapshot(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    return {topic: {name: _file_entry(e['columns'], e['rows'], e['key']) for name, e in files.items()}
+            for topic, files in data.items()}
+
+def load_snapshot(path):
+    path = Path(path)
+    if path.is_dir():
+        return load_build(path)
+    if path.suffix == '.xlsx':
+        return load_workbook(path)
+    if path.name.endswith('.json.gz'):
+        return load_stored_snapshot(path)
+    raise ValueError(f"Can't diff {path}: expected a build directory, .xlsx workbook or .json.gz snapshot")
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def row_hash(row):
+    return hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=8).digest()
+
+def _replace(entry):
+    return {'columns': entry['columns'], 'key': entry['key'], 'rows': list(entry['rows'].values())}
+
+def diff_file(old, new):
+    """file_patch turning entry old into entry new, or None if they are equal"""
+    if old is None:
+        return _replace(new)
+    if new is None:
+        return {'removed': True}
+    if old['columns'] != new['columns'] or old['key'] != new['key']:
+        return _replace(new)
+
+    old_rows, new_rows = old['rows'], new['rows']
+    old_hashes = {key: row_hash(row) for key, row in old_rows.items()}
+    delete = [key for key in old_rows if key not in new_rows]
+    update, insert = [], []
+    for key, row in new_rows.items():
+        previous = old_hashes.get(key)
+        if previous is None:
+            insert.append([key, row])
+        elif previous != row_hash(row):
+            update.append([key, row])
+
+    deleted = set(delete)
+    order = list(new_rows)
+    reordered = [key for key in old_rows if key not in deleted] + [key for key, _ in insert] != order
+    if not (delete or update or insert or reordered):
+        return None
+
+    patch = {name: ops for name, ops in (('delete', delete), ('update', update), ('insert', insert)) if ops}
+    if reordered:
+        patch['order'] = order
+    replace = _replace(new)
+    return replace if _size(replace) <= _size(patch) else patch
+
+def _size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+
+def diff_snapshots(old, new):
+    """{topic: {file: file_patch}} for every file that changed"""
+    patch = {}
+    for topic in list(old) + [t for t in new if t not in old]:
+        old_files, new_files = old.get(topic, {}), new.get(topic, {})
+        for name in list(old_files) + [n for n in new_files if n not in old_files]:
+            file_patch = diff_file(old_files.get(name), new_files.get(name))
+            if file_patch is not None:
+                patch.setdefault(topic, {})[name] = file_patch
+    return patch
+
+
+# ============================================================================
+# APPLY + SQUASH
+# ============================================================================
+
+def apply_file(entry, patch):
+    if patch.get('removed'):
+        return None
+    if 'rows' in patch:
+        return _file_entry(patch['columns'], patch['rows'], patch['key'])
+    rows = dict(entry['rows'])
+    for key in patch.get('delete', []):
+        del rows[key]
+    for key, row in patch.get('update', []) + patch.get('insert', []):
+        rows[key] = row
+    if 'order' in patch:
+        rows = {key: rows[key] for key in patch['order']}
+    return dict(entry, rows=rows)
+
+def apply_patch(snapshot, patch):
+    """Reference implementation of what a client does with a patch"""
+    result = {topic: dict(files) for topic, files in snapshot.items()}
+    for topic, files in patch.items():
+        topic_files = result.setdefault(topic, {})
+        for name, file_patch in files.items():
+            entry = apply_file(topic_files.get(name), file_patch)
+            if entry is None:
+                topic_files.pop(name, None)
+            else:
+                topic_files[name] = entry
+        if not topic_files:
+            del result[topic]
+    return result
+
+def canonical(snapshot):
+    """Comparable form of a snapshot (row order included)"""
+    return {topic: {name: (e['columns'], e['key'], list(e['rows'].items())) for name, e in files.items()}
+            for topic, files in snapshot.items()}
+
+def compose_file(first, second):
+    """One file_patch with the effect of `first` then `second`"""
+    if 'removed' in second or 'rows' in second:
+        return second
+    if 'rows' in first:
+        return _replace(apply_file(apply_file(None, first), second))
+    if 'removed' in first:
+        raise ValueError("Patch changes a file removed by the previous patch")
+
+    deletes = list(first.get('delete', []))
+    deleted = set(deletes)
+    updates = dict(first.get('update', []))
+    inserts = dict(first.get('insert', []))
+    for key in second.get('delete', []):
+        if key in inserts:
+            del inserts[key]
+        else:
+            updates.pop(key, None)
+            if key not in deleted:
+                deletes.append(key)
+                deleted.add(key)
+    for key, row in second.get('update', []):
+        if key in inserts:
+            inserts[key] = row
+        else:
+            updates[key] = row
+    for key, row in second.get('insert', []):
+        inserts[key] = row  # after a delete of the same key: removed, then appended
+
+    patch = {name: ops for name, ops in (('delete', deletes), ('update', [[k, r] for k, r in updates.items()]),
+                                         ('insert', [[k, r] for k, r in inserts.items()])) if ops}
+    if 'order' in second:
+        patch['order'] = second['order']
+    elif 'order' in first:
+        removed = set(second.get('delete', []))
+        patch['order'] = [key for key in first['order'] if key not in removed] + [k for k, _ in second.get('insert', [])]
+    return patch
+
+def compose(first, second):
+    patch = {topic: dict(files) for topic, files in first.items()}
+    for topic, files in second.items():
+        topic_patch = patch.setdefault(topic, {})
+        for name, file_patch in files.items():
+            topic_patch[name] = compose_file(topic_patch[name], file_patch) if name in topic_patch else file_patch
+    return patch
+
+
+# ============================================================================
+# VERSION CHAIN
+# ============================================================================
+
+def _write_json(path, data):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _patch_entry(delta_dir, start, end, patch):
+    name = f'patch-{start}-{end}.json'
+    _write_json(delta_dir / name, patch)
+    return {'from': start, 'to': end, 'file': name, 'bytes': (delta_dir / name).stat().st_size}
+
+def squash_chain(delta_dir, chain, depth):
+    """Merge the oldest patches until at most `depth` remain"""
+    while len(chain) > max(1, depth):
+        first, second = chain[0], chain[1]
+        patch = compose(_read_json(delta_dir / first['file']), _read_json(delta_dir / second['file']))
+        chain[:2] = [_patch_entry(delta_dir, first['from'], second['to'], patch)]
+        for entry in (first, second):
+            (delta_dir / entry['file']).unlink(missing_ok=True)
+        print(f"  [+] Squashed versions {first['from']}-{second['to']}")
+    return chain
+
+def publish(public_dir=BASE_DIR / 'public', delta_dir=DELTA_DIR, depth=SQUASH_DEPTH):
+    """Diff the build against the last published snapshot and extend the version chain"""
+    delta_dir = Path(delta_dir)
+    delta_dir.mkdir(parents=True, exist_ok=True)
+    versions_path, snapshot_path = delta_dir / 'versions.json', delta_dir / 'snapshot.json.gz'
+
+    print(f"[*] Publishing delta feed for {public_dir}...")
+    new = load_build(public_dir)
+    if not versions_path.exists() or not snapshot_path.exists():
+        versions = {'current': 1, 'chain': []}
+        print("  [+] Started version chain at version 1")
+    else:
+        versions = _read_json(versions_path)
+        old = load_stored_snapshot(snapshot_path)
+        patch = diff_snapshots(old, new)
+        if not patch:
+            print(f"  No changes since version {versions['current']}")
+            return versions
+        if canonical(apply_patch(old, patch)) != canonical(new):
+            raise RuntimeError("Patch does not reproduce the build")
+        start, end = versions['current'], versions['current'] + 1
+        entry = _patch_entry(delta_dir, start, end, patch)
+        versions = {'current': end, 'chain': squash_chain(delta_dir, versions['chain'] + [entry], depth)}
+        print(f"  [+] Version {end}: {sum(len(files) for files in patch.values())} files in "
+              f"{len(patch)} topics changed ({entry['bytes']} bytes)")
+
+    save_snapshot(new, snapshot_path)
+    _write_json(versions_path, versions)
+    print(f"  [+] Created: {versions_path}")
+    return versions
+
+def print_summary(patch):
+    for topic, files in patch.items():
+        for name, file_patch in files.items():
+            if file_patch.get('removed'):
+                summary = 'removed'
+            elif 'rows' in file_patch:
+                summary = f"replaced ({len(file_patch['rows'])} rows)"
+            else:
+                summary = ', '.join(f"{len(file_patch[op])} {op}" for op in ('insert', 'update', 'delete') if op in file_patch)
+                summary += ', reordered' if 'order' in file_patch else ''
+            print(f"  {topic}/{name}: {summary}")
+
+def diff(old_path, new_path, output=None):
+    print(f"[*] Diffing {old_path} -> {new_path}...")
+    patch = diff_snapshots(load_snapshot(old_path), load_snapshot(new_path))
+    print_summary(patch)
+    print(f"  {len(patch)} topics changed, {_size(patch)} bytes")
+    if output:
+        _write_json(Path(output), patch)
+        print(f"  [+] Created: {output}")
+    return patch
+
+def main():
+    parser = argparse.ArgumentParser(description='Row-level delta patches between content versions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    diff_parser = subparsers.add_parser('diff', help='Patch between two builds, workbooks or snapshots')
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.add_argument('-o', '--output', help='Write the patch JSON here')
+    publish_parser = subparsers.add_parser('publish', help='Append the build to the version chain')
+    publish_parser.add_argument('public_dir', nargs='?', default=str(BASE_DIR / 'public'))
+    publish_parser.add_argument('--delta-dir', default=str(DELTA_DIR))
+    publish_parser.add_argument('--depth', type=int, default=SQUASH_DEPTH, help='Patches kept before squashing')
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        diff(args.old, args.new, args.output)
+    else:
+        publish(args.public_dir, args.delta_dir, args.depth)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Batch Content Generator for Harshi-App
+Generates study sections and quiz questions for a list of topics with the
+Gemini API and writes the update file consumed by update_excel.py
+(content_update_v3.json):
+
+    [{"topicId": "phys-t1",
+      "sections":  [{"id", "title", "icon", "type", "order"}],
+      "content":   [{"sectionId", "type", "title", "text", "videoUrl", "imageUrl", "description"}],
+      "questions": [{"question", "options": [4], "correctAnswer", "explanation", "difficulty", "hint"}]}]
+
+Each topic needs two prompts (lesson and quiz). Prompts depend only on the
+subject and topic name, so identical prompts are sent once and shared by
+every topic that needs them. Requests run with bounded asyncio concurrency
+and are retried with exponential backoff on 408/429/5xx, connection errors,
+timeouts and unusable model output. Valid responses are cached on disk by
+prompt hash (.cache/generation/<sha256>.json, env
+STUDYHUB_GENERATION_CACHE_DIR), so a rerun issues no requests at all.
+
+Usage:
+    python scripts/generate_content.py [--topics phys-t1 chem-t2 | --subject physics] [-o content_update_v3.json]
+    python scripts/generate_content.py serve-stub --port 8766 [--fail-rate 0.2] [--delay 0.05]
+    python scripts/generate_content.py --base-url http://127.0.0.1:8766 --api-key test
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import ssl
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from convert_to_csv import DATA_DIR, read_excel_sheet
+
+BASE_DIR = Path(__file__).parent.parent
+
+OUTPUT_PATH = BASE_DIR / 'content_update_v3.json'
+CACHE_DIR = Path(os.environ.get('STUDYHUB_GENERATION_CACHE_DIR', BASE_DIR / '.cache' / 'generation'))
+
+DEFAULT_BASE_URL = 'https://generativelanguage.googleapis.com'
+DEFAULT_MODEL = 'gemini-1.5-flash'
+GENERATE_PATH = '/v1beta/models/{model}:generateContent?key={key}'
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0          # seconds; doubled per attempt, with jitter
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = 60.0
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+SECTION_TYPES = ['objectives', 'intro', 'content', 'applications']
+CONTENT_TYPES = ['text', 'introduction', 'concept_helper', 'real_world', 'warning', 'formula']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+LESSON_PROMPT = """Context: Grade 8 {subject} lesson.
+Topic: "{topic}"
+
+Task: Write the study sections for this topic.
+Return only JSON of the form
+{{"sections": [{{"title": "...", "icon": "<lucide icon name>", "type": "<{section_types}>",
+  "content": [{{"type": "<{content_types}>", "title": "...", "text": "..."}}]}}]}}
+Use one section per type, in the order listed. Tone: Encouraging, simple."""
+
+QUIZ_PROMPT = """Context: Grade 8 {subject} quiz.
+Topic: "{topic}"
+
+Task: Write {count} multiple-choice questions for this topic.
+Return only JSON of the form
+{{"questions": [{{"question": "...", "options": ["...", "...", "...", "..."], "correctAnswer": "<A|B|C|D>",
+  "explanation": "...", "difficulty": "<easy|medium|hard>", "hint": "..."}}]}}
+Mix the difficulties. Max Length: 2 sentences per explanation."""
+
+class GenerationError(Exception):
+    """A request that failed; `retryable` says whether another attempt may succeed"""
+
+    def __init__(self, message, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+async def _read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if not size:
+                await reader.readline()
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+async def post_json(url, payload):
+    """POST a JSON body; returns (status, lowercased headers, body bytes)"""
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if secure else None)
+    try:
+        data = json.dumps(payload).encode('utf-8')
+        target = parts.path + (f'?{parts.query}' if parts.query else '')
+        head = (f'POST {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n')
+        writer.write(head.encode('latin-1') + data)
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode('latin-1').split()
+        if len(status_line) < 2:
+            raise ConnectionError('empty response')
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+        return int(status_line[1]), headers, await _read_body(reader, headers)
+    finally:
+        writer.close()
+
+
+# ============================================================================
+# PROMPTS AND RESPONSES
+# ============================================================================
+
+def lesson_prompt(subject, topic):
+    return LESSON_PROMPT.format(subject=subject, topic=topic, section_types='|'.join(SECTION_TYPES),
+                                content_types='|'.join(CONTENT_TYPES))
+
+def quiz_prompt(subject, topic, count):
+    return QUIZ_PROMPT.format(subject=subject, topic=topic, count=count)
+
+def prompt_key(model, prompt):
+    return hashlib.sha256(f'{model}\n{prompt}'.encode('utf-8')).hexdigest()
+
+def response_text(body):
+    """Text of the first candidate in a generateContent response"""
+    try:
+        return json.loads(body)['candidates'][0]['content']['parts'][0]['text']
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise GenerationError('malformed generateContent response')
+
+def parse_model_json(text):
+    """Model text -> JSON object, tolerating a ```json fence"""
+    text = re.sub(r'^\s*```(?:json)?\s*|\s*```\s*$', '', text)
+    try:
+        value = json.loads(text)
+    except ValueError:
+        raise GenerationError('model output is not JSON')
+    if not isinstance(value, dict):
+        raise GenerationError('model output is not a JSON object')
+    return value
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+def validate_lesson(value):
+    sections = []
+    for section in value.get('sections') or []:
+        if not isinstance(section, dict) or not _text(section.get('title')):
+            continue
+        content = [{'type': _text(item.get('type')) if item.get('type') in CONTENT_TYPES else 'text',
+                    'title': _text(item.get('title')) or 'Info',
+                    'text': _text(item.get('text'))}
+                   for item in section.get('content') or [] if isinstance(item, dict) and _text(item.get('text'))]
+        sections.append({'title': _text(section['title']),
+                         'icon': _text(section.get('icon')) or 'BookOpen',
+                         'type': section.get('type') if section.get('type') in SECTION_TYPES else 'content',
+                         'content': content})
+    if not sections:
+        raise GenerationError('lesson has no usable sections')
+    return {'sections': sections}
+
+def validate_quiz(value):
+    questions = []
+    for question in value.get('questions') or []:
+        if not isinstance(question, dict):
+            continue
+        options = question.get('options')
+        answer = _text(question.get('correctAnswer')).upper()[:1]
+        if not _text(question.get('question')) or not isinstance(options, list) or len(options) != 4 \
+                or not answer or answer not in 'ABCD':
+            continue
+        difficulty = _text(question.get('difficulty')).lower()
+        questions.append({'question': _text(question['question']),
+                          'options': [_text(option) for option in options],
+                          'correctAnswer': answer,
+                          'explanation': _text(question.get('explanation')),
+                          'difficulty': difficulty if difficulty in DIFFICULTIES else 'medium',
+                          'hint': _text(question.get('hint'))})
+    if not questions:
+        raise GenerationError('quiz has no usable questions')
+    return {'questions': questions}
+
+
+# ============================================================================
+# GENERATOR
+# ============================================================================
+
+class Generator:
+    """
+    Sends prompts with at most `concurrency` requests in flight. Concurrent
+    calls for the same prompt share one task; finished prompts are read from
+    the on-disk cache.
+    """
+
+    def __init__(self, base_url, model, api_key, concurrency=4, cache_dir=CACHE_DIR, max_attempts=MAX_ATTEMPTS):
+        self.url = base_url.rstrip('/') + GENERATE_PATH.format(model=quote(model), key=quote(api_key or ''))
+        self.model = model
+        self.cache_dir = Path(cache_dir)
+        self.max_attempts = max_attempts
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tasks = {}
+        self.stats = {'prompts': 0, 'coalesced': 0, 'cache_hits': 0, 'requests': 0, 'retries': 0, 'failed': 0}
+
+    async def generate(self, prompt, validate):
+        key = prompt_key(self.model, prompt)
+        if key in self.tasks:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['prompts'] += 1
+            self.tasks[key] = asyncio.ensure_future(self._resolve(key, prompt, validate))
+        return await asyncio.shield(self.tasks[key])
+
+    def _read_cache(self, key, validate):
+        path = self.cache_dir / f'{key}.json'
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return validate(parse_model_json(json.load(f)['text']))
+        except (OSError, ValueError, KeyError, GenerationError):
+            return None
+
+    def _write_cache(self, key, prompt, text):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f'{key}.json'
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'model': self.model, 'prompt': prompt, 'text': text}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def _request(self, prompt):
+        payload = {'contents': [{'parts': [{'text': prompt}]}],
+                   'generationConfig': {'responseMimeType': 'application/json'}}
+        async with self.semaphore:
+            self.stats['requests'] += 1
+            try:
+                status, headers, body = await asyncio.wait_for(post_json(self.url, payload), REQUEST_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                raise GenerationError(f'{type(e).__name__}: {e}')
+        if status != 200:
+            retry_after = headers.get('retry-after', '')
+            raise GenerationError(f'HTTP {status}', retryable=status in RETRYABLE_STATUS,
+                                  retry_after=float(retry_after) if retry_after.isdigit() else None)
+        return response_text(body)
+
+    async def _resolve(self, key, prompt, validate):
+        cached = self._read_cache(key, validate)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        for attempt in range(self.max_attempts):
+            try:
+                text = await self._request(prompt)
+                value = validate(parse_model_json(text))
+            except GenerationError as e:
+                if not e.retryable or attempt == self.max_attempts - 1:
+                    self.stats['failed'] += 1
+                    raise
+                self.stats['retries'] += 1
+                delay = e.retry_after or min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+                await asyncio.sleep(delay)
+                continue
+            self._write_cache(key, prompt, text)
+            return value
+
+
+# ============================================================================
+# UPDATE FILE
+# ============================================================================
+
+def topic_update(topic_id, lesson, quiz):
+    """One content_update_v3.json entry from validated lesson and quiz values"""
+    sections, content = [], []
+    for order, section in enumerate(lesson['sections'], 1):
+        section_id = f'{topic_id}-s{order:03d}'
+        sections.append({'id': section_id, 'title': section['title'], 'icon': section['icon'],
+                         'type': section['type'], 'order': order})
+        for item in section['content']:
+            content.append({'sectionId': section_id, 'type': item['type'], 'title': item['title'],
+                            'text': item['text'], 'videoUrl': '', 'imageUrl': '', 'description': ''})
+    return {'topicId': topic_id, 'sections': sections, 'content': content, 'questions': quiz['questions']}
+
+async def generate_updates(topics, generator, questions_per_topic):
+    """topics: [{topic_id, subject, topic_name}] -> (updates in input order, errors)"""
+    async def one(topic):
+        subject, name = topic['subject'], topic['topic_name']
+        # Wait for both prompts even when one fails, so no request outlives the run
+        lesson, quiz = await asyncio.gather(
+            generator.generate(lesson_prompt(subject, name), validate_lesson),
+            generator.generate(quiz_prompt(subject, name, questions_per_topic), validate_quiz),
+            return_exceptions=True)
+        for result in (lesson, quiz):
+            if isinstance(result, Exception):
+                raise result
+        return topic_update(topic['topic_id'], lesson, quiz)
+
+    results = await asyncio.gather(*(one(topic) for topic in topics), return_exceptions=True)
+    updates, errors = [], []
+    for topic, result in zip(topics, results):
+        if isinstance(result, Exception):
+            errors.append(f"{topic['topic_id']}: {result}")
+        else:
+            updates.append(result)
+    return updates, errors
+
+def load_topics(topic_ids=None, subject_key=None, master_path=DATA_DIR / 'StudyHub_Master.xlsx'):
+    """Topics from the master workbook, with the subject display name"""
+    subjects = {row.get('subject_key'): row.get('name') or row.get('subject_key')
+                for row in read_excel_sheet(master_path, 'Subjects')}
+    topics = []
+    for row in read_excel_sheet(master_path, 'Topics'):
+        if topic_ids and row.get('topic_id') not in topic_ids:
+            continue
+        if subject_key and row.get('subject_key') != subject_key:
+            continue
+        topics.append({'topic_id': row['topic_id'],
+                       'subject': subjects.get(row.get('subject_key'), row.get('subject_key', '')),
+                       'topic_name': row.get('topic_name') or row['topic_id']})
+    return topics
+
+def write_updates(updates, output_path):
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(updates, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, output_path)
+
+async def run(topics, base_url, model, api_key, concurrency, questions_per_topic, output_path):
+    generator = Generator(base_url, model, api_key, concurrency)
+    start = time.perf_counter()
+    updates, errors = await generate_updates(topics, generator, questions_per_topic)
+    stats = generator.stats
+    print(f"  {len(topics)} topics, {stats['prompts']} unique prompts ({stats['coalesced']} coalesced, "
+          f"{stats['cache_hits']} cached), {stats['requests']} requests, {stats['retries']} retries "
+          f"in {time.perf_counter() - start:.2f}s")
+    for error in errors:
+        print(f"  [ERROR] {error}")
+    if updates:
+        write_updates(updates, output_path)
+        print(f"  [+] Created: {output_path} ({len(updates)} topics)")
+    return errors
+
+
+# ============================================================================
+# STUB MODEL SERVER
+# ============================================================================
+
+def stub_response(prompt):
+    """Deterministic generateContent body answering a lesson or quiz prompt"""
+    topic = (re.search(r'Topic: "(.*)"', prompt) or [None, 'Topic'])[1]
+    if 'multiple-choice' in prompt:
+        count = int((re.search(r'Write (\d+) multiple-choice', prompt) or [None, 5])[1])
+        value = {'questions': [{'question': f'{topic}: question {n}?', 'options': ['One', 'Two', 'Three', 'Four'],
+                                'correctAnswer': 'ABCD'[n % 4], 'explanation': f'Explanation {n}.',
+                                'difficulty': DIFFICULTIES[n % 3], 'hint': f'Hint {n}.'}
+                               for n in range(1, count + 1)]}
+    else:
+        value = {'sections': [{'title': f'{topic} {section_type}', 'icon': 'BookOpen', 'type': section_type,
+                               'content': [{'type': 'text', 'title': 'Info', 'text': f'{topic}: {section_type}.'}]}
+                              for section_type in SECTION_TYPES]}
+    text = json.dumps(value)
+    return {'candidates': [{'content': {'parts': [{'text': f'```json\n{text}\n```'}], 'role': 'model'}}]}
+
+async def _stub_respond(writer, status, body):
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}[status]
+    data = json.dumps(body).encode('utf-8')
+    head = (f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n')
+    writer.write(head.encode('latin-1') + data)
+    await writer.drain()
+
+def make_stub_handler(fail_rate, delay, counts):
+    async def handle(reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            if len(request_line) < 2:
+                return
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1')
+                if line in ('\r\n', '\n', ''):
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            if request_line[0] != 'POST' or ':generateContent' not in request_line[1]:
+                await _stub_respond(writer, 404, {'error': {'message': 'not found'}})
+                return
+            counts['requests'] += 1
+            try:
+                payload = json.loads(await reader.readexactly(int(headers.get('content-length', 0) or 0)))
+                prompt = payload['contents'][0]['parts'][0]['text']
+            except (ValueError, KeyError, IndexError, TypeError, asyncio.IncompleteReadError):
+                await _stub_respond(writer, 400, {'error': {'message': 'invalid request'}})
+                return
+            await asyncio.sleep(delay)
+            if random.random() < fail_rate:
+                counts['failed'] += 1
+                await _stub_respond(writer, 503, {'error': {'message': 'overloaded'}})
+                return
+            await _stub_respond(writer, 200, stub_response(prompt))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+async def serve_stub(host, port, fail_rate, delay):
+    counts = {'requests': 0, 'failed': 0}
+    server = await asyncio.start_server(make_stub_handler(fail_rate, delay, counts), host, port)
+    bound_port = server.sockets[0].getsockname()[1]
+    print(f"[*] Stub model server on http://{host}:{bound_port} (fail rate {fail_rate}, delay {delay}s)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print(f"[*] Served {counts['requests']} requests ({counts['failed']} failed)")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve-stub':
+        parser = argparse.ArgumentParser(description='Serve a stub Gemini generateContent endpoint')
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8766)
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+        parser.add_argument('--delay', type=float, default=0.0, help='Seconds before each response')
+        args = parser.parse_args(sys.argv[2:])
+        try:
+            asyncio.run(serve_stub(args.host, args.port, args.fail_rate, args.delay))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    parser = argparse.ArgumentParser(description='Generate topic content into content_update_v3.json')
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--topics', nargs='+', help='Topic IDs from the master Topics sheet')
+    selection.add_argument('--subject', help='All topics of one subject_key')
+    parser.add_argument('--master', default=str(DATA_DIR / 'StudyHub_Master.xlsx'), help='Master workbook')
+    parser.add_argument('--api-key', default=os.environ.get('GEMINI_API_KEY'),
+                        help='Gemini API key (default: $GEMINI_API_KEY)')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='API host (e.g. the stub server)')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--concurrency', type=int, default=4, help='Maximum requests in flight')
+    parser.add_argument('--questions', type=int, default=5, help='Questions per topic')
+    parser.add_argument('-o', '--output', default=str(OUTPUT_PATH), help='Update JSON path')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("Error: Please provide --api-key or set GEMINI_API_KEY")
+        sys.exit(1)
+
+    topics = load_topics(set(args.topics or []), args.subject, Path(args.master))
+    if not topics:
+        print("Error: No matching topics")
+        sys.exit(1)
+
+    print(f"[*] Generating content for {len(topics)} topics...")
+    errors = asyncio.run(run(topics, args.base_url, args.model, args.api_key, args.concurrency,
+                             args.questions, args.output))
+    sys.exit(1 if errors else 0)
+
+if __name__ == '__main__':
+    main()
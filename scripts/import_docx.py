@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+DOCX Content Importer for Harshi-App
+Streams Word documents written against StudyHub_Content_Template.docx into
+Topic_Sections / Learning_Objectives / Key_Terms / Study_Content rows
+(column layout from SHEET_SCHEMAS in scripts/schema_registry.py).
+
+Usage:
+    python scripts/import_docx.py StudyHub_Content_Template.docx -o imported.xlsx
+    python scripts/import_docx.py docs/ -o imported.xlsx --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from schema_registry import SHEET_SCHEMAS
+
+BASE_DIR = Path(__file__).parent.parent
+
+DEFAULT_CACHE = BASE_DIR / '.cache' / 'docx_import.json'
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+IMPORTED_SHEETS = ['Topic_Sections', 'Learning_Objectives', 'Key_Terms', 'Study_Content']
+
+# Template labels that introduce a content block, mapped to Study_Content.content_type
+CONTENT_LABELS = {
+    'main content': 'text',
+    'formula': 'formula',
+    'formula (if applicable)': 'formula',
+    'concept helper': 'concept_helper',
+    'common misunderstanding': 'warning',
+    'common misconception': 'warning',
+    'real-world application': 'real_world',
+    'real world application': 'real_world',
+}
+
+SECTION_ICONS = {'objectives': 'Target', 'intro': 'BookOpen', 'content': 'FileText',
+                 'applications': 'Globe', 'quiz': 'HelpCircle'}
+
+SECTION_META_RE = re.compile(r'Section ID:\s*([^|]+?)\s*(?:\|\s*Type:\s*(\w+))?\s*$', re.IGNORECASE)
+HEADING_RE = re.compile(r'^Heading(\d)$', re.IGNORECASE)
+
+
+# ============================================================================
+# STREAMING DOCX READER
+# ============================================================================
+
+def _text(element):
+    return ''.join(node.text or '' for node in element.iter(W_NS + 't')).strip()
+
+def _cell_text(tc):
+    """A table cell's paragraphs, one per line (empty paragraphs dropped)"""
+    return '\n'.join(text for text in map(_text, tc.iter(W_NS + 'p')) if text)
+
+def _paragraph_block(p):
+    style = p.find(f'{W_NS}pPr/{W_NS}pStyle')
+    style = style.get(W_NS + 'val') if style is not None else ''
+    heading = HEADING_RE.match(style or '')
+    if heading:
+        return {'kind': 'heading', 'level': int(heading.group(1)), 'text': _text(p)}
+    if p.find(f'{W_NS}pPr/{W_NS}numPr') is not None or style == 'ListParagraph':
+        return {'kind': 'list_item', 'text': _text(p)}
+    return {'kind': 'paragraph', 'text': _text(p)}
+
+def _table_block(tbl):
+    rows = []
+    for tr in tbl.iter(W_NS + 'tr'):
+        rows.append([_cell_text(tc) for tc in tr.iter(W_NS + 'tc')])
+    return {'kind': 'table', 'rows': rows}
+
+def iter_blocks(docx_path):
+    """
+    Yield body-level blocks (heading, paragraph, list_item, table) in document
+    order. word/document.xml is parsed incrementally and each block is cleared
+    once yielded, so memory stays bounded by the largest single block.
+    """
+    with zipfile.ZipFile(docx_path) as archive:
+        with archive.open('word/document.xml') as xml_file:
+            depth = 0
+            body_depth = None
+            for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if element.tag == W_NS + 'body':
+                        body_depth = depth
+                    continue
+
+                if body_depth is not None and depth == body_depth + 1:
+                    if element.tag == W_NS + 'p':
+                        block = _paragraph_block(element)
+                        if block['text']:
+                            yield block
+                    elif element.tag == W_NS + 'tbl':
+                        yield _table_block(element)
+                    element.clear()
+                depth -= 1
+
+def block_hash(block):
+    return hashlib.sha1(json.dumps(block, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# TEMPLATE INTERPRETER
+# ============================================================================
+
+def new_state():
+    return {
+        'subject': '', 'topic_id': '', 'section_id': '', 'section_type': '',
+        'mode': '', 'content_type': '', 'title': '',
+        'counts': {'section': 0, 'objective': 0, 'term': 0, 'content': 0},
+    }
+
+def _label(text):
+    """'Concept Helper:' -> 'concept helper' if the paragraph is a template label"""
+    if text.endswith(':'):
+        return text[:-1].strip().lower()
+    return None
+
+def _content_row(state, text):
+    state['counts']['content'] += 1
+    n = state['counts']['content']
+    return ('Study_Content', {
+        'content_id': f"cont-{state['topic_id']}-{n}",
+        'section_id': state['section_id'],
+        'content_type': state['content_type'] or ('introduction' if state['section_type'] == 'intro' else 'text'),
+        'content_title': state['title'],
+        'content_text': text,
+        'order_index': n,
+        'image_url': '',
+        'video_url': '',
+    })
+
+def interpret_block(block, state):
+    """Apply one block to the interpreter state and return the rows it produces"""
+    rows = []
+    kind = block['kind']
+
+    if kind == 'heading':
+        text = block['text']
+        if block['level'] == 1:
+            state['subject'] = text.split(':', 1)[1].strip() if text.lower().startswith('subject:') else ''
+            state['topic_id'] = state['mode'] = ''
+        elif block['level'] == 2:
+            state['mode'] = 'topic' if text.lower().startswith('topic:') else ''
+            state['topic_id'] = ''
+        elif state['topic_id']:
+            lowered = text.lower()
+            if lowered.startswith('learning objectives'):
+                state['mode'] = 'objectives'
+            elif lowered.startswith('key terms'):
+                state['mode'] = 'terms'
+            elif lowered.startswith('section:'):
+                state['counts']['section'] += 1
+                state['mode'] = 'section'
+                state['section_id'] = f"{state['topic_id']}-s{state['counts']['section']}"
+                state['section_type'] = 'content'
+                state['content_type'] = ''
+                state['title'] = text.split(':', 1)[1].strip()
+                rows.append(('Topic_Sections', {
+                    'section_id': state['section_id'],
+                    'topic_id': state['topic_id'],
+                    'section_title': state['title'],
+                    'section_icon': SECTION_ICONS['content'],
+                    'order_index': state['counts']['section'],
+                    'section_type': 'content',
+                }))
+            else:
+                state['mode'] = ''
+        return rows
+
+    if kind == 'table':
+        if state['mode'] == 'topic':
+            for cells in block['rows']:
+                if len(cells) >= 2 and cells[0].lower() == 'topic id':
+                    state['topic_id'] = cells[1]
+                    state['counts'] = {key: 0 for key in state['counts']}
+        elif state['mode'] == 'terms':
+            for cells in block['rows']:
+                if len(cells) < 2 or cells[0].lower() == 'term' or not cells[0]:
+                    continue
+                state['counts']['term'] += 1
+                rows.append(('Key_Terms', {
+                    'term_id': f"term-{state['topic_id']}-{state['counts']['term']}",
+                    'topic_id': state['topic_id'],
+                    'term': cells[0],
+                    'definition': cells[1],
+                }))
+        elif state['mode'] == 'section':
+            text = '\n'.join(cell for cells in block['rows'] for cell in cells if cell)
+            if text:
+                rows.append(_content_row(state, text))
+        return rows
+
+    text = block['text']
+    if state['mode'] == 'objectives' and kind == 'list_item':
+        state['counts']['objective'] += 1
+        rows.append(('Learning_Objectives', {
+            'objective_id': f"obj-{state['topic_id']}-{state['counts']['objective']}",
+            'topic_id': state['topic_id'],
+            'objective_text': text,
+            'order_index': state['counts']['objective'],
+        }))
+    elif state['mode'] == 'section':
+        meta = SECTION_META_RE.match(text)
+        label = _label(text)
+        if meta:
+            # Rename the section row emitted for the heading
+            section_type = (meta.group(2) or 'content').lower()
+            section_id = meta.group(1).strip()
+            update = {'section_id': state['section_id'], '_update': True}
+            if section_id and not section_id.startswith('['):
+                update['new_section_id'] = state['section_id'] = section_id
+            state['section_type'] = section_type
+            rows.append(('Topic_Sections', {
+                **update,
+                'section_icon': SECTION_ICONS.get(section_type, 'FileText'),
+                'section_type': section_type,
+            }))
+        elif label is not None and label in CONTENT_LABELS:
+            state['content_type'] = CONTENT_LABELS[label]
+        else:
+            rows.append(_content_row(state, text))
+    return rows
+
+def process_document(docx_path, cached):
+    """
+    Interpret a document, reusing cached results for any block whose content
+    and incoming interpreter state are unchanged since the last import.
+    Returns (rows_by_sheet, cache_entries, stats).
+    """
+    state = new_state()
+    entries = {}
+    reused = processed = 0
+    emitted = []
+
+    for block in iter_blocks(docx_path):
+        key = hashlib.sha1((json.dumps(state, sort_keys=True) + block_hash(block)).encode('utf-8')).hexdigest()
+        entry = cached.get(key)
+        if entry is not None:
+            reused += 1
+            state = json.loads(json.dumps(entry['state']))
+        else:
+            processed += 1
+            block_rows = interpret_block(block, state)
+            entry = {'rows': block_rows, 'state': json.loads(json.dumps(state))}
+        entries[key] = entry
+        emitted.extend(entry['rows'])
+
+    return collect_rows(emitted), entries, {'reused': reused, 'processed': processed}
+
+def collect_rows(emitted):
+    """Group emitted (sheet, row) pairs and fold section metadata updates into their rows"""
+    by_sheet = {sheet: [] for sheet in IMPORTED_SHEETS}
+    sections = {}
+    for sheet, row in emitted:
+        if row.get('_update'):
+            target = sections.get(row['section_id'])
+            if target is not None:
+                target.update({k: v for k, v in row.items() if k not in ('_update', 'section_id', 'new_section_id')})
+                if row.get('new_section_id'):
+                    target['section_id'] = row['new_section_id']
+                    sections[row['new_section_id']] = target
+            continue
+        row = dict(row)
+        by_sheet[sheet].append(row)
+        if sheet == 'Topic_Sections':
+            sections[row['section_id']] = row
+    return by_sheet
+
+
+# ============================================================================
+# CACHE + BATCH
+# ============================================================================
+
+def load_cache(cache_path):
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print(f"  [WARN] Ignoring unreadable cache {cache_path}")
+    return {}
+
+def save_cache(cache_path, cache):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+def _process_job(job):
+    path, cached = job
+    rows, entries, stats = process_document(path, cached)
+    return path, rows, entries, stats
+
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.rglob('*.docx') if not p.name.startswith('~$')))
+        else:
+            paths.append(path)
+    return paths
+
+def import_documents(paths, cache_path=DEFAULT_CACHE, workers=None):
+    """Import a batch of documents in parallel and return merged rows per sheet"""
+    cache = load_cache(cache_path) if cache_path else {}
+    jobs = [(str(path.resolve()), cache.get(str(path.resolve()), {})) for path in paths]
+
+    merged = {sheet: [] for sheet in IMPORTED_SHEETS}
+    results = {}
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, rows, entries, stats in pool.map(_process_job, jobs):
+                results[path] = (rows, entries, stats)
+    else:
+        for job in jobs:
+            path, rows, entries, stats = _process_job(job)
+            results[path] = (rows, entries, stats)
+
+    # Merge in input order so output is deterministic regardless of scheduling
+    for path, _ in jobs:
+        rows, entries, stats = results[path]
+        print(f"  [+] {Path(path).name}: {stats['processed']} blocks processed, {stats['reused']} reused from cache")
+        for sheet in IMPORTED_SHEETS:
+            merged[sheet].extend(rows[sheet])
+        cache[path] = entries  # only blocks seen in this import survive
+
+    if cache_path:
+        save_cache(cache_path, cache)
+    return merged
+
+def write_workbook(output_path, rows_by_sheet):
+    wb = Workbook(write_only=True)
+    for sheet_name in IMPORTED_SHEETS:
+        columns = SHEET_SCHEMAS[sheet_name]['columns']
+        ws = wb.create_sheet(sheet_name)
+        ws.append(columns)
+        for row in rows_by_sheet[sheet_name]:
+            ws.append([row.get(column, '') for column in columns])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(output_path)
+    print(f"  [+] Created: {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Import StudyHub DOCX content into workbook rows')
+    parser.add_argument('inputs', nargs='+', help='DOCX files or directories containing them')
+    parser.add_argument('-o', '--output', default='imported_content.xlsx', help='Output workbook path')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel worker processes (default: CPU count)')
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help='Block cache file')
+    parser.add_argument('--no-cache', action='store_true', help='Re-process every block')
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("[ERROR] No DOCX files found")
+        sys.exit(1)
+
+    print(f"[*] Importing {len(paths)} document(s)...")
+    rows = import_documents(paths, None if args.no_cache else Path(args.cache), args.workers)
+    for sheet_name in IMPORTED_SHEETS:
+        print(f"  {sheet_name}: {len(rows[sheet_name])} rows")
+    write_workbook(Path(args.output), rows)
+
+if __name__ == '__main__':
+    main()
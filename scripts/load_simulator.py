@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Concurrent-Student Load Simulator for Harshi-App
+Replays student sessions against a local static server to see how each
+content layout behaves when a whole school opens the app at once.
+
+A session follows the frontend's fetch order (src/services/csvService.js via
+unifiedDataService.loadFromCSV):
+
+1. questionnaire/master-index.csv
+2. per topic, in master index order: questions.json (questions.csv on 404),
+   sections.csv, content.ast.json, content.json (content.csv on 404)
+3. the student opens a few random topics: handout fragments
+   (data/handouts/index.json + fragment)
+
+Layouts:
+    plain    logical paths, revalidated every visit (ETag / 304)
+    hashed   paths resolved through content-manifest.json
+             (convert_to_csv.py --hashed); hashed files are immutable, so
+             returning students only revalidate the manifest
+    archive  data.zip.json index + HTTP Range requests for the master and
+             topic workbooks in data.zip (build_data_zip.py)
+
+Each simulated student keeps its own HTTP cache across --visits and one
+keep-alive connection per visit. Unless --url is given, the tree is served
+by this script in a separate process (`serve`), with ETag, Range and
+immutable Cache-Control for the hashed/ copies.
+
+Usage:
+    python scripts/load_simulator.py run [--students N] [--visits N]
+                                         [--concurrency N] [--layouts plain,hashed,archive]
+                                         [--url http://127.0.0.1:3000] [--json report.json]
+    python scripts/load_simulator.py serve [--port N]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import mimetypes
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from asset_manifest import HASHED_DIR, MANIFEST_NAME
+
+BASE_DIR = Path(__file__).parent.parent
+
+PUBLIC_DIR = BASE_DIR / 'public'
+LAYOUTS = ['plain', 'hashed', 'archive']
+HANDOUT_INDEX = 'data/handouts/index.json'
+ARCHIVE_INDEX = 'data.zip.json'
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+# ============================================================================
+# STATIC SERVER
+# ============================================================================
+
+class StaticServer:
+    """Minimal HTTP/1.1 static file server (GET/HEAD, keep-alive, ETag, Range)"""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.files = {}  # path -> (bytes, etag, content type) or None
+
+    def lookup(self, url_path):
+        if url_path not in self.files:
+            path = (self.root / unquote(url_path).lstrip('/')).resolve()
+            entry = None
+            if path.is_file() and path.is_relative_to(self.root):
+                data = path.read_bytes()
+                stat = path.stat()
+                etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+                entry = (data, etag, mimetypes.guess_type(path.name)[0] or 'application/octet-stream')
+            self.files[url_path] = entry
+        return self.files[url_path]
+
+    def respond(self, method, url_path, headers):
+        entry = self.lookup(url_path.split('?', 1)[0])
+        if entry is None:
+            return 404, {}, b'Not Found'
+        data, etag, content_type = entry
+        cache_control = IMMUTABLE if url_path.startswith(f'/{HASHED_DIR}/') else REVALIDATE
+        base = {'ETag': etag, 'Cache-Control': cache_control, 'Content-Type': content_type, 'Accept-Ranges': 'bytes'}
+
+        if headers.get('if-none-match') == etag:
+            return 304, base, b''
+
+        status, body = 200, data
+        byte_range = headers.get('range', '')
+        if byte_range.startswith('bytes='):
+            start, _, end = byte_range[6:].partition('-')
+            start = int(start or 0)
+            end = min(int(end) if end else len(data) - 1, len(data) - 1)
+            if start > end:
+                return 416, {'Content-Range': f'bytes */{len(data)}'}, b''
+            status, body = 206, data[start:end + 1]
+            base['Content-Range'] = f'bytes {start}-{end}/{len(data)}'
+        return status, base, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                method, url_path, _ = (lines[0].split(' ') + ['', '', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                if method in ('GET', 'HEAD'):
+                    status, extra, body = self.respond(method, url_path, headers)
+                else:
+                    status, extra, body = 405, {}, b''
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                response = [f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}',
+                            f'Content-Length: {len(body)}',
+                            f'Connection: {"keep-alive" if keep_alive else "close"}']
+                response += [f'{key}: {value}' for key, value in extra.items()]
+                writer.write(('\r\n'.join(response) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+STATUS_TEXT = {200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 404: 'Not Found',
+               405: 'Method Not Allowed', 416: 'Range Not Satisfiable'}
+
+async def serve(root, host, port):
+    server = StaticServer(root)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096, limit=1 << 16)
+    actual_port = listener.sockets[0].getsockname()[1]
+    print(f"[*] Serving {server.root} on http://{host}:{actual_port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+# ============================================================================
+# SESSION SCRIPTS
+# ============================================================================
+
+def _read_index(path):
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_plan(public_dir):
+    """
+    Everything a session may request, derived from the tree being served.
+    Each startup step lists the paths the client tries in order, moving on
+    to the next only when a request fails (the typed JSON -> CSV fallback).
+    """
+    topics = _read_index(public_dir / 'questionnaire' / 'master-index.csv')
+    handout_index = _read_json(public_dir / HANDOUT_INDEX) or {}
+    archive_index = _read_json(public_dir / ARCHIVE_INDEX)
+
+    startup = [('questionnaire/master-index.csv',)]
+    for row in topics:
+        subject = (row.get('subject_key') or '').capitalize()
+        folder = row.get('topic_folder', '')
+        # Same folder for every load, exactly as loadFromCSV() does
+        startup += [(f'questionnaire/{subject}/{folder}/questions.json',
+                     f'questionnaire/{subject}/{folder}/questions.csv'),
+                    (f'studyguide/{subject}/{folder}/sections.csv',),
+                    (f'studyguide/{subject}/{folder}/content.ast.json',),
+                    (f'studyguide/{subject}/{folder}/content.json',
+                     f'studyguide/{subject}/{folder}/content.csv')]
+
+    handouts = {}
+    for row in topics:
+        topic_id = row.get('topic_id')
+        paths = []
+        entry = handout_index.get('topics', {}).get(topic_id)
+        if entry:
+            paths.append(f"data/handouts/{entry['file']}")
+        handouts[topic_id] = paths
+
+    workbooks = []
+    if archive_index:
+        names = sorted(archive_index['entries'])
+        workbooks = [name for name in names if name == 'data/StudyHub_Master.xlsx']
+        workbooks += [name for name in names if name.startswith('data/topics/')]
+
+    return {
+        'startup': startup,
+        'handouts': handouts,
+        'handout_index': HANDOUT_INDEX if handout_index else None,
+        'archive_index': archive_index,
+        'workbooks': workbooks,
+        'assets': (_read_json(public_dir / MANIFEST_NAME) or {}).get('assets'),
+    }
+
+def layout_available(layout, plan):
+    if layout == 'hashed':
+        return plan['assets'] is not None
+    if layout == 'archive':
+        return plan['archive_index'] is not None
+    return True
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.fresh_hits = 0      # served from the student's cache, no request
+        self.revalidated = 0     # 304 Not Modified
+        self.lookups = 0
+        self.statuses = {}
+        self.latencies = []
+        self.errors = 0
+
+    def record(self, status, size, seconds):
+        self.requests += 1
+        self.bytes += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies.append(seconds)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, like a browser tab's"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, path, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=1 << 16)
+        lines = [f'GET {path} HTTP/1.1', f'Host: {self.host}:{self.port}']
+        lines += [f'{key}: {value}' for key, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split(' ')[1])
+        response_headers = {}
+        for line in head[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                response_headers[key.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readuntil(b'\r\n')
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b''.join(chunks)
+        else:
+            body = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, body
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+class Student:
+    """A student's browser: HTTP cache kept across visits"""
+
+    def __init__(self, client, stats):
+        self.client = client
+        self.stats = stats
+        self.cache = {}  # url -> (etag, immutable, body)
+
+    async def get(self, conn, path, byte_range=None):
+        url = self.client.prefix + '/' + path.lstrip('/')
+        key = url if byte_range is None else f'{url}#{byte_range}'
+        self.stats.lookups += 1
+        cached = self.cache.get(key)
+        if cached and cached[1]:
+            self.stats.fresh_hits += 1
+            return cached[2]
+
+        headers = {}
+        if byte_range:
+            headers['Range'] = f'bytes={byte_range[0]}-{byte_range[1]}'
+        if cached and cached[0]:
+            headers['If-None-Match'] = cached[0]
+
+        started = time.perf_counter()
+        try:
+            status, response_headers, body = await conn.request(url, headers)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.stats.errors += 1
+            await conn.close()
+            return None
+        self.stats.record(status, len(body), time.perf_counter() - started)
+
+        if status == 304 and cached:
+            self.stats.revalidated += 1
+            return cached[2]
+        if status in (200, 206):
+            immutable = 'immutable' in response_headers.get('cache-control', '')
+            self.cache[key] = (response_headers.get('etag'), immutable, body)
+            return body
+        return None
+
+    async def visit(self, layout, plan, rng, topics_opened, think):
+        conn = Connection(self.client.host, self.client.port)
+        try:
+            if layout == 'archive':
+                await self.get(conn, ARCHIVE_INDEX)
+                entries = plan['archive_index']['entries']
+                for name in plan['workbooks']:
+                    entry = entries[name]
+                    await self.get(conn, plan['archive_index']['archive'],
+                                   (entry['offset'], entry['offset'] + entry['length'] - 1))
+                    await think()
+                return
+
+            resolve = lambda path: path  # noqa: E731
+            if layout == 'hashed':
+                await self.get(conn, MANIFEST_NAME)
+                assets = plan['assets']
+                resolve = lambda path: assets.get(path, path)  # noqa: E731
+
+            for paths in plan['startup']:
+                for path in paths:
+                    if await self.get(conn, resolve(path)) is not None:
+                        break
+            await think()
+
+            topic_ids = [topic_id for topic_id, paths in plan['handouts'].items() if paths]
+            for topic_id in rng.sample(topic_ids, min(topics_opened, len(topic_ids))):
+                if plan['handout_index']:
+                    await self.get(conn, plan['handout_index'])
+                for path in plan['handouts'][topic_id]:
+                    await self.get(conn, resolve(path))
+                await think()
+        finally:
+            await conn.close()
+
+class Client:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+
+async def run_layout(client, layout, plan, args):
+    stats = Stats()
+    gate = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+
+    async def think():
+        if args.think_ms:
+            await asyncio.sleep(rng.uniform(0, args.think_ms) / 1000)
+
+    async def student_run(index):
+        # Spread arrivals over the ramp, like a class logging in at 8am
+        await asyncio.sleep(args.ramp * index / max(args.students, 1))
+        student = Student(client, stats)
+        for _ in range(args.visits):
+            async with gate:
+                await student.visit(layout, plan, rng, args.topics, think)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(student_run(i) for i in range(args.students)))
+    return stats, time.perf_counter() - started
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def summarize(layout, stats, elapsed):
+    latencies = sorted(stats.latencies)
+    hits = stats.fresh_hits + stats.revalidated
+    return {
+        'layout': layout,
+        'elapsed_s': round(elapsed, 3),
+        'requests': stats.requests,
+        'requests_per_s': round(stats.requests / elapsed, 1) if elapsed else 0.0,
+        'bytes': stats.bytes,
+        'cache_hit_ratio': round(hits / stats.lookups, 4) if stats.lookups else 0.0,
+        'fresh_hits': stats.fresh_hits,
+        'revalidated': stats.revalidated,
+        'statuses': {str(k): v for k, v in sorted(stats.statuses.items())},
+        'errors': stats.errors,
+        'latency_ms': {name: round(percentile(latencies, pct) * 1000, 2)
+                       for name, pct in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))},
+    }
+
+def print_summary(summary):
+    lat = summary['latency_ms']
+    print(f"  requests:   {summary['requests']} in {summary['elapsed_s']}s ({summary['requests_per_s']} req/s)")
+    print(f"  bytes:      {summary['bytes']}")
+    print(f"  cache hits: {summary['cache_hit_ratio']:.1%} "
+          f"({summary['fresh_hits']} fresh, {summary['revalidated']} revalidated)")
+    print(f"  latency ms: p50 {lat['p50']}  p90 {lat['p90']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"  statuses:   {summary['statuses']}")
+    if summary['errors']:
+        print(f"  [WARN] {summary['errors']} connection errors")
+
+def start_server(root, port=0):
+    """Run `serve` in a separate process so clients and server don't share an event loop"""
+    process = subprocess.Popen([sys.executable, str(Path(__file__).resolve()), 'serve', '--root', str(root),
+                                '--port', str(port)], stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith('[*] Serving'):
+        process.terminate()
+        raise RuntimeError(f"Static server failed to start: {line.strip()}")
+    return process, line.rsplit(' ', 1)[-1].strip()
+
+def run(args):
+    root = Path(args.root)
+    plan = build_plan(root)
+    layouts = [name.strip() for name in args.layouts.split(',') if name.strip()]
+    unknown = [name for name in layouts if name not in LAYOUTS]
+    if unknown:
+        print(f"[ERROR] Unknown layout(s): {', '.join(unknown)} (choose from {', '.join(LAYOUTS)})")
+        return 1
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_server(root)
+    client = Client(url)
+
+    summaries = []
+    try:
+        for layout in layouts:
+            if not layout_available(layout, plan):
+                missing = MANIFEST_NAME if layout == 'hashed' else ARCHIVE_INDEX
+                print(f"[WARN] Skipping layout '{layout}': {missing} not found in {root}")
+                continue
+            print(f"[*] Layout '{layout}': {args.students} students x {args.visits} visits against {url}")
+            stats, elapsed = asyncio.run(run_layout(client, layout, plan, args))
+            summary = summarize(layout, stats, elapsed)
+            print_summary(summary)
+            summaries.append(summary)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'students': args.students, 'visits': args.visits, 'layouts': summaries}, f, indent=2)
+        print(f"  [+] Created: {args.json}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent students against the content tree')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='Replay student sessions and report per layout')
+    run_parser.add_argument('--root', default=str(PUBLIC_DIR), help='Content tree to serve and plan sessions from')
+    run_parser.add_argument('--url', help='Target an already running server instead of starting one')
+    run_parser.add_argument('--layouts', default=','.join(LAYOUTS), help='Comma-separated layouts to compare')
+    run_parser.add_argument('--students', type=int, default=2000, help='Simulated students')
+    run_parser.add_argument('--visits', type=int, default=2, help='Visits per student (cache kept between visits)')
+    run_parser.add_argument('--concurrency', type=int, default=256, help='Students with an open connection at once')
+    run_parser.add_argument('--ramp', type=float, default=2.0, help='Seconds over which students arrive')
+    run_parser.add_argument('--topics', type=int, default=2, help='Topics whose handouts a student opens per visit')
+    run_parser.add_argument('--think-ms', type=float, default=0.0, help='Max random pause between session steps')
+    run_parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    run_parser.add_argument('--json', help='Also write the report to this file')
+
+    serve_parser = sub.add_parser('serve', help='Serve the content tree (ETag, Range, immutable hashed names)')
+    serve_parser.add_argument('--root', default=str(PUBLIC_DIR))
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args.root, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    return run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Markdown Pre-parser for Harshi-App
+Parses the markdown in study guide content_text (bullets, numbered steps,
+**bold**, headings, ...) once at build time into a compact JSON AST, so the
+content blocks render nodes directly instead of parsing text in the browser
+(src/components/StudyGuide/ContentBlocks/MarkdownNodes.jsx).
+
+For every public/studyguide/**/content.csv a sidecar content.ast.json is
+written next to it:
+
+    {"v": 1, "nodes": {<text hash>: <ast>}, "blocks": {<content_id>: <text hash>}}
+
+Only blocks that contain markdown get an entry; plain text is rendered as it
+is. Identical texts share one AST (keyed by text hash), and parsed ASTs are
+cached across runs in .cache/markdown-ast.json (invalidated by PARSER_VERSION).
+Sidecars are only rewritten when their content changes.
+
+AST (arrays, strings for plain text):
+    blocks:  ["p", inl] | ["h", level, inl] | ["ul", [item...]] | ["ol", start, [item...]]
+             | ["quote", [block...]] | ["pre", text] | ["hr"]
+    item:    [inline...] for a single-paragraph item, else [block...]
+             (block and inline tags do not overlap)
+    inline:  "text" | ["b", inl] | ["i", inl] | ["code", text] | ["a", href, inl] | ["br"]
+             (href is http(s):, mailto: or relative; other links keep only their text)
+
+Usage:
+    python scripts/markdown_ast.py [--root public/studyguide] [--force]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import asset_manifest
+
+BASE_DIR = Path(__file__).parent.parent
+STUDYGUIDE_DIR = BASE_DIR / 'public' / 'studyguide'
+CACHE_PATH = BASE_DIR / '.cache' / 'markdown-ast.json'
+SIDECAR_NAME = 'content.ast.json'
+SIDECAR_VERSION = 1
+PARSER_VERSION = 2
+
+# content.csv text column: converter output uses 'content', hand-written trees 'content_text'
+TEXT_COLUMNS = ['content_text', 'content']
+HASH_LENGTH = 16
+
+
+# ============================================================================
+# INLINE
+# ============================================================================
+
+INLINE_TOKEN = re.compile(
+    r'(?P<code>`+)(?P<code_text>.+?)(?P=code)'
+    r'|\[(?P<link_text>[^\]]+)\]\((?P<href>(?:[^()\s]|\([^()\s]*\))+)\)'
+    r'|(?P<strong>\*\*|__)(?=\S)(?P<strong_text>.+?)(?<=\S)(?P=strong)'
+    r'|(?P<em>\*|(?<![A-Za-z0-9])_)(?=[^\s*_])(?P<em_text>.+?)(?<=[^\s*_])(?:\*|_(?![A-Za-z0-9]))'
+)
+
+# Links may only point at web pages, mail addresses or relative URLs
+SAFE_SCHEMES = {'http', 'https', 'mailto'}
+URL_SCHEME = re.compile(r'^([A-Za-z][A-Za-z0-9+.-]*):')
+CONTROL_CHARS = re.compile(r'[\x00-\x20\x7f]')
+
+def is_safe_href(href):
+    """True for http(s):, mailto: and relative URLs (browsers ignore control characters in schemes)"""
+    if CONTROL_CHARS.search(href):
+        return False
+    scheme = URL_SCHEME.match(href)
+    return scheme is None or scheme.group(1).lower() in SAFE_SCHEMES
+
+def _append_text(nodes, text):
+    if not text:
+        return
+    if nodes and isinstance(nodes[-1], str):
+        nodes[-1] += text
+    else:
+        nodes.append(text)
+
+def parse_inline(text):
+    """Inline nodes for a run of text (hard line breaks become ["br"])"""
+    nodes = []
+    for i, line in enumerate(text.split('\n')):
+        if i:
+            nodes.append(['br'])
+        pos = 0
+        for match in INLINE_TOKEN.finditer(line):
+            _append_text(nodes, line[pos:match.start()])
+            if match.group('code'):
+                nodes.append(['code', match.group('code_text').strip()])
+            elif match.group('href'):
+                label = parse_inline(match.group('link_text'))
+                if is_safe_href(match.group('href')):
+                    nodes.append(['a', match.group('href'), label])
+                else:
+                    # Unsafe link (e.g. javascript:): keep just its text
+                    for node in label:
+                        if isinstance(node, str):
+                            _append_text(nodes, node)
+                        else:
+                            nodes.append(node)
+            elif match.group('strong'):
+                nodes.append(['b', parse_inline(match.group('strong_text'))])
+            else:
+                nodes.append(['i', parse_inline(match.group('em_text'))])
+            pos = match.end()
+        _append_text(nodes, line[pos:])
+    return nodes
+
+
+# ============================================================================
+# BLOCKS
+# ============================================================================
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+BULLET = re.compile(r'^(\s*)[-*+]\s+(.*)$')
+ORDERED = re.compile(r'^(\s*)(\d{1,9})[.)]\s+(.*)$')
+QUOTE = re.compile(r'^\s*>\s?(.*)$')
+FENCE = re.compile(r'^\s*(```|~~~)')
+RULE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+
+def _list_marker(line):
+    """(kind, indent, start, text) for a list item line, or None"""
+    match = ORDERED.match(line)
+    if match:
+        return 'ol', len(match.group(1)), int(match.group(2)), match.group(3)
+    match = BULLET.match(line)
+    if match and not RULE.match(line):
+        return 'ul', len(match.group(1)), None, match.group(2)
+    return None
+
+def _parse_list(lines, i):
+    kind, indent, start, _ = _list_marker(lines[i])
+    items = []
+    while i < len(lines):
+        marker = _list_marker(lines[i])
+        if not marker or marker[0] != kind or marker[1] != indent:
+            break
+        body = [marker[3]]
+        i += 1
+        # Continuation and nested lines: indented deeper than the marker
+        while i < len(lines) and lines[i].strip() and (len(lines[i]) - len(lines[i].lstrip())) > indent \
+                and not (_list_marker(lines[i]) and _list_marker(lines[i])[1] <= indent):
+            body.append(lines[i][indent:])
+            i += 1
+        blocks = parse_blocks(_dedent(body))
+        items.append(blocks[0][1] if len(blocks) == 1 and blocks[0][0] == 'p' else blocks)
+        # A blank line between items keeps the list going
+        if i + 1 < len(lines) and not lines[i].strip():
+            following = _list_marker(lines[i + 1])
+            if following and following[0] == kind and following[1] == indent:
+                i += 1
+    node = ['ol', start, items] if kind == 'ol' else ['ul', items]
+    return node, i
+
+def _dedent(lines):
+    rest = [line for line in lines[1:] if line.strip()]
+    width = min((len(line) - len(line.lstrip()) for line in rest), default=0)
+    return [lines[0]] + [line[width:] for line in lines[1:]]
+
+def parse_blocks(lines):
+    blocks = []
+    paragraph = []
+
+    def flush():
+        if paragraph:
+            blocks.append(['p', parse_inline('\n'.join(line.strip() for line in paragraph))])
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            flush()
+            i += 1
+        elif FENCE.match(line):
+            flush()
+            fence = FENCE.match(line).group(1)
+            end = i + 1
+            while end < len(lines) and not lines[end].strip().startswith(fence):
+                end += 1
+            blocks.append(['pre', '\n'.join(lines[i + 1:end])])
+            i = end + 1
+        elif HEADING.match(line):
+            flush()
+            match = HEADING.match(line)
+            blocks.append(['h', len(match.group(1)), parse_inline(match.group(2))])
+            i += 1
+        elif RULE.match(line):
+            flush()
+            blocks.append(['hr'])
+            i += 1
+        elif _list_marker(line):
+            # Lists may interrupt a paragraph ("Example: ...\n1. First step")
+            flush()
+            node, i = _parse_list(lines, i)
+            blocks.append(node)
+        elif QUOTE.match(line):
+            flush()
+            quoted = []
+            while i < len(lines) and QUOTE.match(lines[i]):
+                quoted.append(QUOTE.match(lines[i]).group(1))
+                i += 1
+            blocks.append(['quote', parse_blocks(quoted)])
+        else:
+            paragraph.append(line)
+            i += 1
+    flush()
+    return blocks
+
+def parse_markdown(text):
+    """Block nodes for a markdown text"""
+    return parse_blocks(text.replace('\r\n', '\n').replace('\r', '\n').split('\n'))
+
+def is_plain(text, ast):
+    """True when the text renders the same without markdown (one plain paragraph)"""
+    return len(ast) <= 1 and (not ast or (ast[0][0] == 'p' and ast[0][1] == [text.strip()]))
+
+
+# ============================================================================
+# SIDECARS
+# ============================================================================
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('parser') == PARSER_VERSION:
+            return cache['asts']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+def save_cache(asts, path=CACHE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'parser': PARSER_VERSION, 'asts': asts}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def read_blocks(csv_path):
+    """[(content_id, text)] from a content.csv, whichever text column it uses"""
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        column = next((c for c in TEXT_COLUMNS if c in (reader.fieldnames or [])), None)
+        if column is None or 'content_id' not in reader.fieldnames:
+            return []
+        return [(row['content_id'], row[column] or '') for row in reader if row.get('content_id')]
+
+def build_sidecar(blocks, cached, used):
+    """Sidecar dict for one content.csv; cached/used are {text hash: ast} (None = plain text)"""
+    nodes, refs = {}, {}
+    for content_id, text in blocks:
+        if not text.strip():
+            continue
+        key = text_hash(text)
+        if key not in cached:
+            ast = parse_markdown(text)
+            cached[key] = None if is_plain(text, ast) else ast
+        used[key] = cached[key]
+        if cached[key] is not None:
+            nodes[key] = cached[key]
+            refs[content_id] = key
+    return {'v': SIDECAR_VERSION, 'nodes': nodes, 'blocks': refs} if refs else None
+
+def write_sidecar(path, sidecar):
+    """Write (or remove) a sidecar; returns 'created', 'updated', 'removed' or None if unchanged"""
+    if sidecar is None:
+        if path.exists():
+            path.unlink()
+            return 'removed'
+        return None
+    data = json.dumps(sidecar, ensure_ascii=False, separators=(',', ':')) + '\n'
+    existed = path.exists()
+    if existed and path.read_text(encoding='utf-8') == data:
+        return None
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(data, encoding='utf-8')
+    os.replace(tmp_path, path)
+    return 'updated' if existed else 'created'
+
+def build_asts(root=STUDYGUIDE_DIR, force=False, cache_path=CACHE_PATH):
+    root = Path(root)
+    print(f"[*] Pre-parsing markdown under {root}...")
+    cached = {} if force else load_cache(cache_path)
+    hits_before = set(cached)
+    used = {}
+    stats = {'files': 0, 'blocks': 0, 'unchanged': 0}
+
+    for csv_path in sorted(root.rglob('content.csv')):
+        stats['files'] += 1
+        sidecar = build_sidecar(read_blocks(csv_path), cached, used)
+        stats['blocks'] += len(sidecar['blocks']) if sidecar else 0
+        status = write_sidecar(csv_path.with_name(SIDECAR_NAME), sidecar)
+        label = csv_path.with_name(SIDECAR_NAME).relative_to(BASE_DIR) if csv_path.is_relative_to(BASE_DIR) \
+            else csv_path.with_name(SIDECAR_NAME)
+        if status in ('created', 'updated'):
+            print(f"  [+] {status.title()}: {label}")
+        elif status == 'removed':
+            print(f"  [-] Removed: {label}")
+        else:
+            stats['unchanged'] += 1
+
+    # Keep only texts still in use, so the cache does not grow forever
+    save_cache(used, cache_path)
+    parsed = len(set(used) - hits_before)
+    print(f"  {stats['files']} content files, {stats['blocks']} markdown blocks, "
+          f"{len(used)} unique texts ({parsed} parsed, {len(used) - parsed} cached), {stats['unchanged']} unchanged")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-parse study guide markdown into compact JSON ASTs')
+    parser.add_argument('--root', default=str(STUDYGUIDE_DIR), help='Tree of content.csv files')
+    parser.add_argument('--force', action='store_true', help='Ignore the AST cache and re-parse every text')
+    parser.add_argument('--parse', metavar='TEXT', help='Print the AST of TEXT and exit')
+    args = parser.parse_args()
+
+    if args.parse is not None:
+        print(json.dumps(parse_markdown(args.parse.replace('\\n', '\n')), ensure_ascii=False))
+        return 0
+    build_asts(args.root, args.force)
+    # The sidecars are content assets: keep a published manifest pointing at them
+    if Path(args.root).resolve().is_relative_to(asset_manifest.PUBLIC_DIR.resolve()):
+        asset_manifest.refresh()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
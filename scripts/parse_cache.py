@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared XLSX Parse Cache for Harshi-App
+XLSX parsing is the slowest step of every data tool. The first read of a
+workbook parses all of its sheets once and stores each sheet as a columnar
+file; later reads (from any tool) load the columnar copy instead.
+
+- Key:      source path + size + SHA-256 of the file contents
+- Format:   Arrow IPC files when pyarrow is installed, otherwise compact
+            JSON columns. Loading skips XLSX parsing but is not zero-copy:
+            every sheet is converted back to rows of Python values, which
+            is what the callers work with
+- Eviction: least-recently-used entries are dropped once the cache exceeds
+            MAX_CACHE_BYTES (env STUDYHUB_PARSE_CACHE_BYTES)
+
+Workbooks are parsed by xlsx_reader (python-calamine when installed,
+openpyxl otherwise). Cell values are stored with openpyxl's types (columns
+that are purely int or float keep their type; anything else is stored as
+str), so callers apply their usual cleaning (e.g. clean_column) on top.
+
+Usage:
+    python scripts/parse_cache.py stats
+    python scripts/parse_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import xlsx_reader
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = Path(os.environ.get('STUDYHUB_PARSE_CACHE_DIR', BASE_DIR / '.cache' / 'parse'))
+MAX_CACHE_BYTES = int(os.environ.get('STUDYHUB_PARSE_CACHE_BYTES', 256 * 1024 * 1024))
+CACHE_VERSION = 2
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:
+    pa = None
+
+# In-process copies so one run never loads the same sheet twice
+_loaded = {}
+_loaded_keys = {}  # path -> key of its copy in _loaded (older versions are dropped)
+_index_lock = threading.Lock()
+_key_locks = {}  # key -> lock, so only one thread parses a given workbook version
+
+
+# ============================================================================
+# KEYS + INDEX
+# ============================================================================
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_index():
+    try:
+        with open(CACHE_DIR / 'index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == CACHE_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'version': CACHE_VERSION, 'entries': {}, 'hashes': {}}
+
+def _save_index(index):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_DIR / f'index.json.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, CACHE_DIR / 'index.json')
+
+def cache_key(path, index=None):
+    """path + size + content hash; the content hash is memoized by (size, mtime)"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    hashes = index['hashes'] if index is not None else {}
+    memo = hashes.get(str(path))
+    if memo and memo['size'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+        content_hash = memo['sha256']
+    else:
+        content_hash = _file_sha256(path)
+        hashes[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': content_hash}
+    raw = f"{path}\0{stat.st_size}\0{content_hash}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+def _evict(index, keep):
+    """Drop least-recently-used entries until the cache fits MAX_CACHE_BYTES"""
+    entries = index['entries']
+    total = sum(e['bytes'] for e in entries.values())
+    for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+        if total <= MAX_CACHE_BYTES:
+            break
+        if key == keep:
+            continue
+        total -= entries[key]['bytes']
+        shutil.rmtree(CACHE_DIR / key, ignore_errors=True)
+        del entries[key]
+
+
+# ============================================================================
+# COLUMNAR STORAGE
+# ============================================================================
+
+def _column_values(rows, index):
+    values = [row[index] if index < len(row) else None for row in rows]
+    present = [v for v in values if v is not None]
+    if present and all(type(v) is int for v in present):
+        return values, 'int'
+    if present and all(type(v) is float for v in present):
+        return values, 'float'
+    return [None if v is None else str(v) for v in values], 'str'
+
+def _write_sheet(path, header, rows):
+    width = max([len(header)] + [len(row) for row in rows])
+    header = list(header) + [None] * (width - len(header))
+    columns = [_column_values(rows, i) for i in range(width)]
+
+    if pa is not None:
+        types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+        table = pa.table(
+            {f'c{i}': pa.array(values, type=types[kind]) for i, (values, kind) in enumerate(columns)},
+            metadata={'header': json.dumps([None if h is None else str(h) for h in header])})
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'header': [None if h is None else str(h) for h in header],
+                       'rows': len(rows), 'columns': [values for values, _ in columns]}, f)
+
+def _read_sheet(path):
+    """Return (header, rows) from a cached sheet file (rows are copied out of the Arrow buffers)"""
+    if path.suffix == '.arrow':
+        with pa.memory_map(str(path), 'r') as source:
+            table = pa_ipc.open_file(source).read_all()
+        header = json.loads(table.schema.metadata[b'header'])
+        columns = [column.to_pylist() for column in table.columns]
+        return header, list(zip(*columns)) if columns else []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['header'], list(zip(*data['columns'])) if data['columns'] else [()] * data['rows']
+
+def _entry_suffix(entry_dir):
+    """Sheet file suffix of a complete cache entry, or None"""
+    try:
+        with open(entry_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+            sheets = json.load(f)['sheets']
+    except (OSError, ValueError, KeyError):
+        return None
+    return Path(sheets[0]['file']).suffix if sheets else None
+
+def _parse_workbook(source, entry_dir):
+    """Parse every sheet of a workbook once and store it under entry_dir"""
+    entry_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f'{entry_dir.name}.', suffix='.tmp', dir=entry_dir.parent))
+
+    suffix = '.arrow' if pa is not None else '.json'
+    engine = xlsx_reader.default_engine()
+    sheets = []
+    for i, (name, header, body) in enumerate(xlsx_reader.read_workbook(source, engine)):
+        _write_sheet(tmp_dir / f'{i}{suffix}', header, body)
+        sheets.append({'name': name, 'file': f'{i}{suffix}'})
+
+    with open(tmp_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump({'source': str(source), 'engine': engine, 'sheets': sheets}, f)
+
+    try:
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        if _entry_suffix(entry_dir) == suffix:
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # another process stored the same key first
+        else:
+            shutil.rmtree(entry_dir, ignore_errors=True)  # partial, or in a format we cannot read
+            os.replace(tmp_dir, entry_dir)
+    return sum(p.stat().st_size for p in entry_dir.iterdir())
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def load_sheets(path):
+    """
+    Return {sheet_name: (header, rows)} for every sheet of a workbook, where
+    header is the first row and rows are tuples of raw cell values.
+    """
+    path = Path(path).resolve()
+    with _index_lock:
+        index = _load_index()
+        key = cache_key(path, index)
+        if key in _loaded:
+            return _loaded[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # Different workbooks parse in parallel; threads wanting the same one wait for the first
+    with key_lock:
+        if key in _loaded:
+            return _loaded[key]
+        return _load_entry(path, key)
+
+def _load_entry(path, key):
+    with _index_lock:
+        entry = _load_index()['entries'].get(key)
+
+    entry_dir = CACHE_DIR / key
+    manifest_path = entry_dir / 'manifest.json'
+    parsed_size = None
+    if entry is None or not manifest_path.exists() or not _format_readable(entry):
+        parsed_size = _parse_workbook(path, entry_dir)
+
+    with _index_lock:
+        index = _load_index()
+        cache_key(path, index)  # keep the hash memo in the freshly loaded index
+        if parsed_size is not None:
+            index['entries'][key] = {'source': str(path), 'bytes': parsed_size,
+                                     'format': 'arrow' if pa is not None else 'json'}
+        entry = index['entries'].setdefault(key, {'source': str(path), 'bytes': 0,
+                                                   'format': 'arrow' if pa is not None else 'json'})
+        entry['last_used'] = time.time()
+        _evict(index, keep=key)
+        _save_index(index)
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    sheets = {s['name']: _read_sheet(entry_dir / s['file']) for s in manifest['sheets']}
+    previous = _loaded_keys.get(path)
+    if previous and previous != key:
+        _loaded.pop(previous, None)
+    _loaded[key] = sheets
+    _loaded_keys[path] = key
+    return sheets
+
+def _format_readable(entry):
+    return entry.get('format') == 'json' or pa is not None
+
+def sheet_names(path):
+    return list(load_sheets(path))
+
+def read_sheet(path, sheet_name):
+    """(header, rows) for one sheet, or None if the workbook has no such sheet"""
+    return load_sheets(path).get(sheet_name)
+
+def read_sheet_frames(path):
+    """{sheet_name: DataFrame} with the first row as columns (pd.read_excel(sheet_name=None) replacement)"""
+    import pandas as pd
+
+    frames = {}
+    for name, (header, rows) in load_sheets(path).items():
+        columns = [h if h is not None else f'Unnamed: {i}' for i, h in enumerate(header)]
+        rows = [row for row in rows if any(v is not None for v in row)]
+        frames[name] = pd.DataFrame(rows, columns=columns) if columns else pd.DataFrame()
+    return frames
+
+def clear():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    _loaded.clear()
+    _loaded_keys.clear()
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command == 'clear':
+        clear()
+        print(f"[+] Cleared {CACHE_DIR}")
+        return
+    index = _load_index()
+    total = sum(e['bytes'] for e in index['entries'].values())
+    print(f"[*] Parse cache: {CACHE_DIR}")
+    print(f"  Entries: {len(index['entries'])}, {total} bytes (limit {MAX_CACHE_BYTES})")
+    for key, entry in sorted(index['entries'].items(), key=lambda kv: -kv[1]['last_used']):
+        print(f"  {key}  {entry['format']:5}  {entry['bytes']:>9}  {entry['source']}")
+
+if __name__ == '__main__':
+    main()
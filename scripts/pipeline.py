@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Data Pipeline Orchestrator for Harshi-App
+Runs the data tools as a make-style DAG of stages instead of by hand:
+
+    create-sample ──> validate
+                 └──> validate-coverage
+    update-excel                     (only when content_update_v3.json exists)
+    convert ─┬──> markdown-ast ───┬──> precache
+             └──> render-handouts ┘
+    data-zip
+
+Every stage declares its command, inputs (files, directories or globs,
+relative to the repo root), outputs and the stages it runs after. A stage
+is skipped when the fingerprint of its inputs (content hashes) and command
+matches the last successful run and its outputs exist. Independent stages run
+in parallel (--jobs). A failed stage blocks the stages after it; everything
+else still runs. A timing report is printed at the end.
+
+File hashes are cached by size and mtime in .cache/pipeline-state.json, so
+unchanged inputs are not re-read. A stage's script and the repo modules it
+imports (directly or through other repo modules, e.g. schema_registry.py)
+are inputs too, so they need not be listed.
+
+Usage:
+    python scripts/pipeline.py [STAGE ...] [--force] [--jobs N] [--dry-run] [--list] [-v]
+"""
+
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+STATE_PATH = BASE_DIR / '.cache' / 'pipeline-state.json'
+STATE_VERSION = 1
+
+SCRIPTS_DIR = BASE_DIR / 'scripts'
+PYTHON = sys.executable
+SAMPLE_XLSX = 'public/StudyHub_Complete_Data.xlsx'
+DATA_XLSX = ['public/data/*.xlsx', 'public/data/subjects/*.xlsx', 'public/data/topics/*.xlsx']
+CONTENT_TREES = ['public/questionnaire', 'public/studyguide', 'public/Handout']
+DYNAMIC_IMPORTS = {'import_module', '_script_module'}  # calls that import a module named by a literal
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+class Stage:
+    def __init__(self, name, command, inputs, outputs=(), after=(), optional=False):
+        self.name = name
+        self.command = command
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.optional = optional  # missing inputs skip the stage instead of failing it
+
+STAGES = [
+    Stage('create-sample', [PYTHON, 'setup_data.py', 'create-sample', '-o', SAMPLE_XLSX],
+          inputs=[], outputs=[SAMPLE_XLSX]),
+    Stage('validate', [PYTHON, 'setup_data.py', 'validate', SAMPLE_XLSX],
+          inputs=[SAMPLE_XLSX], after=['create-sample']),
+    Stage('validate-coverage', [PYTHON, 'setup_data.py', 'validate-coverage', SAMPLE_XLSX],
+          inputs=[SAMPLE_XLSX], after=['create-sample']),
+    Stage('update-excel', [PYTHON, 'update_excel.py'],
+          inputs=['content_update_v3.json', 'StudyHub_Complete_Data.xlsx'],
+          outputs=['StudyHub_Complete_Data.xlsx'], optional=True),
+    Stage('convert', [PYTHON, 'scripts/convert_to_csv.py'],
+          inputs=DATA_XLSX, outputs=CONTENT_TREES),
+    Stage('render-handouts', [PYTHON, 'scripts/render_handouts.py'],
+          inputs=['public/data/subjects/*.xlsx'],
+          outputs=['public/data/handouts/index.json'], after=['convert']),
+    Stage('markdown-ast', [PYTHON, 'scripts/markdown_ast.py'],
+          inputs=['public/studyguide/**/content.csv'], after=['convert']),
+    Stage('precache', [PYTHON, 'scripts/build_precache.py'],
+          inputs=CONTENT_TREES + ['public/data/StudyHub_Master.xlsx', 'public/data/achievements.json',
+                                  'public/data/handouts'],
+          outputs=['public/precache-manifest.json'], after=['convert', 'markdown-ast', 'render-handouts']),
+    Stage('data-zip', [PYTHON, 'scripts/build_data_zip.py'],
+          inputs=DATA_XLSX + ['GOOGLE_SHEETS_SCHEMA.md'],
+          outputs=['public/data.zip', 'public/data.zip.json']),
+]
+
+def select_stages(stages, targets):
+    """The target stages plus everything they run after, in declaration order"""
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    for stage in stages:
+        for dep in stage.after:
+            if dep not in by_name:
+                raise ValueError(f"Stage '{stage.name}' runs after unknown stage '{dep}'")
+
+    wanted = set()
+    pending = list(targets or by_name)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(by_name[name].after)
+
+    # Cycle check (Kahn): every stage must become ready at some point
+    done = set()
+    while len(done) < len(wanted):
+        ready = [name for name in wanted - done if all(dep in done for dep in by_name[name].after)]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(sorted(wanted - done))}")
+        done.update(ready)
+    return [stage for stage in stages if stage.name in wanted]
+
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+
+class Fingerprints:
+    """Content hashes of input files, cached by (size, mtime_ns)"""
+
+    def __init__(self, cached=None):
+        self.files = dict(cached or {})
+        self.imports = {}  # script path -> repo modules it imports directly
+
+    def expand(self, pattern):
+        path = BASE_DIR / pattern
+        if any(ch in pattern for ch in '*?['):
+            matches = [Path(p) for p in glob.glob(str(path), recursive=True)]
+        elif path.is_dir():
+            matches = [p for p in path.rglob('*') if '__pycache__' not in p.parts]
+        else:
+            matches = [path]
+        return sorted(p for p in matches if p.is_file())
+
+    def file_hash(self, path):
+        rel = path.relative_to(BASE_DIR).as_posix()
+        stat = path.stat()
+        cached = self.files.get(rel)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.files[rel] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.files[rel][2]
+
+    def direct_imports(self, path):
+        if path not in self.imports:
+            try:
+                tree = ast.parse(path.read_bytes(), filename=str(path))
+            except (OSError, SyntaxError, ValueError):
+                tree = ast.Module(body=[], type_ignores=[])
+            names = set()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names.update(alias.name.split('.')[0] for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    names.add(node.module.split('.')[0])
+                elif isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant) \
+                        and getattr(node.func, 'attr', getattr(node.func, 'id', None)) in DYNAMIC_IMPORTS:
+                    names.add(str(node.args[0].value).split('.')[0])  # e.g. _script_module('content_db')
+            # Tools import each other from the repo root or scripts/ (sys.path)
+            self.imports[path] = {candidate for name in names for candidate in
+                                  (BASE_DIR / f'{name}.py', SCRIPTS_DIR / f'{name}.py') if candidate.is_file()}
+        return self.imports[path]
+
+    def modules(self, stage):
+        """The stage's script plus every repo module it imports, transitively"""
+        seen = set()
+        pending = [BASE_DIR / part for part in stage.command[1:2] if part.endswith('.py')]
+        pending = [path for path in pending if path.is_file()]
+        while pending:
+            path = pending.pop()
+            if path not in seen:
+                seen.add(path)
+                pending.extend(self.direct_imports(path))
+        return seen
+
+    def stage(self, stage):
+        """(fingerprint, missing input patterns) for a stage's inputs, imported modules and command"""
+        digest = hashlib.sha256(json.dumps(stage.command[1:]).encode('utf-8'))
+        missing = []
+        paths = set()
+        for pattern in stage.inputs:
+            matches = self.expand(pattern)
+            if not matches:
+                missing.append(pattern)
+            paths.update(matches)
+        paths |= self.modules(stage)
+        for path in sorted(paths):
+            digest.update(f"{path.relative_to(BASE_DIR).as_posix()}\0{self.file_hash(path)}\0".encode('utf-8'))
+        return digest.hexdigest(), missing
+
+def outputs_exist(stage):
+    return all((BASE_DIR / output).exists() for output in stage.outputs)
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'stages': {}, 'files': {}}
+
+def save_state(state, path=STATE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_stage(stage):
+    started = time.perf_counter()
+    env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+    result = subprocess.run(stage.command, cwd=BASE_DIR, env=env, capture_output=True, text=True,
+                            encoding='utf-8', errors='replace')
+    return result.returncode, result.stdout + result.stderr, time.perf_counter() - started
+
+def run_pipeline(targets=(), force=False, jobs=None, dry_run=False, verbose=False, stages=STAGES):
+    """Run the selected stages; returns {name: (status, seconds)}"""
+    selected = select_stages(stages, list(targets))
+    state = load_state()
+    prints = Fingerprints(state['files'])
+    report = {}  # name -> (status, seconds)
+    ok = {'ran', 'up to date', 'skipped'}
+
+    if dry_run:
+        print("[*] Dry run: stage status with the current inputs")
+        stale = set()
+        for stage in selected:
+            fingerprint, missing = prints.stage(stage)
+            upstream = [dep for dep in stage.after if dep in stale]
+            if upstream:
+                status = f"would run (after {', '.join(upstream)})"
+            elif missing:
+                status = 'skipped (missing inputs)' if stage.optional else f"missing: {', '.join(missing)}"
+            elif force or state['stages'].get(stage.name) != fingerprint or not outputs_exist(stage):
+                status = 'would run'
+            else:
+                status = 'up to date'
+            if status.startswith('would run'):
+                stale.add(stage.name)
+            print(f"  {stage.name:18} {status}")
+        return {}
+
+    print(f"[*] Running {len(selected)} stages ({jobs or os.cpu_count() or 1} jobs)...")
+    pending = {stage.name: stage for stage in selected}
+    running = {}  # future -> (stage, fingerprint)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if any(dep not in report for dep in stage.after):
+                    continue  # an upstream stage has not finished yet
+                del pending[name]
+                if any(report[dep][0] not in ok for dep in stage.after):
+                    report[name] = ('blocked', 0.0)
+                    print(f"  [WARN] {name}: blocked by a failed stage")
+                    continue
+
+                fingerprint, missing = prints.stage(stage)
+                if missing:
+                    if stage.optional:
+                        report[name] = ('skipped', 0.0)
+                        print(f"  [=] {name}: skipped (no {', '.join(missing)})")
+                    else:
+                        report[name] = ('missing', 0.0)
+                        print(f"  [ERROR] {name}: missing inputs {', '.join(missing)}")
+                    continue
+                if not force and state['stages'].get(name) == fingerprint and outputs_exist(stage):
+                    report[name] = ('up to date', 0.0)
+                    print(f"  [=] {name}: up to date")
+                    continue
+                running[pool.submit(run_stage, stage)] = (stage, fingerprint)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, fingerprint = running.pop(future)
+                returncode, output, seconds = future.result()
+                if returncode == 0:
+                    # Stages that rewrite their own inputs (update-excel) are fingerprinted after the run
+                    if set(stage.inputs) & set(stage.outputs):
+                        fingerprint, _ = prints.stage(stage)
+                    state['stages'][stage.name] = fingerprint
+                    report[stage.name] = ('ran', seconds)
+                    print(f"  [+] {stage.name}: done in {seconds:.2f}s")
+                    if verbose:
+                        print(_indent(output))
+                else:
+                    state['stages'].pop(stage.name, None)
+                    report[stage.name] = ('failed', seconds)
+                    print(f"  [ERROR] {stage.name}: exit code {returncode} after {seconds:.2f}s")
+                    print(_indent(output if verbose else _tail(output)))
+                state['files'] = prints.files
+                save_state(state)
+
+    print_report(report, [stage.name for stage in selected])
+    return report
+
+def _tail(text, lines=15):
+    return '\n'.join(text.rstrip().splitlines()[-lines:])
+
+def _indent(text):
+    return '\n'.join(f"      {line}" for line in text.rstrip().splitlines())
+
+def print_report(report, order):
+    print("\n" + "=" * 50)
+    print(f"{'STAGE':20} {'STATUS':12} {'TIME':>8}")
+    for name in order:
+        status, seconds = report.get(name, ('not run', 0.0))
+        print(f"{name:20} {status:12} {seconds:>7.2f}s")
+    print(f"{'total (stage time)':20} {'':12} {sum(s for _, s in report.values()):>7.2f}s")
+    print("=" * 50)
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the data tools as a dependency-tracked pipeline')
+    parser.add_argument('stages', nargs='*', help='Stages to run (default: all); their upstream stages are included')
+    parser.add_argument('--force', action='store_true', help='Run stages even when their inputs are unchanged')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Stages run in parallel (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='Show which stages are out of date without running them')
+    parser.add_argument('--list', action='store_true', help='List stages with their inputs and outputs')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show the output of every stage')
+    args = parser.parse_args()
+
+    if args.list:
+        prints = Fingerprints()
+        for stage in STAGES:
+            print(f"{stage.name}{' (after ' + ', '.join(stage.after) + ')' if stage.after else ''}")
+            print(f"    command: {' '.join(Path(part).name if part == PYTHON else part for part in stage.command)}")
+            if stage.inputs:
+                print(f"    inputs:  {', '.join(stage.inputs)}")
+            print(f"    modules: {', '.join(sorted(p.relative_to(BASE_DIR).as_posix() for p in prints.modules(stage)))}")
+            if stage.outputs:
+                print(f"    outputs: {', '.join(stage.outputs)}")
+        return 0
+
+    try:
+        report = run_pipeline(args.stages, force=args.force, jobs=args.jobs, dry_run=args.dry_run,
+                              verbose=args.verbose)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 2
+    return 1 if any(status in ('failed', 'blocked', 'missing') for status, _ in report.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
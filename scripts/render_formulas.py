@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Formula Pre-rendering Script for Harshi-App
+Renders every formula_text (Formulas sheet and 'formula' Study_Content rows)
+to a static SVG under public/formulas/, named by content hash so identical
+formulas are rendered once across topics and reused across runs.
+
+Requires matplotlib (mathtext). Without it, formulas are left for the
+MathFormula component to typeset in the browser.
+
+Usage:
+    python scripts/render_formulas.py
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+FORMULA_DIR = BASE_DIR / 'public' / 'formulas'
+
+# Path relative to PUBLIC_URL, as written into the converted CSV/JSON
+FORMULA_URL_PREFIX = 'formulas'
+
+# Anything that changes the rendered output must be part of the hash
+RENDERER_VERSION = 'mathtext-1'
+FORMULA_COLOR = '#FFFFFF'  # FormulaBlock draws on a dark slate background
+FORMULA_FONTSIZE = 20
+
+_mathtext_unavailable = False
+
+def formula_hash(formula_text):
+    """Content hash of a formula and the renderer settings"""
+    key = f"{RENDERER_VERSION}\n{FORMULA_COLOR}\n{FORMULA_FONTSIZE}\n{formula_text.strip()}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+def formula_svg_name(formula_text):
+    return f"{formula_hash(formula_text)}.svg"
+
+def formula_url(formula_text):
+    return f"{FORMULA_URL_PREFIX}/{formula_svg_name(formula_text)}"
+
+def _render_svg(formula_text, file_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    matplotlib.rcParams['svg.hashsalt'] = RENDERER_VERSION  # stable element ids
+    from matplotlib.figure import Figure
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.mathtext import MathTextParser
+
+    tex = f"${formula_text.strip()}$"
+    prop = FontProperties(size=FORMULA_FONTSIZE)
+    width, height, depth, _, _ = MathTextParser('path').parse(tex, dpi=72, prop=prop)
+
+    fig = Figure(figsize=(width / 72.0, height / 72.0))
+    fig.text(0, depth / height, tex, fontproperties=prop, color=FORMULA_COLOR)
+    fig.savefig(file_path, format='svg', transparent=True, metadata={'Date': None})
+
+def render_formula(formula_text, out_dir=FORMULA_DIR):
+    """
+    Render a formula to out_dir/<hash>.svg unless it already exists.
+    Returns the SVG path, or None when rendering is unavailable or fails.
+    """
+    global _mathtext_unavailable
+    if not formula_text or not formula_text.strip() or _mathtext_unavailable:
+        return None
+
+    file_path = out_dir / formula_svg_name(formula_text)
+    if file_path.exists():
+        return file_path
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_suffix('.svg.tmp')
+    try:
+        _render_svg(formula_text, tmp_path)
+        os.replace(tmp_path, file_path)
+        return file_path
+    except ImportError:
+        _mathtext_unavailable = True
+        print("  [WARN] matplotlib not installed; formulas will be typeset in the browser")
+    except Exception as e:
+        print(f"  [WARN] Could not render formula '{formula_text}': {e}")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    return None
+
+def rendered_formula_url(formula_text, out_dir=FORMULA_DIR):
+    """URL of the pre-rendered SVG for a formula, rendering it if needed ('' if unavailable)"""
+    return formula_url(formula_text) if render_formula(formula_text, out_dir) else ''
+
+def collect_formula_texts(subjects_dir):
+    """All distinct formula texts across subject workbooks, in first-seen order"""
+    from convert_to_csv import read_excel_sheet
+
+    texts = {}
+    for subject_file in sorted(subjects_dir.glob('*.xlsx')):
+        for formula in read_excel_sheet(subject_file, 'Formulas'):
+            texts.setdefault(formula.get('formula_text', ''), None)
+        for item in read_excel_sheet(subject_file, 'Study_Content'):
+            if item.get('content_type', '').lower() == 'formula':
+                texts.setdefault(item.get('content_text', ''), None)
+    return [text for text in texts if text.strip()]
+
+def main():
+    """Render all formulas referenced by the subject workbooks"""
+    from convert_to_csv import DATA_DIR
+
+    print("[*] Pre-rendering formulas...")
+    texts = collect_formula_texts(DATA_DIR / 'subjects')
+    existing = {p.name for p in FORMULA_DIR.glob('*.svg')} if FORMULA_DIR.exists() else set()
+
+    reused = sum(1 for text in texts if formula_svg_name(text) in existing)
+    rendered = sum(1 for text in texts if formula_svg_name(text) not in existing and render_formula(text))
+    failed = len(texts) - reused - rendered
+
+    print(f"\n[+] {len(texts)} unique formulas: {rendered} rendered, {reused} reused, {failed} not rendered")
+    print(f"[*] Output directory: {FORMULA_DIR}")
+
+if __name__ == '__main__':
+    main()
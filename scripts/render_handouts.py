@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Handout Pre-rendering Script for Harshi-App
+Renders every topic's handout (from the subject workbooks: handout content
+blocks per section, i.e. the HandoutInline list of HANDOUT_CONTENT_TYPES plus
+introduction/text, the vocabulary and the equations sheet) to a static,
+minified HTML fragment so the Handout tab is one cached fetch instead of
+filtering and rendering study content in the browser.
+
+Fragments are written to public/data/handouts/<topic_id>.<hash>.html, named
+by the hash of the HTML so they can be cached forever.
+public/data/handouts/index.json maps topic IDs to files and stores each
+topic's source fingerprint; topics whose inputs (and RENDERER_VERSION) are
+unchanged are not re-rendered. Unreferenced fragments are removed.
+
+Each entry also carries `data`, the data_hash of the inputs in the shape
+HandoutInline receives them. The client recomputes it from the data it
+loaded (handoutDataHash in src/services/handoutFragments.js) and only shows
+the fragment when the two match.
+
+Classes are the HandoutInline ones with dark: variants, so the fragment
+follows dark mode inside a `.dark` wrapper (tailwind.config.js scans the
+fragments). Formulas use the pre-rendered SVGs from render_formulas.py when
+matplotlib is available.
+
+Usage:
+    python scripts/render_handouts.py [--force]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from convert_to_csv import DATA_DIR, read_excel_sheet, to_int
+from render_formulas import rendered_formula_url
+from schema_registry import HANDOUT_CONTENT_TYPES
+
+BASE_DIR = Path(__file__).parent.parent
+
+OUTPUT_DIR = DATA_DIR / 'handouts'
+INDEX_PATH = OUTPUT_DIR / 'index.json'
+
+# Anything that changes the rendered markup must bump this
+RENDERER_VERSION = 'handout-2'
+HASH_LENGTH = 12
+
+# HandoutInline also shows introduction/text blocks alongside the handout types
+INLINE_CONTENT_TYPES = HANDOUT_CONTENT_TYPES + ['introduction', 'text']
+
+CARD_CLASSES = {
+    'warning': 'bg-red-50 border-red-200 dark:bg-red-900/20 dark:border-red-800',
+    'concept_helper': 'bg-blue-50 border-blue-200 dark:bg-blue-900/20 dark:border-blue-800',
+    'real_world': 'bg-emerald-50 border-emerald-200 dark:bg-emerald-900/20 dark:border-emerald-800',
+    'formula': 'bg-slate-900 border-slate-800 dark:bg-slate-800 dark:border-slate-700',
+}
+CARD_DEFAULT = 'bg-slate-50 border-slate-200 dark:bg-slate-800 dark:border-slate-700'
+TEXT_CLASSES = {
+    'warning': 'text-red-800 dark:text-red-200',
+    'concept_helper': 'text-blue-800 dark:text-blue-200',
+    'real_world': 'text-emerald-800 dark:text-emerald-200',
+}
+TEXT_DEFAULT = 'text-slate-700 dark:text-slate-300'
+HEADING = 'flex items-center gap-2 text-lg font-bold pb-2 border-b text-slate-900 border-slate-200 dark:text-white dark:border-slate-700'
+PANEL = 'rounded-xl p-6 border bg-slate-50 border-slate-200 dark:bg-slate-800 dark:border-slate-700'
+
+
+# ============================================================================
+# MARKUP
+# ============================================================================
+
+_INLINE_RULES = [
+    (re.compile(r'`([^`]+)`'), r'<code>\1</code>'),
+    (re.compile(r'\*\*(.+?)\*\*'), r'<strong>\1</strong>'),
+    (re.compile(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])'), r'<em>\1</em>'),
+]
+
+def _squash(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+def render_markdown(text):
+    """Inline markdown subset (`code`, **bold**, *italic*, line breaks) on escaped text"""
+    lines = []
+    for line in str(text).strip().splitlines():
+        line = html.escape(_squash(line), quote=False)
+        for pattern, replacement in _INLINE_RULES:
+            line = pattern.sub(replacement, line)
+        if line:
+            lines.append(line)
+    return '<br>'.join(lines)
+
+def _attr(value):
+    return html.escape(str(value), quote=True)
+
+def _tag(name, classes, body, **attrs):
+    extra = ''.join(f' {key}="{_attr(value)}"' for key, value in attrs.items())
+    return f'<{name} class="{classes}"{extra}>{body}</{name}>'
+
+def render_formula(formula, size_class):
+    url = rendered_formula_url(formula)
+    if url:
+        return f'<img src="{_attr(url)}" alt="{_attr(formula)}" class="inline-block {size_class}">'
+    return _tag('span', f'font-mono {size_class}', html.escape(formula, quote=False))
+
+def render_item(item):
+    kind = item['type']
+    body = ''
+    if item['title']:
+        title_color = 'text-blue-300' if kind == 'formula' else 'text-slate-800 dark:text-slate-300'
+        body += _tag('div', f'font-bold text-sm mb-1 {title_color}', html.escape(item['title'], quote=False))
+    if kind == 'formula':
+        body += _tag('div', 'py-2 flex justify-center text-white', render_formula(item['text'], 'max-h-16'))
+    else:
+        body += _tag('div', f"text-sm leading-relaxed {TEXT_CLASSES.get(kind, TEXT_DEFAULT)}", render_markdown(item['text']))
+    if kind in ('flowchart', 'image') and item['image_url']:
+        image = f'<img src="{_attr(item["image_url"])}" alt="{_attr(item["title"])}" class="w-full h-auto max-h-60 object-contain mx-auto">'
+        body += _tag('div', 'mt-3 border rounded-lg overflow-hidden border-slate-200 bg-white dark:border-slate-600 dark:bg-slate-700', image)
+    return _tag('div', f"p-4 rounded-xl border {CARD_CLASSES.get(kind, CARD_DEFAULT)}", body, **{'data-type': kind})
+
+def render_topic(topic):
+    """Fragment for one topic: key concepts column plus vocabulary/equations sidebar"""
+    blocks = []
+    for section in topic['sections']:
+        if section['items']:
+            blocks.append(_tag('div', 'mb-6',
+                               _tag('h4', 'font-bold mb-3 text-slate-800 dark:text-slate-300',
+                                    html.escape(section['title'], quote=False))
+                               + _tag('div', 'space-y-4', ''.join(render_item(item) for item in section['items']))))
+    if not blocks:
+        blocks.append(_tag('div', 'text-center py-8 rounded-xl border bg-white border-slate-200 text-slate-500 '
+                                  'dark:bg-slate-800 dark:border-slate-700 dark:text-slate-400',
+                           '<p>No key concepts available yet.</p>'))
+    main = _tag('div', 'lg:col-span-2 space-y-8',
+                _tag('section', 'space-y-6', _tag('h3', HEADING, 'Key Concepts') + ''.join(blocks)))
+
+    sidebar = ''
+    if topic['terms']:
+        terms = ''.join(f'<div>{_tag("div", "font-bold text-slate-800 dark:text-white", html.escape(t["term"], quote=False))}'
+                        f'{_tag("div", "text-sm text-slate-600 dark:text-slate-400", render_markdown(t["definition"]))}</div>'
+                        for t in topic['terms'])
+        sidebar += _tag('section', PANEL, _tag('h3', HEADING.replace('pb-2', 'mb-4 pb-2'), 'Vocabulary')
+                        + _tag('div', 'space-y-4', terms))
+    if topic['formulas']:
+        formulas = ''.join(_tag('div', 'text-center',
+                                _tag('div', 'text-xs mb-1 text-slate-400', html.escape(f['label'], quote=False))
+                                + _tag('div', 'rounded p-2 bg-white/10 dark:bg-slate-700', render_formula(f['formula'], 'max-h-12')))
+                           for f in topic['formulas'])
+        sidebar += _tag('section', 'rounded-xl p-6 border bg-slate-900 border-slate-800 text-white dark:bg-slate-800 dark:border-slate-700',
+                        _tag('h3', 'text-lg font-bold mb-4 pb-2 border-b text-white border-slate-700', 'Equations')
+                        + _tag('div', 'space-y-4', formulas))
+    return _tag('div', 'grid grid-cols-1 lg:grid-cols-3 gap-8', main + _tag('div', 'space-y-6', sidebar),
+                **{'data-topic': topic['topic_id']})
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def _ordered(rows):
+    return sorted(rows, key=lambda row: to_int(row.get('order_index'), 0))
+
+def collect_topics(subjects_dir):
+    """topic_id -> handout inputs, in the shape HandoutInline receives them"""
+    topics = {}
+    for subject_file in sorted(subjects_dir.glob('*.xlsx')):
+        content_by_section = {}
+        for row in _ordered(read_excel_sheet(subject_file, 'Study_Content')):
+            content_type = row.get('content_type') or 'text'
+            if row.get('section_id') and content_type in INLINE_CONTENT_TYPES:
+                content_by_section.setdefault(row['section_id'], []).append({
+                    'type': content_type, 'title': row.get('content_title', ''),
+                    'text': row.get('content_text', ''), 'image_url': row.get('image_url', '')})
+
+        def topic(topic_id):
+            return topics.setdefault(topic_id, {'topic_id': topic_id, 'sections': [], 'terms': [], 'formulas': []})
+
+        for row in _ordered(read_excel_sheet(subject_file, 'Topic_Sections')):
+            if row.get('topic_id'):
+                topic(row['topic_id'])['sections'].append({
+                    'title': row.get('section_title', ''), 'items': content_by_section.get(row.get('section_id'), [])})
+        for row in read_excel_sheet(subject_file, 'Key_Terms'):
+            if row.get('topic_id'):
+                topic(row['topic_id'])['terms'].append({'term': row.get('term', ''), 'definition': row.get('definition', '')})
+        for row in read_excel_sheet(subject_file, 'Formulas'):
+            if row.get('topic_id'):
+                topic(row['topic_id'])['formulas'].append({'label': row.get('formula_label', ''),
+                                                            'formula': row.get('formula_text', '')})
+    return topics
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def fingerprint(value):
+    data = json.dumps([RENDERER_VERSION, value], sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def data_hash(topic):
+    """
+    FNV-1a (32-bit, hex) of the compact JSON of a topic's handout inputs as
+    HandoutInline sees them; must match handoutDataHash in handoutFragments.js
+    """
+    value = [[[section['title'], [[item['type'], item['title'], item['text'],
+                                   item['image_url'] if item['type'] in ('flowchart', 'image') else '']
+                                  for item in section['items']]]
+              for section in topic['sections']],
+             [[term['term'], term['definition']] for term in topic['terms']],
+             [[formula['label'], formula['formula']] for formula in topic['formulas']]]
+    digest = 0x811c9dc5
+    for byte in json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'):
+        digest = ((digest ^ byte) * 0x01000193) & 0xffffffff
+    return f'{digest:08x}'
+
+def load_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('renderer') == RENDERER_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'renderer': RENDERER_VERSION, 'topics': {}}
+
+def _write_fragment(out_dir, prefix, markup):
+    data = markup.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"{prefix}.{digest[:HASH_LENGTH]}.html"
+    path = out_dir / name
+    if not path.exists():
+        tmp_path = path.with_name(name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return {'file': name, 'sha256': digest, 'bytes': len(data)}
+
+def build_group(sources, previous, out_dir, prefix, render, describe, force):
+    """Render changed sources (describe(source) adds fields to the entry); returns (entries, rendered, skipped)"""
+    entries, rendered, skipped = {}, 0, 0
+    for topic_id, source in sorted(sources.items()):
+        source_hash = fingerprint(source)
+        entry = previous.get(topic_id)
+        if not force and entry and entry.get('source') == source_hash and (out_dir / entry['file']).exists():
+            entries[topic_id] = entry
+            skipped += 1
+            continue
+        entry = _write_fragment(out_dir, prefix.format(topic_id=topic_id), render(topic_id, source))
+        entries[topic_id] = dict(entry, source=source_hash, **describe(source))
+        rendered += 1
+    return entries, rendered, skipped
+
+def build_handouts(subjects_dir=DATA_DIR / 'subjects', out_dir=OUTPUT_DIR, force=False):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / 'index.json'
+    previous = load_index(index_path)
+    start = time.perf_counter()
+
+    topics, topic_rendered, topic_skipped = build_group(
+        collect_topics(Path(subjects_dir)), previous.get('topics', {}), out_dir, '{topic_id}',
+        lambda topic_id, topic: render_topic(topic), lambda topic: {'data': data_hash(topic)}, force)
+
+    index = {'renderer': RENDERER_VERSION, 'topics': topics}
+    tmp_path = index_path.with_name('index.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, index_path)
+
+    referenced = {entry['file'] for entry in topics.values()}
+    removed = 0
+    for path in out_dir.glob('*.html'):
+        if path.name not in referenced:
+            path.unlink()
+            removed += 1
+
+    total_bytes = sum(entry['bytes'] for entry in topics.values())
+    print(f"  {len(topics)} topic handouts ({topic_rendered} rendered, {topic_skipped} unchanged), "
+          f"{removed} stale removed, {total_bytes} bytes in {time.perf_counter() - start:.2f}s")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-render topic handouts to static HTML fragments')
+    parser.add_argument('--force', action='store_true', help='Re-render every topic')
+    parser.add_argument('-o', '--output-dir', default=str(OUTPUT_DIR), help='Fragment directory')
+    args = parser.parse_args()
+
+    print("[*] Pre-rendering handouts...")
+    build_handouts(out_dir=args.output_dir, force=args.force)
+    print(f"  [+] Index: {Path(args.output_dir) / 'index.json'}")
+
+if __name__ == '__main__':
+    main()
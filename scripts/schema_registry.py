@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Schema Registry for Harshi-App
+Versioned column schemas for the workbook sheets and the public CSV outputs,
+plus compiled row validators shared by every data tool.
+
+Each version is the previous one plus a list of changes (SCHEMA_CHANGES),
+so files written by older tools can still be checked against the version
+they were written with. A schema lists:
+
+    columns      canonical columns, in the order writers emit them
+    required     columns that must be present and non-empty
+    aliases      alternate header -> canonical column (accepted on read)
+    extra        other known columns accepted on read
+    rules        column -> ('int',) or ('choice', values, message)
+
+compile_validator() generates Python source for one (schema, version,
+header) and execs it: column positions, rule values and messages are baked
+into straight-line code, so checking a row does no rule or dict lookups.
+Validators are cached per header.
+
+Usage:
+    python scripts/schema_registry.py [--version N]            # print the registry
+    python scripts/schema_registry.py --benchmark 500000       # validator throughput
+"""
+
+import argparse
+import copy
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+CONTENT_TYPES = ['introduction', 'formula', 'concept_helper', 'warning', 'real_world', 'text', 'video', 'image', 'flowchart']
+HANDOUT_CONTENT_TYPES = ['formula', 'concept_helper', 'warning', 'real_world', 'flowchart', 'image']
+SECTION_TYPES = ['objectives', 'intro', 'content', 'applications', 'quiz']
+VALID_ICONS = ['Zap', 'Calculator', 'FlaskConical', 'Leaf', 'Trophy', 'Star', 'Award', 'Flame',
+               'HelpCircle', 'CheckCircle2', 'Target', 'BookOpen', 'FileText', 'Clock', 'Globe',
+               'Lightbulb', 'AlertTriangle', 'Atom', 'Microscope', 'Dna', 'Pi', 'Hammer', 'RefreshCw',
+               'Minimize2', 'Triangle', 'Disc', 'Grid', 'ArrowDown', 'Link', 'GitCommit', 'Circle',
+               'GitBranch', 'Share2']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+QUESTION_TYPES = ['mcq', 'true_false', 'fill_blank', 'matching']
+
+# Content types the study guide renders (ContentArea.jsx) and the handout renderer accepts
+STUDYGUIDE_CONTENT_TYPES = CONTENT_TYPES + ['key_term', 'misconception', 'tip', 'application']
+HANDOUT_CSV_CONTENT_TYPES = HANDOUT_CONTENT_TYPES + ['text', 'mermaid']
+
+INTEGER = ('int',)
+
+def choice(values, message="Invalid {column} '{value}'. Valid: {values}"):
+    return ('choice', tuple(values), message)
+
+ICON_RULE = choice(VALID_ICONS, "Unknown icon '{value}'")
+
+# Rules applied to a column wherever it appears, unless a schema overrides them
+DEFAULT_RULES = {
+    'order_index': INTEGER,
+    'duration_minutes': INTEGER,
+    'xp_reward': INTEGER,
+    'icon': ICON_RULE,
+    'section_icon': ICON_RULE,
+    'section_type': choice(SECTION_TYPES),
+    'content_type': choice(CONTENT_TYPES),
+    'difficulty': choice(DIFFICULTIES),
+    'question_type': choice(QUESTION_TYPES),
+}
+
+
+# ============================================================================
+# SCHEMAS
+# ============================================================================
+
+# Version 1: the workbook sheets as originally defined in setup_data.py
+SHEETS_V1 = {
+    'Subjects': {
+        'columns': ['subject_id', 'subject_key', 'name', 'icon', 'color_hex', 'light_bg', 'gradient_from', 'gradient_to', 'dark_glow'],
+        'required': ['subject_id', 'subject_key', 'name'],
+        'description': 'Define subjects with their visual styling'
+    },
+    'Topics': {
+        'columns': ['topic_id', 'subject_key', 'topic_name', 'duration_minutes', 'order_index'],
+        'required': ['topic_id', 'subject_key', 'topic_name'],
+        'description': 'List all topics per subject'
+    },
+    'Topic_Sections': {
+        'columns': ['section_id', 'topic_id', 'section_title', 'section_icon', 'order_index', 'section_type'],
+        'required': ['section_id', 'topic_id', 'section_title'],
+        'description': 'Define sections/chapters within each topic'
+    },
+    'Learning_Objectives': {
+        'columns': ['objective_id', 'topic_id', 'objective_text', 'order_index'],
+        'required': ['objective_id', 'topic_id', 'objective_text'],
+        'description': 'Learning objectives for each topic'
+    },
+    'Key_Terms': {
+        'columns': ['term_id', 'topic_id', 'term', 'definition'],
+        'required': ['term_id', 'topic_id', 'term', 'definition'],
+        'description': 'Vocabulary terms and definitions'
+    },
+    'Study_Content': {
+        'columns': ['content_id', 'section_id', 'content_type', 'content_title', 'content_text', 'order_index', 'image_url', 'video_url'],
+        'required': ['content_id', 'section_id', 'content_type', 'content_text'],
+        'description': 'Main educational content blocks'
+    },
+    'Formulas': {
+        'columns': ['formula_id', 'topic_id', 'formula_text', 'formula_label',
+                   'variable_1_symbol', 'variable_1_name', 'variable_1_unit',
+                   'variable_2_symbol', 'variable_2_name', 'variable_2_unit',
+                   'variable_3_symbol', 'variable_3_name', 'variable_3_unit'],
+        'required': ['formula_id', 'topic_id', 'formula_text'],
+        'description': 'Mathematical/scientific formulas'
+    },
+    'Quiz_Questions': {
+        'columns': ['question_id', 'topic_id', 'question_text', 'option_a', 'option_b', 'option_c', 'option_d',
+                   'correct_answer', 'explanation', 'xp_reward'],
+        'required': ['question_id', 'topic_id', 'question_text', 'option_a', 'option_b', 'correct_answer'],
+        'description': 'Multiple choice quiz questions'
+    },
+    'Achievements': {
+        'columns': ['achievement_id', 'icon', 'name', 'description', 'unlock_condition'],
+        'required': ['achievement_id', 'name', 'description'],
+        'description': 'Gamification badges and achievements'
+    }
+}
+
+# Version 2: the CSV outputs under public/ (the names the frontend reads)
+CSV_SCHEMAS_V2 = {
+    'questionnaire/questions.csv': {
+        'columns': ['question_id', 'topic_id', 'question_type', 'question_text', 'option_a', 'option_b',
+                    'option_c', 'option_d', 'correct_answer', 'explanation', 'difficulty', 'hint',
+                    'xp_reward', 'image_url'],
+        'required': ['question_id', 'question_text'],
+        'aliases': {'id': 'question_id', 'question': 'question_text', 'type': 'question_type',
+                    'answer': 'correct_answer'},
+        'extra': ['options', 'accepted_answers'],
+        'description': 'Quiz questions per topic folder'
+    },
+    'studyguide/content.csv': {
+        'columns': ['content_id', 'topic_id', 'section_id', 'content_type', 'title', 'content', 'url',
+                    'svg_url', 'order_index'],
+        'required': ['content_id', 'content_type'],
+        'aliases': {'content_title': 'title', 'content_text': 'content'},
+        'extra': ['explanation', 'common_misconception', 'correction'],
+        'rules': {'content_type': choice(STUDYGUIDE_CONTENT_TYPES)},
+        'description': 'Study guide content blocks per topic folder'
+    },
+    'studyguide/sections.csv': {
+        'columns': ['section_id', 'topic_id', 'section_title', 'section_icon', 'section_type', 'order_index'],
+        'required': ['section_id', 'section_title'],
+        'description': 'Study guide sections per topic folder'
+    },
+    'studyguide/quiz.csv': {
+        'columns': ['id', 'subtopic_id', 'type', 'question', 'options', 'answer', 'explanation', 'hint'],
+        'required': ['id', 'question'],
+        'rules': {'type': choice(QUESTION_TYPES)},
+        'description': 'Study guide practice questions'
+    },
+    'studyguide/misconceptions.csv': {
+        'columns': ['id', 'subtopic_id', 'title', 'explanation', 'wrong_example', 'correct_example'],
+        'required': ['id', 'title'],
+        'description': 'Common mistakes per topic folder'
+    },
+    'Handout/handout.csv': {
+        'columns': ['content_id', 'content_type', 'title', 'content', 'order_index'],
+        'required': ['content_id', 'content_type'],
+        'rules': {'content_type': choice(HANDOUT_CSV_CONTENT_TYPES)},
+        'description': 'Printable handout blocks per topic folder'
+    },
+    'master-index.csv': {
+        'columns': ['subject_key', 'subject_name', 'topic_id', 'topic_name', 'topic_folder'],
+        'required': ['subject_key', 'topic_id', 'topic_folder'],
+        'description': 'Topic folder index of each CSV tree'
+    },
+}
+
+# version -> changes applied on top of the previous version
+SCHEMA_CHANGES = {
+    2: {
+        # Columns the tools already write (update_excel.py, csv_to_excel.py, subject workbooks)
+        'add_columns': {
+            'Topics': ['file_name'],
+            'Quiz_Questions': ['question_type', 'difficulty', 'hint', 'image_url'],
+        },
+        # Written by calibrate_questions.py, never emitted by the converters
+        'add_extra': {'Quiz_Questions': ['irt_difficulty', 'irt_discrimination']},
+        'add_schemas': {name: dict(schema, kind='csv') for name, schema in CSV_SCHEMAS_V2.items()},
+    },
+}
+
+def _build_versions():
+    versions = {1: {name: dict(schema, kind='sheet') for name, schema in SHEETS_V1.items()}}
+    for version in sorted(SCHEMA_CHANGES):
+        schemas = copy.deepcopy(versions[version - 1])
+        changes = SCHEMA_CHANGES[version]
+        for name, columns in changes.get('add_columns', {}).items():
+            schemas[name]['columns'] = schemas[name]['columns'] + [c for c in columns if c not in schemas[name]['columns']]
+        for name, columns in changes.get('add_extra', {}).items():
+            schemas[name]['extra'] = schemas[name].get('extra', []) + columns
+        schemas.update(copy.deepcopy(changes.get('add_schemas', {})))
+        versions[version] = schemas
+    return versions
+
+VERSIONS = _build_versions()
+CURRENT_VERSION = max(VERSIONS)
+
+def get_schemas(version=CURRENT_VERSION, kind=None):
+    """name -> schema for one version, optionally only 'sheet' or 'csv' schemas"""
+    if version not in VERSIONS:
+        raise KeyError(f"unknown schema version {version} (known: {sorted(VERSIONS)})")
+    return {name: schema for name, schema in VERSIONS[version].items() if kind is None or schema['kind'] == kind}
+
+def get_schema(name, version=CURRENT_VERSION):
+    return get_schemas(version)[name]
+
+def sheet_schemas(version=CURRENT_VERSION):
+    """Workbook sheet schemas in the SHEET_SCHEMAS layout ({sheet: {columns, required, description}})"""
+    return {name: {'columns': list(schema['columns']), 'required': list(schema['required']),
+                   'description': schema['description']}
+            for name, schema in get_schemas(version, 'sheet').items()}
+
+SHEET_SCHEMAS = sheet_schemas()
+
+def csv_columns(name, version=CURRENT_VERSION):
+    """Canonical columns writers emit for a CSV schema"""
+    return list(get_schema(name, version)['columns'])
+
+def csv_schema_name(path, version=CURRENT_VERSION):
+    """Schema name for a CSV path under public/ ('<tree>/<file>' or the file name), or None"""
+    path = Path(path)
+    name = 'master-index.csv' if path.name in ('master-index.csv', '_master_index.csv') else path.name
+    schemas = get_schemas(version, 'csv')
+    for tree in path.parts[-5:-1]:
+        if f'{tree}/{name}' in schemas:
+            return f'{tree}/{name}'
+    return name if name in schemas else None
+
+def normalize_header(header):
+    """Header cells -> snake_case names (same rule as parse_csv_rows / validate_excel)"""
+    return [h.strip().lower().replace(' ', '_') if isinstance(h, str) else '' for h in header]
+
+
+# ============================================================================
+# COMPILED VALIDATORS
+# ============================================================================
+
+INTEGER_PATTERN = re.compile(r'\s*-?\d+(?:\.0*)?\s*')
+
+def _is_int(value):
+    if isinstance(value, int):
+        return True
+    if isinstance(value, float):
+        return value.is_integer()
+    return INTEGER_PATTERN.fullmatch(str(value)) is not None
+
+class Validator:
+    """
+    Compiled checks for one (schema, version, header).
+    header_issues: [(severity, message)] for the header itself.
+    validate(rows, start=2) -> [(severity, row_number, message)] for positional rows.
+    """
+
+    def __init__(self, name, version, header_issues, validate, source):
+        self.name = name
+        self.version = version
+        self.header_issues = header_issues
+        self.validate = validate
+        self.source = source
+
+def _header_issues(schema, header):
+    aliases = schema.get('aliases', {})
+    known = set(schema['columns']) | set(aliases) | set(schema.get('extra', []))
+    present = {aliases.get(column, column) for column in header}
+    issues = [('error', f"Missing required column '{column}'") for column in schema['required'] if column not in present]
+    issues += [('warning', f"Unknown column '{column}'") for column in header if column and column not in known]
+    return issues
+
+def _generate_source(schema, header):
+    """Python source for validate(rows, start) specialised to this header"""
+    aliases = schema.get('aliases', {})
+    rules = dict(DEFAULT_RULES, **schema.get('rules', {}))
+    required = set(schema['required'])
+    constants = {}
+    lines = [
+        'def validate(rows, start=2):',
+        '    issues = []',
+        '    add = issues.append',
+        '    for row_num, row in enumerate(rows, start):',
+        '        if not any(row):',
+        '            continue',
+        '        n = len(row)',
+    ]
+    if schema['kind'] == 'csv':
+        # csv.reader rows longer than the header mean an unquoted delimiter
+        lines += [
+            f'        if n > {len(header)}:',
+            f"            add(('error', row_num, f'{{n - {len(header)}}} extra field(s); is a comma unquoted?'))",
+        ]
+
+    seen = set()
+    for index, raw in enumerate(header):
+        column = aliases.get(raw, raw)
+        rule = rules.get(column)
+        if not column or column in seen or (column not in required and rule is None):
+            continue
+        seen.add(column)
+
+        lines.append(f'        v = row[{index}] if n > {index} else None')
+        if column in required:
+            lines += ["        if v is None or v == '':",
+                      f"            add(('error', row_num, 'Missing {column}'))"]
+            check = 'elif'
+        else:
+            check = "if v is not None and v != '' and"
+
+        if rule is None:
+            continue
+        if rule[0] == 'int':
+            lines += [f'        {check} not _is_int(v):',
+                      f"            add(('warning', row_num, '{column}: expected an integer, got ' + repr(v)))"]
+        elif rule[0] == 'choice':
+            constants[f'C{index}'] = frozenset(rule[1])
+            constants[f'M{index}'] = rule[2]
+            constants[f'V{index}'] = list(rule[1])
+            lines += [f'        {check} v not in C{index}:',
+                      f"            add(('warning', row_num, M{index}.format(column={column!r}, value=v, values=V{index})))"]
+    lines.append('    return issues')
+    return '\n'.join(lines) + '\n', constants
+
+@lru_cache(maxsize=256)
+def _compile(name, version, header):
+    schema = get_schema(name, version)
+    source, constants = _generate_source(schema, list(header))
+    namespace = dict(constants, _is_int=_is_int)
+    exec(compile(source, f'<validator {name} v{version}>', 'exec'), namespace)
+    return Validator(name, version, _header_issues(schema, list(header)), namespace['validate'], source)
+
+def compile_validator(name, header, version=CURRENT_VERSION):
+    """Validator for rows laid out as `header` (raw header cells are normalized)"""
+    return _compile(name, version, tuple(normalize_header(header)))
+
+def validate_rows(name, header, rows, version=CURRENT_VERSION, start=2):
+    """[(severity, row_number or None, message)] for a header and its positional rows"""
+    validator = compile_validator(name, header, version)
+    return [(severity, None, message) for severity, message in validator.header_issues] + validator.validate(rows, start)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def print_registry(version):
+    print(f"Schema registry, version {version} (current: {CURRENT_VERSION})")
+    for name, schema in get_schemas(version).items():
+        print(f"\n[{schema['kind']}] {name}: {schema['description']}")
+        print(f"   Columns: {', '.join(schema['columns'])}")
+        print(f"   Required: {', '.join(schema['required'])}")
+        if schema.get('aliases'):
+            print(f"   Aliases: {', '.join(f'{a} -> {c}' for a, c in schema['aliases'].items())}")
+        if schema.get('extra'):
+            print(f"   Extra: {', '.join(schema['extra'])}")
+
+def benchmark(rows_count):
+    header = get_schema('questionnaire/questions.csv')['columns']
+    row = ['quiz-phys-t1-1', 'phys-t1', 'mcq', 'Question?', 'A', 'B', 'C', 'D', 'B', 'Because.', 'medium', '', '10', '']
+    rows = [row] * rows_count
+    validator = compile_validator('questionnaire/questions.csv', header)
+    start = time.perf_counter()
+    issues = validator.validate(rows)
+    elapsed = time.perf_counter() - start
+    print(f"[*] {rows_count} rows in {elapsed:.3f}s ({rows_count / elapsed:,.0f} rows/s, {len(issues)} issues)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the schema registry or benchmark its validators')
+    parser.add_argument('--version', type=int, default=CURRENT_VERSION, help='Schema version')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Time a compiled validator over ROWS rows')
+    parser.add_argument('--source', metavar='SCHEMA', help='Print the generated validator for a schema')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    elif args.source:
+        print(compile_validator(args.source, get_schema(args.source, args.version)['columns'], args.version).source)
+    else:
+        print_registry(args.version)
+
+if __name__ == '__main__':
+    sys.exit(main())
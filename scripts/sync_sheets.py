@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Google Sheets Sync Script for Harshi-App
+Pulls the configured Google Sheet tabs into the local data tree so the app
+can serve static snapshots instead of calling Sheets from every browser.
+
+- CSV snapshots:   public/data/sheets/<Sheet>.csv
+- Workbooks:       public/data/StudyHub_Master.xlsx, public/data/subjects/<subject>.xlsx
+                   (only the synced sheets are replaced; every other sheet is kept)
+- Conversion:      only the convert_to_csv steps fed by changed sheets are re-run
+
+Sheets are fetched over a pooled keep-alive connection with bounded
+concurrency. Requests are conditional (If-None-Match) and each sheet's body
+is hashed, so unchanged sheets are skipped even when the server ignores ETags.
+Optional tabs (OPTIONAL_SHEETS) that the spreadsheet lacks are skipped; any
+other failed or empty sheet aborts the sync before anything is written.
+
+Usage:
+    python scripts/sync_sheets.py --sheet-id SHEET_ID [--convert]
+    python scripts/sync_sheets.py serve-mock public/StudyHub_Complete_Data.xlsx --port 8765
+    python scripts/sync_sheets.py --sheet-id test --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import csv
+import hashlib
+import http.client
+import io
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+from openpyxl import Workbook, load_workbook
+
+import asset_manifest
+import convert_to_csv
+import parse_cache
+from convert_to_csv import BASE_DIR, DATA_DIR, read_excel_sheet
+
+SNAPSHOT_DIR = DATA_DIR / 'sheets'
+STATE_FILE = BASE_DIR / '.cache' / 'sheets_sync.json'
+
+DEFAULT_BASE_URL = 'https://docs.google.com'
+EXPORT_PATH = '/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}'
+
+# Tab names from GOOGLE_SHEETS_CONFIG.SHEETS in src/config.js
+DEFAULT_SHEETS = ['Subjects', 'Topics', 'Topic_Sections', 'Learning_Objectives', 'Key_Terms',
+                  'Study_Content', 'Formulas', 'Quiz_Questions', 'Achievements', 'App_Settings',
+                  'Daily_Challenges']
+
+# Tabs not every spreadsheet has (e.g. StudyHub_Data_Template.xlsx); skipped when missing or empty
+OPTIONAL_SHEETS = {'App_Settings', 'Daily_Challenges'}
+
+# Sheets stored in StudyHub_Master.xlsx; everything else is split into subject workbooks
+MASTER_SHEETS = ['Subjects', 'Topics', 'Achievements', 'App_Settings', 'Daily_Challenges']
+
+# Which convert_to_csv step each sheet feeds
+QUIZ_SHEETS = {'Quiz_Questions'}
+STUDY_SHEETS = {'Study_Content', 'Formulas', 'Key_Terms', 'Topic_Sections'}
+INDEX_SHEETS = {'Subjects', 'Topics'}
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+class ConnectionPool:
+    """Bounded pool of keep-alive connections to a single host"""
+
+    def __init__(self, base_url, size, timeout=30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout)
+
+    def request(self, path, headers):
+        """GET path, retrying once on a stale keep-alive connection"""
+        for attempt in range(2):
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    self._idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return response.status, dict(response.getheaders()), body
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+def parse_csv_rows(text):
+    """CSV text -> list of dicts with snake_case headers (same rule as GoogleSheetsService)"""
+    reader = csv.reader(io.StringIO(text))
+    try:
+        headers = [h.strip().lower().replace(' ', '_') for h in next(reader)]
+    except StopIteration:
+        return []
+    rows = []
+    for values in reader:
+        row = {h: v.strip() for h, v in zip(headers, values) if h}
+        if any(row.values()):
+            rows.append(row)
+    return rows
+
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+def load_state(state_path):
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_state(state_path, state):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def fetch_sheets(sheet_id, sheets, base_url, state, workers):
+    """
+    Fetch sheets concurrently. Returns ({sheet: csv_text} for sheets whose
+    content changed, [required sheets that failed or came back empty]); `state` is
+    updated in place with new ETags and hashes.
+    """
+    pool = ConnectionPool(base_url, size=workers)
+    lock = threading.Lock()
+    changed = {}
+    failed = []
+
+    def fetch(sheet):
+        previous = state.get(sheet, {})
+        headers = {'Accept': 'text/csv'}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+
+        try:
+            status, response_headers, body = pool.request(
+                EXPORT_PATH.format(sheet_id=quote(sheet_id), sheet=quote(sheet)), headers)
+        except (OSError, http.client.HTTPException) as e:
+            with lock:
+                failed.append(sheet)
+            return f"  [ERROR] {sheet}: {e}"
+
+        if status == 304:
+            return f"  [=] {sheet}: not modified"
+        empty = status == 200 and not parse_csv_rows(body.decode('utf-8-sig', errors='replace'))
+        if sheet in OPTIONAL_SHEETS and (empty or status in (400, 404)):
+            return f"  [=] {sheet}: not in the spreadsheet, skipped"
+        if status != 200 or empty:
+            with lock:
+                failed.append(sheet)
+            return f"  [ERROR] {sheet}: HTTP {status}" if status != 200 else f"  [ERROR] {sheet}: empty sheet"
+
+        digest = hashlib.sha256(body).hexdigest()
+        etag = {k.lower(): v for k, v in response_headers.items()}.get('etag', '')
+        with lock:
+            state[sheet] = {'etag': etag, 'sha256': digest}
+            if previous.get('sha256') == digest:
+                return f"  [=] {sheet}: unchanged"
+            changed[sheet] = body.decode('utf-8-sig')
+        return f"  [+] {sheet}: updated ({len(body)} bytes)"
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for message in executor.map(fetch, sheets):
+                print(message)
+    finally:
+        pool.close()
+    return changed, sorted(failed)
+
+def write_snapshot(sheet, text):
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = SNAPSHOT_DIR / f'{sheet}.csv'
+    tmp_path = path.with_suffix('.csv.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def load_snapshots(sheets):
+    data = {}
+    for sheet in sheets:
+        path = SNAPSHOT_DIR / f'{sheet}.csv'
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data[sheet] = parse_csv_rows(f.read())
+    return data
+
+def _label(path):
+    return path.relative_to(BASE_DIR) if path.is_relative_to(BASE_DIR) else path
+
+def _replace_sheets(path, sheets):
+    """
+    Replace (or add) the given sheets of a workbook, keeping every other sheet
+    and the sheet order as they are. A sheet without rows keeps its old header.
+    """
+    if path.exists():
+        wb = load_workbook(path)
+    else:
+        wb = Workbook()
+        wb.remove(wb.active)
+    for sheet_name, rows in sheets.items():
+        columns = list(rows[0].keys()) if rows else []
+        if sheet_name in wb.sheetnames:
+            old = wb[sheet_name]
+            if not columns:
+                columns = [c for c in next(old.iter_rows(max_row=1, values_only=True), ()) if c is not None]
+            index = wb.sheetnames.index(sheet_name)
+            wb.remove(old)
+            ws = wb.create_sheet(sheet_name, index)
+        else:
+            ws = wb.create_sheet(sheet_name)
+        ws.append(columns)
+        for row in rows:
+            ws.append([row.get(c, '') for c in columns])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+    print(f"  [+] Updated {', '.join(sheets)} in {_label(path)}")
+
+def _workbook_rows(path, sheet_name):
+    """Rows of a sheet in an existing workbook ([] when the workbook or sheet is missing)"""
+    if path.exists() and sheet_name in parse_cache.sheet_names(path):
+        return read_excel_sheet(path, sheet_name)
+    return []
+
+def write_workbooks(data, changed):
+    """
+    Write the synced sheets into the master and subject workbooks. `data`
+    holds only the sheets synced in this run; other sheets are left alone.
+    """
+    master_path = DATA_DIR / 'StudyHub_Master.xlsx'
+    if any(sheet in changed for sheet in MASTER_SHEETS):
+        _replace_sheets(master_path, {s: data[s] for s in MASTER_SHEETS if s in data})
+
+    subject_sheets = [s for s in data if s not in MASTER_SHEETS]
+    if not subject_sheets or not ('Topics' in changed or any(s in changed for s in subject_sheets)):
+        return
+
+    subjects_dir = DATA_DIR / 'subjects'
+    existing = sorted(subjects_dir.glob('*.xlsx')) if subjects_dir.exists() else []
+
+    # Topic and section ownership: from this sync when synced, else from the current workbooks
+    topics = data['Topics'] if 'Topics' in data else _workbook_rows(master_path, 'Topics')
+    topic_subject = {t.get('topic_id'): t.get('subject_key') for t in topics}
+    sections = data.get('Topic_Sections') or [row for path in existing
+                                              for row in _workbook_rows(path, 'Topic_Sections')]
+    section_topic = {s.get('section_id'): s.get('topic_id') for s in sections}
+
+    by_subject = {path.stem: {s: [] for s in subject_sheets} for path in existing}
+    unassigned = 0
+    for sheet in subject_sheets:
+        for row in data[sheet]:
+            topic_id = row.get('topic_id') or section_topic.get(row.get('section_id'))
+            subject_key = topic_subject.get(topic_id)
+            if not subject_key:
+                unassigned += 1
+                continue
+            by_subject.setdefault(subject_key, {s: [] for s in subject_sheets})[sheet].append(row)
+    if unassigned:
+        print(f"  [WARN] {unassigned} row(s) whose topic is not in Topics were not written")
+
+    for subject_key, sheets in sorted(by_subject.items()):
+        _replace_sheets(subjects_dir / f'{subject_key}.xlsx', sheets)
+
+def run_conversion(changed):
+    """Run only the convert_to_csv steps fed by changed sheets"""
+    if not changed:
+        print("\n[*] No sheet changed; skipping conversion")
+        return
+    if INDEX_SHEETS & changed:
+        convert_to_csv.create_master_indices(*convert_to_csv.get_subject_topic_mapping())
+    if QUIZ_SHEETS & changed or 'Topics' in changed:
+        convert_to_csv.convert_quiz_questions()
+    if STUDY_SHEETS & changed or 'Topics' in changed:
+        convert_to_csv.convert_study_content()
+    asset_manifest.refresh(BASE_DIR / 'public')
+
+def sync(sheet_id, sheets=DEFAULT_SHEETS, base_url=DEFAULT_BASE_URL, workers=4, convert=False,
+         state_path=STATE_FILE):
+    """
+    Sync sheets into the local tree; returns the set of sheets that changed.
+    Raises RuntimeError, before anything is written, if any required sheet
+    failed to fetch or came back empty; missing optional tabs are skipped.
+    """
+    print(f"[*] Syncing {len(sheets)} sheets from {base_url} ({workers} concurrent)...")
+    state = load_state(state_path)
+    changed_text, failed = fetch_sheets(sheet_id, sheets, base_url, state, workers)
+    if failed:
+        raise RuntimeError(f"Sync aborted, no files written: {len(failed)} sheet(s) failed or empty "
+                           f"({', '.join(failed)})")
+
+    for sheet, text in changed_text.items():
+        write_snapshot(sheet, text)
+    changed = set(changed_text)
+
+    if changed:
+        write_workbooks(load_snapshots(sheets), changed)
+    save_state(state_path, state)
+
+    if convert:
+        run_conversion(changed)
+    print(f"\n[+] Sync complete: {len(changed)} changed, {len(sheets) - len(changed)} unchanged")
+    return changed
+
+
+# ============================================================================
+# MOCK SHEETS SERVER
+# ============================================================================
+
+def _sheet_csv(rows):
+    buffer = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def make_mock_handler(workbook_path):
+    """Request handler serving a local workbook in the Sheets CSV-export format"""
+    cache = {}
+
+    def sheet_body(sheet):
+        stamp = workbook_path.stat().st_mtime_ns
+        if sheet not in cache or cache[sheet][0] != stamp:
+            body = _sheet_csv(read_excel_sheet(workbook_path, sheet))
+            cache[sheet] = (stamp, body, '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+        return cache[sheet][1], cache[sheet][2]
+
+    class MockSheetsHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real endpoint
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            sheet = parse_qs(parts.query).get('sheet', [''])[0]
+            if not parts.path.endswith('/gviz/tq') or not sheet:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            body, etag = sheet_body(sheet)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv; charset=utf-8')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockSheetsHandler
+
+def serve_mock(workbook_path, host='127.0.0.1', port=8765):
+    server = ThreadingHTTPServer((host, port), make_mock_handler(Path(workbook_path)))
+    print(f"[*] Mock Sheets server on http://{host}:{server.server_port} serving {workbook_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve-mock':
+        parser = argparse.ArgumentParser(description='Serve a workbook as a mock Google Sheets CSV endpoint')
+        parser.add_argument('workbook', help='Workbook whose sheets are served')
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        args = parser.parse_args(sys.argv[2:])
+        serve_mock(args.workbook, args.host, args.port)
+        return
+
+    parser = argparse.ArgumentParser(description='Sync Google Sheets into the local data tree')
+    parser.add_argument('--sheet-id', default=os.environ.get('REACT_APP_SHEET_ID'),
+                        help='Google Sheet ID (default: $REACT_APP_SHEET_ID)')
+    parser.add_argument('--sheets', nargs='+', default=DEFAULT_SHEETS, help='Sheet tabs to sync')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='Sheets host (e.g. the mock server)')
+    parser.add_argument('--workers', type=int, default=4, help='Maximum concurrent requests')
+    parser.add_argument('--convert', action='store_true', help='Re-run CSV conversion for changed sheets')
+    args = parser.parse_args()
+
+    if not args.sheet_id or args.sheet_id == 'YOUR_SHEET_ID_HERE':
+        print("Error: Please provide --sheet-id or set REACT_APP_SHEET_ID")
+        sys.exit(1)
+
+    try:
+        sync(args.sheet_id, args.sheets, args.base_url, args.workers, args.convert)
+    except RuntimeError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
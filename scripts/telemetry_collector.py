@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Client Telemetry Collector for Harshi-App
+Small asyncio HTTP server that receives batched Logger events from the
+frontend (src/services/Logger.js, enabled with REACT_APP_TELEMETRY_URL) and
+reports load-time distributions per gate/action.
+
+- POST /events   {"session": "...", "events": [{"ts", "level", "name", "durationMs"}]}
+- GET  /summary  ?window=<minutes> (default 60): count, errors, p50/p95/p99 per event name
+- GET  /health
+
+Events are appended to a columnar log under logs/telemetry/ (one binary file
+per column plus append-only dictionaries for names and sessions), which is
+replayed on start. Latency is an event's durationMs; events without one are
+counted but not timed. Percentiles come from per-minute histograms with
+log-spaced buckets (BUCKET_GROWTH relative resolution) kept for
+RETAIN_MINUTES, so memory stays bounded however many events arrive.
+
+Usage:
+    python scripts/telemetry_collector.py [--host 127.0.0.1] [--port 8787] [--log-dir logs/telemetry]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import re
+import time
+from array import array
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+BASE_DIR = Path(__file__).parent.parent
+DEFAULT_LOG_DIR = BASE_DIR / 'logs' / 'telemetry'
+
+LEVELS = ['INFO', 'WARN', 'ERROR', 'ACTION', 'GATE']
+BUCKET_GROWTH = 1.05
+RETAIN_MINUTES = 24 * 60
+DEFAULT_WINDOW_MINUTES = 60
+MAX_BODY_BYTES = 1024 * 1024
+
+# Column -> array typecode, stored as <column>.col
+COLUMNS = {
+    'ts': 'd',        # event time, epoch seconds
+    'level': 'B',     # index into LEVELS
+    'name': 'I',      # index into names.txt
+    'latency': 'd',   # milliseconds, NaN when unknown
+    'session': 'I',   # index into sessions.txt
+    'failed': 'B',    # 1 for ERROR events and failed gates
+}
+
+_GATE_RESULT = re.compile(r': (PASSED|FAILED)$')
+
+
+# ============================================================================
+# COLUMNAR LOG
+# ============================================================================
+
+class ColumnarLog:
+    """Append-only event log stored column by column"""
+
+    def __init__(self, log_dir):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.names = self._load_dictionary('names.txt')
+        self.sessions = self._load_dictionary('sessions.txt')
+        self._name_ids = {name: i for i, name in enumerate(self.names)}
+        self._session_ids = {session: i for i, session in enumerate(self.sessions)}
+
+    def _load_dictionary(self, file_name):
+        path = self.log_dir / file_name
+        if not path.exists():
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _intern(self, value, values, ids, file_name):
+        if value not in ids:
+            ids[value] = len(values)
+            values.append(value)
+            with open(self.log_dir / file_name, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(value) + '\n')
+        return ids[value]
+
+    def append(self, rows):
+        """rows: [(ts, level, name, latency, failed, session)]"""
+        columns = {column: array(typecode) for column, typecode in COLUMNS.items()}
+        for ts, level, name, latency, failed, session in rows:
+            columns['ts'].append(ts)
+            columns['level'].append(LEVELS.index(level))
+            columns['name'].append(self._intern(name, self.names, self._name_ids, 'names.txt'))
+            columns['latency'].append(math.nan if latency is None else latency)
+            columns['session'].append(self._intern(session, self.sessions, self._session_ids, 'sessions.txt'))
+            columns['failed'].append(1 if failed else 0)
+        for column, values in columns.items():
+            with open(self.log_dir / f'{column}.col', 'ab') as f:
+                values.tofile(f)
+
+    def read(self, since=0.0):
+        """Yield (ts, level, name, latency, failed) rows with ts >= since"""
+        columns = {}
+        for column, typecode in COLUMNS.items():
+            values = array(typecode)
+            path = self.log_dir / f'{column}.col'
+            if path.exists():
+                data = path.read_bytes()
+                values.frombytes(data[:len(data) - len(data) % values.itemsize])
+            columns[column] = values
+        rows = min(len(values) for values in columns.values())  # ignore a torn tail
+        for i in range(rows):
+            if columns['ts'][i] >= since:
+                latency = columns['latency'][i]
+                yield (columns['ts'][i], LEVELS[columns['level'][i]], self.names[columns['name'][i]],
+                       None if math.isnan(latency) else latency, bool(columns['failed'][i]))
+
+
+# ============================================================================
+# HISTOGRAMS
+# ============================================================================
+
+def bucket_index(latency_ms):
+    return 0 if latency_ms <= 1 else math.ceil(math.log(latency_ms) / math.log(BUCKET_GROWTH))
+
+def bucket_value(index):
+    return BUCKET_GROWTH ** index
+
+class RollingHistograms:
+    """Per-name, per-minute latency histograms over the last RETAIN_MINUTES"""
+
+    def __init__(self):
+        self.minutes = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))  # name -> minute -> bucket -> n
+        self.counts = defaultdict(lambda: defaultdict(int))                         # name -> minute -> events
+        self.errors = defaultdict(lambda: defaultdict(int))                         # name -> minute -> errors
+
+    def add(self, ts, level, name, latency, failed):
+        minute = int(ts // 60)
+        self.counts[name][minute] += 1
+        if failed:
+            self.errors[name][minute] += 1
+        if latency is not None and latency >= 0:
+            self.minutes[name][minute][bucket_index(latency)] += 1
+
+    def prune(self, now):
+        oldest = int(now // 60) - RETAIN_MINUTES
+        for table in (self.minutes, self.counts, self.errors):
+            for name in list(table):
+                for minute in [m for m in table[name] if m < oldest]:
+                    del table[name][minute]
+                if not table[name]:
+                    del table[name]
+
+    def summary(self, window_minutes, now):
+        first = int(now // 60) - window_minutes + 1
+        result = {}
+        for name in sorted(self.counts):
+            count = sum(n for minute, n in self.counts[name].items() if minute >= first)
+            if not count:
+                continue
+            merged = defaultdict(int)
+            for minute, buckets in self.minutes.get(name, {}).items():
+                if minute >= first:
+                    for index, n in buckets.items():
+                        merged[index] += n
+            entry = {'count': count,
+                     'errors': sum(n for minute, n in self.errors.get(name, {}).items() if minute >= first),
+                     'timed': sum(merged.values())}
+            entry.update(percentiles(merged, (50, 95, 99)))
+            result[name] = entry
+        return result
+
+def percentiles(buckets, points):
+    total = sum(buckets.values())
+    if not total:
+        return {f'p{p}': None for p in points}
+    result = {}
+    ordered = sorted(buckets.items())
+    for p in points:
+        rank = math.ceil(total * p / 100)
+        seen = 0
+        for index, n in ordered:
+            seen += n
+            if seen >= rank:
+                result[f'p{p}'] = round(bucket_value(index), 1)
+                break
+    return result
+
+
+# ============================================================================
+# COLLECTOR
+# ============================================================================
+
+def _event_time(value, received):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not math.isfinite(value):
+            return received
+        return value / 1000 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return received
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    return None
+
+def normalize_events(payload, received):
+    """
+    Batch payload -> [(ts, level, name, latency, failed, session)]; unknown
+    levels are dropped. Raises ValueError when the payload is not a batch
+    object (or a bare list) of event objects.
+    """
+    if isinstance(payload, list):
+        payload = {'events': payload}
+    if not isinstance(payload, dict):
+        raise ValueError('payload must be an object or a list of events')
+    events = payload.get('events') or []
+    if not isinstance(events, list) or not all(isinstance(event, dict) for event in events):
+        raise ValueError('events must be a list of objects')
+    session = str(payload.get('session') or 'anonymous')[:64]
+    rows = []
+    for event in events:
+        level = str(event.get('level', '')).upper()
+        if level not in LEVELS:
+            continue
+        name = str(event.get('name') or event.get('message') or '')[:200]
+        failed = level == 'ERROR'
+        if level == 'GATE':
+            failed = name.endswith(': FAILED')
+            name = _GATE_RESULT.sub('', name)
+        latency = _number(event.get('durationMs'))
+        rows.append((_event_time(event.get('ts'), received), level, f'{level} {name}', latency, failed, session))
+    return rows
+
+class Collector:
+    def __init__(self, log_dir):
+        self.log = ColumnarLog(log_dir)
+        self.histograms = RollingHistograms()
+        now = time.time()
+        replayed = 0
+        for row in self.log.read(since=now - RETAIN_MINUTES * 60):
+            self.histograms.add(*row)
+            replayed += 1
+        self.replayed = replayed
+
+    def ingest(self, payload):
+        rows = normalize_events(payload, time.time())
+        if rows:
+            self.log.append(rows)
+            for ts, level, name, latency, failed, _ in rows:
+                self.histograms.add(ts, level, name, latency, failed)
+        return len(rows)
+
+    def summary(self, window_minutes):
+        now = time.time()
+        self.histograms.prune(now)
+        return {'window_minutes': window_minutes, 'generated_at': now,
+                'events': self.histograms.summary(window_minutes, now)}
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+async def _respond(writer, status, body=None):
+    reason = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large'}[status]
+    data = b'' if body is None else json.dumps(body).encode('utf-8')
+    headers = dict(CORS_HEADERS, **{'Content-Length': str(len(data)), 'Connection': 'close'})
+    if body is not None:
+        headers['Content-Type'] = 'application/json'
+    head = f'HTTP/1.1 {status} {reason}\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers.items()) + '\r\n'
+    writer.write(head.encode('latin-1') + data)
+    await writer.drain()
+
+def make_handler(collector):
+    async def handle(reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            if len(request_line) < 2:
+                return
+            method, target = request_line[0], request_line[1]
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1')
+                if line in ('\r\n', '\n', ''):
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            url = urlsplit(target)
+            if method == 'OPTIONS':
+                await _respond(writer, 204)
+            elif method == 'POST' and url.path == '/events':
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(writer, 400, {'error': 'invalid Content-Length'})
+                    return
+                if length > MAX_BODY_BYTES:
+                    await _respond(writer, 413, {'error': 'batch too large'})
+                    return
+                try:
+                    payload = json.loads(await reader.readexactly(length) or b'{}')
+                except (ValueError, asyncio.IncompleteReadError):
+                    await _respond(writer, 400, {'error': 'invalid JSON'})
+                    return
+                try:
+                    accepted = collector.ingest(payload)
+                except ValueError as e:
+                    await _respond(writer, 400, {'error': str(e)})
+                    return
+                await _respond(writer, 200, {'accepted': accepted})
+            elif method == 'GET' and url.path == '/summary':
+                query = parse_qs(url.query)
+                try:
+                    window = max(1, min(RETAIN_MINUTES, int(query.get('window', [DEFAULT_WINDOW_MINUTES])[0])))
+                except ValueError:
+                    window = DEFAULT_WINDOW_MINUTES
+                await _respond(writer, 200, collector.summary(window))
+            elif method == 'GET' and url.path == '/health':
+                await _respond(writer, 200, {'status': 'ok'})
+            else:
+                await _respond(writer, 404, {'error': 'not found'})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+async def serve(host, port, log_dir):
+    collector = Collector(log_dir)
+    server = await asyncio.start_server(make_handler(collector), host, port)
+    bound_port = server.sockets[0].getsockname()[1]
+    print(f"[*] Telemetry collector on http://{host}:{bound_port} (log: {log_dir}, "
+          f"{collector.replayed} events replayed)")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect frontend Logger telemetry and report latency percentiles')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--log-dir', default=str(DEFAULT_LOG_DIR), help='Columnar log directory')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.log_dir))
+    except KeyboardInterrupt:
+        print("\n[*] Collector stopped")
+
+if __name__ == '__main__':
+    main()
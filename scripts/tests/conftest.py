@@ -0,0 +1,21 @@
+"""Shared fixtures for the data-tool tests (run with: python -m pytest scripts/tests)"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import parse_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_parse_cache(tmp_path, monkeypatch):
+    """Keep every test's parsed workbooks out of the shared .cache/parse"""
+    monkeypatch.setattr(parse_cache, 'CACHE_DIR', tmp_path / 'parse-cache')
+    parse_cache._loaded.clear()
+    parse_cache._loaded_keys.clear()
+    yield
+    parse_cache._loaded.clear()
+    parse_cache._loaded_keys.clear()
@@ -0,0 +1,102 @@
+"""generate_content against the stub model server: retries, coalescing, cache and output shape"""
+
+import asyncio
+import json
+import random
+import sys
+
+import pytest
+
+import generate_content
+
+TOPICS = [
+    {'topic_id': 'phys-t1', 'subject': 'Physics', 'topic_name': 'Motion'},
+    {'topic_id': 'phys-t2', 'subject': 'Physics', 'topic_name': 'Forces'},
+    # Same subject and name as phys-t1: its prompts must not be sent again
+    {'topic_id': 'phys-t1-copy', 'subject': 'Physics', 'topic_name': 'Motion'},
+    {'topic_id': 'chem-t1', 'subject': 'Chemistry', 'topic_name': 'Atoms'},
+]
+UNIQUE_PROMPTS = 6  # (3 distinct topics) x (lesson + quiz)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(generate_content, 'BACKOFF_BASE', 0.001)
+    random.seed(7)
+
+
+async def generate_with_stub(cache_dir, fail_rate, questions=3):
+    """Run one generation against a stub on port 0; returns (updates, errors, generator stats, stub counts)"""
+    counts = {'requests': 0, 'failed': 0}
+    server = await asyncio.start_server(generate_content.make_stub_handler(fail_rate, 0, counts), '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        generator = generate_content.Generator(f'http://127.0.0.1:{port}', 'test-model', 'test-key',
+                                               concurrency=3, cache_dir=cache_dir, max_attempts=10)
+        updates, errors = await generate_content.generate_updates(TOPICS, generator, questions)
+    finally:
+        server.close()
+        await server.wait_closed()
+    return updates, errors, generator.stats, counts
+
+
+def test_retries_and_coalescing(tmp_path):
+    updates, errors, stats, counts = asyncio.run(generate_with_stub(tmp_path / 'cache', fail_rate=0.4))
+
+    assert errors == []
+    assert [u['topicId'] for u in updates] == [t['topic_id'] for t in TOPICS]
+    assert counts['failed'] > 0
+    assert stats['retries'] == counts['failed']
+    assert stats['prompts'] == UNIQUE_PROMPTS
+    assert stats['coalesced'] == 2
+    # Every prompt succeeded exactly once on the server
+    assert counts['requests'] - counts['failed'] == UNIQUE_PROMPTS
+    assert stats['requests'] == counts['requests']
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    first, _, _, _ = asyncio.run(generate_with_stub(tmp_path / 'cache', fail_rate=0.2))
+    second, errors, stats, counts = asyncio.run(generate_with_stub(tmp_path / 'cache', fail_rate=0.2))
+
+    assert errors == []
+    assert counts['requests'] == 0
+    assert stats['requests'] == 0
+    assert stats['cache_hits'] == UNIQUE_PROMPTS
+    assert second == first
+
+
+def test_exhausted_retries_are_reported(tmp_path):
+    updates, errors, stats, counts = asyncio.run(generate_with_stub(tmp_path / 'cache', fail_rate=1.0))
+
+    assert updates == []
+    assert len(errors) == len(TOPICS)
+    assert stats['failed'] == UNIQUE_PROMPTS
+    assert counts['requests'] == UNIQUE_PROMPTS * 10
+
+
+def test_output_matches_update_excel(tmp_path, monkeypatch):
+    pd = pytest.importorskip('pandas')
+    updates, _, _, _ = asyncio.run(generate_with_stub(tmp_path / 'cache', fail_rate=0.0, questions=4))
+    generate_content.write_updates(updates, tmp_path / 'content_update_v3.json')
+
+    with open(tmp_path / 'content_update_v3.json', 'r', encoding='utf-8') as f:
+        written = json.load(f)
+    for entry in written:
+        assert set(entry) == {'topicId', 'sections', 'content', 'questions'}
+        section_ids = {s['id'] for s in entry['sections']}
+        assert all(set(s) == {'id', 'title', 'icon', 'type', 'order'} for s in entry['sections'])
+        assert all(item['sectionId'] in section_ids for item in entry['content'])
+        assert all(len(q['options']) == 4 and q['correctAnswer'] in 'ABCD' for q in entry['questions'])
+
+    # update_excel.py reads content_update_v3.json from the working directory
+    monkeypatch.syspath_prepend(str(generate_content.BASE_DIR))
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop('update_excel', None)
+    import update_excel
+    update_excel.update_excel()
+
+    sheets = pd.read_excel(tmp_path / 'StudyHub_Complete_Data.xlsx', sheet_name=None)
+    assert len(sheets['Quiz_Questions']) == len(TOPICS) * 4
+    assert len(sheets['Topic_Sections']) == len(TOPICS) * len(generate_content.SECTION_TYPES)
+    assert len(sheets['Study_Content']) == sum(len(entry['content']) for entry in written)
+    assert set(sheets['Quiz_Questions']['correct_answer']) <= set('ABCD')
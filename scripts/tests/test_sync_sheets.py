@@ -0,0 +1,139 @@
+"""sync_sheets against the mock Sheets server: full, partial and aborted syncs"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import sync_sheets
+
+SPREADSHEET = {
+    'Subjects': [('subject_id', 'subject_key', 'name'), (1, 'physics', 'Physics'), (2, 'math', 'Math')],
+    'Topics': [('topic_id', 'subject_key', 'topic_name'),
+               ('phy-1', 'physics', 'Motion'), ('mat-1', 'math', 'Algebra')],
+    'Achievements': [('achievement_id', 'name', 'unlock_condition'), ('first', 'First', 'quizzes >= 1')],
+    'Topic_Sections': [('section_id', 'topic_id', 'section_title'),
+                       ('phy-1-s1', 'phy-1', 'Intro'), ('mat-1-s1', 'mat-1', 'Intro')],
+    'Learning_Objectives': [('objective_id', 'topic_id', 'objective_text'), ('o1', 'phy-1', 'Define speed')],
+    'Key_Terms': [('term_id', 'topic_id', 'term'), ('t1', 'mat-1', 'Variable')],
+    'Formulas': [('formula_id', 'topic_id', 'formula_text'), ('f1', 'phy-1', 'v = d / t')],
+    'Study_Content': [('content_id', 'section_id', 'content_text'),
+                      ('c1', 'phy-1-s1', 'Velocity is...'), ('c2', 'mat-1-s1', 'A variable is...')],
+    'Quiz_Questions': [('question_id', 'topic_id', 'question_text'),
+                       ('q1', 'phy-1', 'What is speed?'), ('q2', 'mat-1', 'Solve x + 1 = 2')],
+}
+REQUIRED = [s for s in sync_sheets.DEFAULT_SHEETS if s not in sync_sheets.OPTIONAL_SHEETS]
+
+
+def save_workbook(path, sheets):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+
+
+def sheet_rows(path, name):
+    return [row for row in load_workbook(path, read_only=True)[name].iter_rows(values_only=True)]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data = tmp_path / 'data'
+    monkeypatch.setattr(sync_sheets, 'DATA_DIR', data)
+    monkeypatch.setattr(sync_sheets, 'SNAPSHOT_DIR', data / 'sheets')
+    return data
+
+
+@pytest.fixture
+def spreadsheet(tmp_path):
+    """The mock server's workbook (without the optional App_Settings/Daily_Challenges tabs)"""
+    path = tmp_path / 'spreadsheet.xlsx'
+    save_workbook(path, SPREADSHEET)
+    return path
+
+
+@pytest.fixture
+def mock_server(spreadsheet):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), sync_sheets.make_mock_handler(spreadsheet))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def run_sync(base_url, tmp_path, sheets=sync_sheets.DEFAULT_SHEETS):
+    return sync_sheets.sync('test-sheet', sheets, base_url=base_url, workers=2,
+                            state_path=tmp_path / 'state.json')
+
+
+def test_full_sync_skips_missing_optional_tabs(mock_server, data_dir, tmp_path):
+    changed = run_sync(mock_server, tmp_path)
+
+    assert changed == set(REQUIRED)
+    master = load_workbook(data_dir / 'StudyHub_Master.xlsx', read_only=True)
+    assert master.sheetnames == ['Subjects', 'Topics', 'Achievements']
+    assert sheet_rows(data_dir / 'StudyHub_Master.xlsx', 'Topics') == SPREADSHEET['Topics']
+
+    assert sorted(p.name for p in (data_dir / 'subjects').glob('*.xlsx')) == ['math.xlsx', 'physics.xlsx']
+    physics = data_dir / 'subjects' / 'physics.xlsx'
+    assert sheet_rows(physics, 'Quiz_Questions') == [SPREADSHEET['Quiz_Questions'][0], ('q1', 'phy-1', 'What is speed?')]
+    assert sheet_rows(physics, 'Study_Content') == [SPREADSHEET['Study_Content'][0], ('c1', 'phy-1-s1', 'Velocity is...')]
+
+    # Nothing changed on the server: the second run re-validates with ETags and writes nothing
+    stamp = physics.stat().st_mtime_ns
+    assert run_sync(mock_server, tmp_path) == set()
+    assert physics.stat().st_mtime_ns == stamp
+
+
+def test_partial_sync_keeps_other_sheets(mock_server, spreadsheet, data_dir, tmp_path):
+    run_sync(mock_server, tmp_path)
+    master_path = data_dir / 'StudyHub_Master.xlsx'
+    math_path = data_dir / 'subjects' / 'math.xlsx'
+    physics_path = data_dir / 'subjects' / 'physics.xlsx'
+    master_sheets = load_workbook(master_path, read_only=True).sheetnames
+    physics_sheets = load_workbook(physics_path, read_only=True).sheetnames
+
+    edited = dict(SPREADSHEET)
+    edited['Subjects'] = SPREADSHEET['Subjects'][:2] + [(2, 'math', 'Mathematics')]
+    edited['Quiz_Questions'] = SPREADSHEET['Quiz_Questions'] + [('q3', 'phy-1', 'What is acceleration?')]
+    save_workbook(spreadsheet, edited)
+
+    changed = run_sync(mock_server, tmp_path, ['Subjects', 'Topics', 'Quiz_Questions'])
+
+    assert changed == {'Subjects', 'Quiz_Questions'}
+    assert sheet_rows(master_path, 'Subjects')[-1] == ('2', 'math', 'Mathematics')
+    assert load_workbook(master_path, read_only=True).sheetnames == master_sheets
+    assert sheet_rows(master_path, 'Achievements') == SPREADSHEET['Achievements']
+    assert load_workbook(physics_path, read_only=True).sheetnames == physics_sheets
+    assert sheet_rows(physics_path, 'Quiz_Questions')[1:] == [('q1', 'phy-1', 'What is speed?'),
+                                                             ('q3', 'phy-1', 'What is acceleration?')]
+    assert sheet_rows(physics_path, 'Study_Content')[1:] == [('c1', 'phy-1-s1', 'Velocity is...')]
+    assert sheet_rows(math_path, 'Quiz_Questions')[1:] == [('q2', 'mat-1', 'Solve x + 1 = 2')]
+
+
+def test_partial_sync_of_subject_sheet_uses_existing_topics(mock_server, spreadsheet, data_dir, tmp_path):
+    run_sync(mock_server, tmp_path)
+    physics_path = data_dir / 'subjects' / 'physics.xlsx'
+
+    edited = dict(SPREADSHEET)
+    edited['Study_Content'] = SPREADSHEET['Study_Content'] + [('c3', 'phy-1-s1', 'Acceleration is...')]
+    save_workbook(spreadsheet, edited)
+
+    assert run_sync(mock_server, tmp_path, ['Study_Content']) == {'Study_Content'}
+    assert [row[0] for row in sheet_rows(physics_path, 'Study_Content')[1:]] == ['c1', 'c3']
+    assert sheet_rows(physics_path, 'Quiz_Questions')[1:] == [('q1', 'phy-1', 'What is speed?')]
+
+
+def test_missing_required_sheet_aborts_without_writing(mock_server, spreadsheet, data_dir, tmp_path):
+    save_workbook(spreadsheet, {k: v for k, v in SPREADSHEET.items() if k != 'Quiz_Questions'})
+
+    with pytest.raises(RuntimeError, match='Quiz_Questions'):
+        run_sync(mock_server, tmp_path)
+
+    assert not data_dir.exists()
+    assert not (tmp_path / 'state.json').exists()
@@ -0,0 +1,63 @@
+"""xlsx_reader: calamine and openpyxl return the same normalized sheets"""
+
+import datetime
+
+import pytest
+from openpyxl import Workbook
+
+import xlsx_reader
+
+pytestmark = pytest.mark.skipif(xlsx_reader.CalamineWorkbook is None,
+                                reason='python-calamine is not installed')
+
+
+@pytest.fixture
+def mixed_workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Values'
+    ws.append(['id', 'count', 'score', 'due', 'note', 'total'])
+    ws.append([1, 3, 0.5, datetime.datetime(2024, 3, 1), 'Ünïcödé – π ≈ 3.14', '=B2*2'])
+    ws.append([2, 4.0, 1.25, datetime.date(2024, 12, 31), '日本語', '=SUM(B2:B3)'])
+    ws.append([3, None, None, None, None, None])
+    ws.append([4, -7, 1e-9, datetime.datetime(1999, 1, 1, 12, 30), '', '="text"'])
+    ws.append([None, None, None, None, None, None])
+
+    sparse = wb.create_sheet('Sparse')
+    sparse.append(['key', None, 'value'])
+    sparse.append(['a', None, 'emoji 🚀'])
+    sparse['E6'] = 'far cell'
+
+    wb.create_sheet('Empty')
+    path = tmp_path / 'mixed.xlsx'
+    wb.save(path)
+    return path
+
+
+def test_engines_match_row_for_row(mixed_workbook):
+    expected = xlsx_reader.read_workbook(mixed_workbook, 'openpyxl')
+    actual = xlsx_reader.read_workbook(mixed_workbook, 'calamine')
+
+    assert [sheet[0] for sheet in actual] == ['Values', 'Sparse', 'Empty']
+    assert [sheet[0] for sheet in actual] == [sheet[0] for sheet in expected]
+    for (name, header, rows), (_, exp_header, exp_rows) in zip(actual, expected):
+        assert header == exp_header, name
+        assert len(rows) == len(exp_rows), name
+        for row, exp_row in zip(rows, exp_rows):
+            assert row == exp_row, name
+            assert [type(v) for v in row] == [type(v) for v in exp_row], name
+
+
+def test_normalized_types(mixed_workbook):
+    _, header, rows = xlsx_reader.read_workbook(mixed_workbook, 'calamine')[0]
+
+    assert header == ('id', 'count', 'score', 'due', 'note', 'total')
+    assert rows[0][:5] == (1, 3, 0.5, datetime.datetime(2024, 3, 1), 'Ünïcödé – π ≈ 3.14')
+    assert rows[1][1] == 4 and type(rows[1][1]) is int
+    assert rows[1][3] == datetime.datetime(2024, 12, 31)
+    assert rows[2] == (3, None, None, None, None, None)
+    assert len(rows) == 4  # trailing empty row dropped
+
+
+def test_check_parity_reports_no_mismatches(mixed_workbook):
+    assert xlsx_reader.check_parity([mixed_workbook]) == 0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+XLSX Reader Backends for Harshi-App
+Every workbook read goes through parse_cache, which parses a workbook with
+the engine chosen here:
+
+- calamine: python-calamine (Rust), used when installed
+- openpyxl: read-only openpyxl, the fallback
+
+Both engines return the same normalized sheets, [(name, header, rows)], with
+openpyxl's value types: empty cells are None, whole numbers are int, dates
+are datetime, and trailing empty rows/columns are dropped. `parity` checks
+that every available engine matches openpyxl row for row.
+
+iter_sheet_rows streams a single sheet with read-only openpyxl (never the
+whole sheet in memory) for the streaming converters.
+
+Set STUDYHUB_XLSX_ENGINE to force an engine.
+
+Usage:
+    python scripts/xlsx_reader.py engines
+    python scripts/xlsx_reader.py parity [workbook.xlsx ...]
+    python scripts/xlsx_reader.py benchmark [workbook.xlsx ...]
+"""
+
+import datetime
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+def _normalize_value(value):
+    if value == '':
+        return None
+    value_type = type(value)
+    if value_type is float and value.is_integer():
+        return int(value)
+    if value_type is datetime.date:
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+def normalize_sheet(rows):
+    """(header, body) with engine-neutral values and the empty tail trimmed"""
+    rows = [[_normalize_value(v) for v in row] for row in rows]
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    width = max((len(row) for row in rows), default=0)
+    while width and all(len(row) < width or row[width - 1] is None for row in rows):
+        width -= 1
+    rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return (rows[0], rows[1:]) if rows else ((), [])
+
+
+# ============================================================================
+# ENGINES
+# ============================================================================
+
+def _read_calamine(path):
+    wb = CalamineWorkbook.from_path(str(path))
+    try:
+        for name in wb.sheet_names:
+            yield (name,) + normalize_sheet(wb.get_sheet_by_name(name).to_python(skip_empty_area=False))
+    finally:
+        if hasattr(wb, 'close'):
+            wb.close()
+
+def _read_openpyxl(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            yield (ws.title,) + normalize_sheet(ws.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+ENGINES = {
+    'calamine': _read_calamine,
+    'openpyxl': _read_openpyxl,
+}
+
+def available_engines():
+    return [name for name in ENGINES if name != 'calamine' or CalamineWorkbook is not None]
+
+def default_engine():
+    forced = os.environ.get('STUDYHUB_XLSX_ENGINE')
+    if forced:
+        if forced not in available_engines():
+            raise ValueError(f"XLSX engine '{forced}' is not available (have: {', '.join(available_engines())})")
+        return forced
+    return available_engines()[0]
+
+def read_workbook(path, engine=None):
+    """[(sheet_name, header, rows)] for every sheet, in workbook order"""
+    return list(ENGINES[engine or default_engine()](Path(path)))
+
+def open_read_only(path):
+    """Read-only openpyxl workbook for iter_sheet_rows (close() it when done)"""
+    from openpyxl import load_workbook
+
+    return load_workbook(path, read_only=True, data_only=True)
+
+def iter_sheet_rows(workbook, sheet_name):
+    """
+    Stream one sheet of an open_read_only workbook (header first), normalized
+    value by value. Raises KeyError on the first next() if there is no such sheet.
+    """
+    if sheet_name not in workbook.sheetnames:
+        raise KeyError(sheet_name)
+    for row in workbook[sheet_name].iter_rows(values_only=True):
+        yield tuple(_normalize_value(v) for v in row)
+
+
+# ============================================================================
+# PARITY + BENCHMARK
+# ============================================================================
+
+def _default_workbooks():
+    return sorted(DATA_DIR.glob('*.xlsx')) + sorted(DATA_DIR.glob('*/*.xlsx'))
+
+def check_parity(paths):
+    """Compare every available engine against openpyxl; returns the mismatch count"""
+    engines = [e for e in available_engines() if e != 'openpyxl']
+    if not engines:
+        print("  [WARN] Only openpyxl is installed; nothing to compare (pip install python-calamine)")
+        return 0
+
+    mismatches = 0
+    for path in paths:
+        expected = read_workbook(path, 'openpyxl')
+        for engine in engines:
+            actual = read_workbook(path, engine)
+            problems = []
+            if [s[0] for s in actual] != [s[0] for s in expected]:
+                problems.append(f"sheets {[s[0] for s in actual]} != {[s[0] for s in expected]}")
+            for (name, header, rows), (_, exp_header, exp_rows) in zip(actual, expected):
+                if header != exp_header:
+                    problems.append(f"{name}: header {header} != {exp_header}")
+                if len(rows) != len(exp_rows):
+                    problems.append(f"{name}: {len(rows)} rows != {len(exp_rows)}")
+                for i, (row, exp_row) in enumerate(zip(rows, exp_rows), start=2):
+                    if row != exp_row:
+                        problems.append(f"{name} row {i}: {row} != {exp_row}")
+                        break
+            mismatches += len(problems)
+            status = '[+]' if not problems else '[ERROR]'
+            print(f"  {status} {engine} vs openpyxl: {path.name}")
+            for problem in problems[:5]:
+                print(f"      {problem}")
+    return mismatches
+
+def benchmark(paths):
+    for engine in available_engines():
+        start = time.perf_counter()
+        rows = sum(len(rows) for path in paths for _, _, rows in read_workbook(path, engine))
+        elapsed = time.perf_counter() - start
+        print(f"  {engine:9} {rows} rows in {elapsed:.3f}s ({rows / elapsed:,.0f} rows/s)")
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'engines'
+    paths = [Path(p) for p in sys.argv[2:]] or _default_workbooks()
+
+    if command == 'engines':
+        print(f"[*] XLSX engines: {', '.join(available_engines())} (default: {default_engine()})")
+    elif command == 'parity':
+        print(f"[*] Checking reader parity on {len(paths)} workbooks...")
+        mismatches = check_parity(paths)
+        print(f"  {mismatches} mismatches")
+        sys.exit(1 if mismatches else 0)
+    elif command == 'benchmark':
+        print(f"[*] Reading {len(paths)} workbooks...")
+        benchmark(paths)
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -13,90 +13,51 @@ Usage:
     python setup_data.py --help
     python setup_data.py create-sample
     python setup_data.py validate path/to/data.xlsx
+    python setup_data.py validate public/studyguide [--schema-version 2]
     python setup_data.py export-json path/to/data.xlsx
+    python setup_data.py build-db -o public/data/studyhub.db
+    python setup_data.py diff old_build/ public/ -o patch.json
 """
 
 import json
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
+
+# Hand the command to the resident data daemon when it is running (scripts/data_daemon.py)
+if __name__ == '__main__' and len(sys.argv) > 1:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+    from data_daemon import forward
+    _exit_code = forward('setup_data', sys.argv[1:])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
 
 # Check for required packages
 try:
     import pandas as pd
-    from openpyxl import Workbook, load_workbook
+    from openpyxl import Workbook
     from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 except ImportError:
     print("Installing required packages...")
     os.system(f"{sys.executable} -m pip install pandas openpyxl --break-system-packages")
     import pandas as pd
-    from openpyxl import Workbook, load_workbook
+    from openpyxl import Workbook
     from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+import schema_registry
+
 
 # ============================================================================
 # DATA STRUCTURE DEFINITIONS
 # ============================================================================
 
-SHEET_SCHEMAS = {
-    'Subjects': {
-        'columns': ['subject_id', 'subject_key', 'name', 'icon', 'color_hex', 'light_bg', 'gradient_from', 'gradient_to', 'dark_glow'],
-        'required': ['subject_id', 'subject_key', 'name'],
-        'description': 'Define subjects with their visual styling'
-    },
-    'Topics': {
-        'columns': ['topic_id', 'subject_key', 'topic_name', 'duration_minutes', 'order_index'],
-        'required': ['topic_id', 'subject_key', 'topic_name'],
-        'description': 'List all topics per subject'
-    },
-    'Topic_Sections': {
-        'columns': ['section_id', 'topic_id', 'section_title', 'section_icon', 'order_index', 'section_type'],
-        'required': ['section_id', 'topic_id', 'section_title'],
-        'description': 'Define sections/chapters within each topic'
-    },
-    'Learning_Objectives': {
-        'columns': ['objective_id', 'topic_id', 'objective_text', 'order_index'],
-        'required': ['objective_id', 'topic_id', 'objective_text'],
-        'description': 'Learning objectives for each topic'
-    },
-    'Key_Terms': {
-        'columns': ['term_id', 'topic_id', 'term', 'definition'],
-        'required': ['term_id', 'topic_id', 'term', 'definition'],
-        'description': 'Vocabulary terms and definitions'
-    },
-    'Study_Content': {
-        'columns': ['content_id', 'section_id', 'content_type', 'content_title', 'content_text', 'order_index', 'image_url', 'video_url'],
-        'required': ['content_id', 'section_id', 'content_type', 'content_text'],
-        'description': 'Main educational content blocks'
-    },
-    'Formulas': {
-        'columns': ['formula_id', 'topic_id', 'formula_text', 'formula_label', 
-                   'variable_1_symbol', 'variable_1_name', 'variable_1_unit',
-                   'variable_2_symbol', 'variable_2_name', 'variable_2_unit',
-                   'variable_3_symbol', 'variable_3_name', 'variable_3_unit'],
-        'required': ['formula_id', 'topic_id', 'formula_text'],
-        'description': 'Mathematical/scientific formulas'
-    },
-    'Quiz_Questions': {
-        'columns': ['question_id', 'topic_id', 'question_text', 'option_a', 'option_b', 'option_c', 'option_d', 
-                   'correct_answer', 'explanation', 'xp_reward'],
-        'required': ['question_id', 'topic_id', 'question_text', 'option_a', 'option_b', 'correct_answer'],
-        'description': 'Multiple choice quiz questions'
-    },
-    'Achievements': {
-        'columns': ['achievement_id', 'icon', 'name', 'description', 'unlock_condition'],
-        'required': ['achievement_id', 'name', 'description'],
-        'description': 'Gamification badges and achievements'
-    }
-}
-
-CONTENT_TYPES = ['introduction', 'formula', 'concept_helper', 'warning', 'real_world', 'text', 'video', 'image', 'flowchart']
-SECTION_TYPES = ['objectives', 'intro', 'content', 'applications', 'quiz']
-VALID_ICONS = ['Zap', 'Calculator', 'FlaskConical', 'Leaf', 'Trophy', 'Star', 'Award', 'Flame',
-               'HelpCircle', 'CheckCircle2', 'Target', 'BookOpen', 'FileText', 'Clock', 'Globe',
-               'Lightbulb', 'AlertTriangle', 'Atom', 'Microscope', 'Dna', 'Pi', 'Hammer', 'RefreshCw',
-               'Minimize2', 'Triangle', 'Disc', 'Grid', 'ArrowDown', 'Link', 'GitCommit', 'Circle',
-               'GitBranch', 'Share2']
+# Sheet and CSV schemas live in the versioned registry (scripts/schema_registry.py);
+# SHEET_SCHEMAS is the current version's sheets in the original layout.
+from schema_registry import (  # noqa: E402
+    CONTENT_TYPES, HANDOUT_CONTENT_TYPES, SECTION_TYPES, SHEET_SCHEMAS, VALID_ICONS,
+)
 
 
 # ============================================================================
@@ -686,6 +647,25 @@ add_topic_data('bio-t3',
 # FUNCTIONS
 # ============================================================================
 
+def _script_module(name):
+    """Import a helper module from scripts/ on demand."""
+    import importlib
+    scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return importlib.import_module(name)
+
+
+def _content_db():
+    """The SQLite content store (scripts/content_db.py)."""
+    return _script_module('content_db')
+
+
+def _parse_cache():
+    """The shared XLSX parse cache (scripts/parse_cache.py)."""
+    return _script_module('parse_cache')
+
+
 def create_sample_excel(output_path='public/StudyHub_Complete_Data.xlsx'):
     """Create a sample Excel file with all the required sheets and data."""
     print(f"Creating sample Excel file: {output_path}")
@@ -738,77 +718,86 @@ def create_sample_excel(output_path='public/StudyHub_Complete_Data.xlsx'):
     return output_path
 
 
-def validate_excel(file_path):
+def _collect_issues(label, issues, errors, warnings):
+    """Sort (severity, row_num, message) issues from the schema registry into message lists."""
+    for severity, row_num, message in issues:
+        where = f"{label} row {row_num}" if row_num else label
+        (errors if severity == 'error' else warnings).append(f"{where}: {message}")
+
+
+def _print_validation(errors, warnings):
+    print("\n" + "="*50)
+    if errors:
+        print("❌ ERRORS:")
+        for error in errors:
+            print(f"   • {error}")
+    
+    if warnings:
+        print("⚠️  WARNINGS:")
+        for warning in warnings:
+            print(f"   • {warning}")
+    
+    if not errors and not warnings:
+        print("✅ Validation passed! No issues found.")
+    elif not errors:
+        print("✅ Validation passed with warnings.")
+    else:
+        print("❌ Validation failed. Please fix errors before using.")
+    
+    print("="*50)
+
+
+def validate_excel(file_path, version=schema_registry.CURRENT_VERSION):
     """Validate an Excel file against the required schema."""
-    print(f"Validating: {file_path}")
+    print(f"Validating: {file_path} (schema v{version})")
     errors = []
     warnings = []
     
     try:
-        wb = load_workbook(file_path)
+        sheets = _parse_cache().load_sheets(file_path)
     except Exception as e:
         print(f"❌ Error opening file: {e}")
         return False
     
     # Check for required sheets
-    for sheet_name, schema in SHEET_SCHEMAS.items():
-        if sheet_name not in wb.sheetnames:
+    for sheet_name in schema_registry.get_schemas(version, 'sheet'):
+        if sheet_name not in sheets:
             errors.append(f"Missing required sheet: {sheet_name}")
             continue
         
-        ws = wb[sheet_name]
-        
-        # Get headers from first row
-        headers = [cell.value for cell in ws[1] if cell.value]
-        headers_lower = [h.lower().replace(' ', '_') if h else '' for h in headers]
-        
-        # Check required columns
-        for required_col in schema.get('required', []):
-            if required_col not in headers_lower:
-                errors.append(f"{sheet_name}: Missing required column '{required_col}'")
+        header, rows = sheets[sheet_name]
         
         # Check for data
-        if ws.max_row < 2:
+        if not rows:
             warnings.append(f"{sheet_name}: No data rows found")
         
-        # Validate content types for Study_Content
-        if sheet_name == 'Study_Content' and 'content_type' in headers_lower:
-            type_col = headers_lower.index('content_type') + 1
-            for row in range(2, ws.max_row + 1):
-                cell_value = ws.cell(row=row, column=type_col).value
-                if cell_value and cell_value not in CONTENT_TYPES:
-                    warnings.append(f"{sheet_name} row {row}: Invalid content_type '{cell_value}'. Valid: {CONTENT_TYPES}")
-        
-        # Validate icons
-        if sheet_name in ['Subjects', 'Topic_Sections', 'Achievements']:
-            icon_col_name = 'icon' if sheet_name != 'Topic_Sections' else 'section_icon'
-            if icon_col_name in headers_lower:
-                icon_col = headers_lower.index(icon_col_name) + 1
-                for row in range(2, ws.max_row + 1):
-                    cell_value = ws.cell(row=row, column=icon_col).value
-                    if cell_value and cell_value not in VALID_ICONS:
-                        warnings.append(f"{sheet_name} row {row}: Unknown icon '{cell_value}'")
-    
-    # Print results
-    print("\n" + "="*50)
-    if errors:
-        print("❌ ERRORS:")
-        for error in errors:
-            print(f"   • {error}")
+        # Required columns, unknown columns, and per-row values (compiled validator)
+        _collect_issues(sheet_name, schema_registry.validate_rows(sheet_name, header, rows, version), errors, warnings)
     
-    if warnings:
-        print("⚠️  WARNINGS:")
-        for warning in warnings:
-            print(f"   • {warning}")
+    _print_validation(errors, warnings)
+    return len(errors) == 0
+
+
+def validate_csv(path, version=schema_registry.CURRENT_VERSION):
+    """Validate a CSV output (or every CSV under a directory) against the registry's CSV schemas."""
+    import csv
+    print(f"Validating: {path} (schema v{version})")
+    errors = []
+    warnings = []
     
-    if not errors and not warnings:
-        print("✅ Validation passed! No issues found.")
-    elif not errors:
-        print("✅ Validation passed with warnings.")
-    else:
-        print("❌ Validation failed. Please fix errors before using.")
+    files = sorted(Path(path).rglob('*.csv')) if os.path.isdir(path) else [Path(path)]
+    for csv_path in files:
+        schema_name = schema_registry.csv_schema_name(csv_path, version)
+        if not schema_name:
+            warnings.append(f"{csv_path}: No schema for this file")
+            continue
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            _collect_issues(str(csv_path), schema_registry.validate_rows(schema_name, header, reader, version),
+                            errors, warnings)
     
-    print("="*50)
+    _print_validation(errors, warnings)
     return len(errors) == 0
 
 
@@ -817,21 +806,28 @@ def export_to_json(file_path, output_path=None):
     print(f"Exporting to JSON: {file_path}")
     
     if output_path is None:
-        output_path = file_path.replace('.xlsx', '.json')
+        output_path = os.path.splitext(file_path)[0] + '.json'
+    
+    if file_path.endswith('.db'):
+        content_db = _content_db()
+        conn = content_db.connect(file_path)
+        data = {sheet_name: content_db.sheet_rows(conn, sheet_name) for sheet_name in SHEET_SCHEMAS}
+        conn.close()
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"✅ JSON exported: {output_path}")
+        return output_path
     
-    wb = load_workbook(file_path)
     data = {}
     
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        
+    for sheet_name, (header, sheet_rows) in _parse_cache().load_sheets(file_path).items():
         # Get headers
-        headers = [cell.value.lower().replace(' ', '_') if cell.value else f'col_{i}' 
-                   for i, cell in enumerate(ws[1])]
+        headers = [value.lower().replace(' ', '_') if value else f'col_{i}'
+                   for i, value in enumerate(header)]
         
         # Get data
         rows = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
+        for row in sheet_rows:
             if any(cell is not None for cell in row):
                 row_dict = {}
                 for i, value in enumerate(row):
@@ -848,14 +844,14 @@ def export_to_json(file_path, output_path=None):
     return output_path
 
 
-def print_schema():
+def print_schema(version=schema_registry.CURRENT_VERSION):
     """Print the data schema for reference."""
     print("\n" + "="*60)
-    print("STUDYHUB DATA SCHEMA")
+    print(f"STUDYHUB DATA SCHEMA (v{version})")
     print("="*60)
     
-    for sheet_name, schema in SHEET_SCHEMAS.items():
-        print(f"\n📄 {sheet_name}")
+    for name, schema in schema_registry.get_schemas(version).items():
+        print(f"\n{'📄' if schema['kind'] == 'sheet' else '🗒️ '} {name}")
         print(f"   Description: {schema['description']}")
         print(f"   Columns: {', '.join(schema['columns'])}")
         print(f"   Required: {', '.join(schema['required'])}")
@@ -875,73 +871,59 @@ def validate_coverage(file_path):
     - Each topic has Key Terms
     - Each topic has sufficient Handout Content (concept_helper, real_world, etc.)
     - Each topic has >= 3 Quiz Questions
+
+    Accepts a workbook (loaded into an in-memory content DB) or a content DB
+    built with `build-db`; all checks are indexed SQL queries.
     """
     print(f"Validating Content Coverage: {file_path}")
 
     try:
-        wb = load_workbook(file_path)
+        conn = _content_db().connect(file_path)
     except Exception as e:
         print(f"❌ Error opening file: {e}")
         return False
 
-    def get_data(sheet_name):
-        if sheet_name not in wb.sheetnames: return []
-        ws = wb[sheet_name]
-        headers = [c.value.lower().replace(' ', '_') if c.value else '' for c in ws[1]]
-        data = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if any(row):
-                data.append({k: v for k, v in zip(headers, row)})
-        return data
-
-    subjects = get_data('Subjects')
-    topics = get_data('Topics')
-    objectives = get_data('Learning_Objectives')
-    terms = get_data('Key_Terms')
-    content = get_data('Study_Content')
-    questions = get_data('Quiz_Questions')
-
     errors = []
 
     # 1. Subject Coverage
-    if len(subjects) < 4:
-        errors.append(f"Expected at least 4 subjects, found {len(subjects)}")
+    subject_count = conn.execute('SELECT COUNT(*) FROM Subjects').fetchone()[0]
+    if subject_count < 4:
+        errors.append(f"Expected at least 4 subjects, found {subject_count}")
 
     # 2. Topic Coverage per Subject
-    for sub in subjects:
-        sub_key = sub.get('subject_key')
-        sub_topics = [t for t in topics if t.get('subject_key') == sub_key]
-        if len(sub_topics) < 3:
-            errors.append(f"Subject '{sub.get('name')}' has only {len(sub_topics)} topics (min 3 required)")
-
-        # 3. Topic Content Coverage
-        for topic in sub_topics:
-            tid = topic.get('topic_id')
-            tname = topic.get('topic_name')
-
-            # Check Objectives
-            t_objs = [o for o in objectives if o.get('topic_id') == tid]
-            if not t_objs:
+    subjects = conn.execute('''
+        SELECT s.name, COUNT(t.topic_id) AS topic_count, s.subject_key
+        FROM Subjects s LEFT JOIN Topics t ON t.subject_key = s.subject_key
+        GROUP BY s.rowid ORDER BY s.rowid''').fetchall()
+
+    # 3. Topic Content Coverage (one pass over Topics, index lookups per sheet)
+    handout_types = ', '.join('?' for _ in HANDOUT_CONTENT_TYPES)
+    topic_query = f'''
+        SELECT t.topic_id, t.topic_name,
+            (SELECT COUNT(*) FROM Learning_Objectives o WHERE o.topic_id = t.topic_id) AS objectives,
+            (SELECT COUNT(*) FROM Key_Terms k WHERE k.topic_id = t.topic_id) AS terms,
+            (SELECT COUNT(*) FROM Quiz_Questions q WHERE q.topic_id = t.topic_id) AS questions,
+            (SELECT COUNT(*) FROM Study_Content c
+             WHERE c.topic_id = t.topic_id AND c.content_type IN ({handout_types})) AS handouts
+        FROM Topics t WHERE t.subject_key = ? ORDER BY t.rowid'''
+
+    for name, topic_count, subject_key in subjects:
+        if topic_count < 3:
+            errors.append(f"Subject '{name}' has only {topic_count} topics (min 3 required)")
+
+        for tid, tname, objectives, terms, questions, handouts in conn.execute(
+                topic_query, [*HANDOUT_CONTENT_TYPES, subject_key]):
+            if not objectives:
                 errors.append(f"Topic '{tname}' ({tid}) missing Learning Objectives")
-
-            # Check Terms
-            t_terms = [t for t in terms if t.get('topic_id') == tid]
-            if not t_terms:
+            if not terms:
                 errors.append(f"Topic '{tname}' ({tid}) missing Key Terms")
-
-            # Check Quiz
-            t_quiz = [q for q in questions if q.get('topic_id') == tid]
-            if len(t_quiz) < 3:
-                errors.append(f"Topic '{tname}' ({tid}) has {len(t_quiz)} quiz questions (min 3 required)")
-
-            # Check Handout Content
-            # Valid types for handout: 'formula', 'concept_helper', 'warning', 'real_world', 'flowchart', 'image'
-            valid_types = ['formula', 'concept_helper', 'warning', 'real_world', 'flowchart', 'image']
-            t_content = [c for c in content if c.get('section_id', '').startswith(tid) and c.get('content_type') in valid_types]
-
-            if not t_content:
+            if questions < 3:
+                errors.append(f"Topic '{tname}' ({tid}) has {questions} quiz questions (min 3 required)")
+            if not handouts:
                 errors.append(f"Topic '{tname}' ({tid}) missing Handout-compatible content (concept_helper, real_world, etc.)")
 
+    conn.close()
+
     print("\n" + "="*50)
     if errors:
         print("❌ COVERAGE FAILED:")
@@ -953,15 +935,34 @@ def validate_coverage(file_path):
         return True
 
 
+def build_db(output_path=None):
+    """Build the SQLite content store from the data workbooks and public CSV trees."""
+    content_db = _content_db()
+    output_path = output_path or str(content_db.DEFAULT_DB)
+    print(f"Building content database: {output_path}")
+    content_db.build_database(output_path, public_dir=content_db.BASE_DIR / 'public')
+    print(f"✅ Content database created: {output_path}")
+    return output_path
+
+
+def diff_data(old_path, new_path, output_path=None):
+    """Row-level patch between two builds, workbooks or snapshots (scripts/data_delta.py)."""
+    return _script_module('data_delta').diff(old_path, new_path, output_path)
+
+
 def main():
     """Main entry point."""
     import argparse
     
     parser = argparse.ArgumentParser(description='StudyHub Data Setup Script')
-    parser.add_argument('command', choices=['create-sample', 'validate', 'validate-coverage', 'export-json', 'schema'],
+    parser.add_argument('command', choices=['create-sample', 'validate', 'validate-coverage', 'export-json', 'schema',
+                                            'build-db', 'diff'],
                        help='Command to run')
-    parser.add_argument('file', nargs='?', help='Input file path (for validate/export-json)')
+    parser.add_argument('file', nargs='?', help='Input file path (for validate/export-json; validate also takes CSVs or a CSV directory)')
+    parser.add_argument('other', nargs='?', help='Second version to compare against (for diff)')
     parser.add_argument('-o', '--output', help='Output file path')
+    parser.add_argument('--schema-version', type=int, default=schema_registry.CURRENT_VERSION,
+                        choices=sorted(schema_registry.VERSIONS), help='Schema version to validate against')
     
     args = parser.parse_args()
     
@@ -973,7 +974,10 @@ def main():
         if not args.file:
             print("Error: Please provide a file path to validate")
             sys.exit(1)
-        success = validate_excel(args.file)
+        if args.file.endswith('.csv') or os.path.isdir(args.file):
+            success = validate_csv(args.file, args.schema_version)
+        else:
+            success = validate_excel(args.file, args.schema_version)
         sys.exit(0 if success else 1)
 
     elif args.command == 'validate-coverage':
@@ -990,7 +994,16 @@ def main():
         export_to_json(args.file, args.output)
     
     elif args.command == 'schema':
-        print_schema()
+        print_schema(args.schema_version)
+    
+    elif args.command == 'build-db':
+        build_db(args.output)
+    
+    elif args.command == 'diff':
+        if not args.file or not args.other:
+            print("Error: Please provide the old and new build directories, workbooks or snapshots")
+            sys.exit(1)
+        diff_data(args.file, args.other, args.output)
 
 
 if __name__ == '__main__':
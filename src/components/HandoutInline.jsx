@@ -1,9 +1,21 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { Printer, FileText, BookOpen, GitBranch, Lightbulb, AlertTriangle, Globe, Variable } from 'lucide-react';
 import MathFormula from './MathFormula/index';
 import { cn } from '../utils';
+import { handoutDataHash, loadHandoutFragment } from '../services/handoutFragments';
 
 const HandoutInline = ({ subject, topic, objectives, terms, formulas, sections, studyContent, quizQuestions, darkMode }) => {
+    const [fragment, setFragment] = useState(null);
+
+    useEffect(() => {
+        let cancelled = false;
+        setFragment(null);
+        loadHandoutFragment(topic.id).then(result => {
+            if (!cancelled) setFragment(result);
+        });
+        return () => { cancelled = true; };
+    }, [topic.id]);
+
     const handlePrint = () => {
         window.print();
     };
@@ -20,6 +32,15 @@ const HandoutInline = ({ subject, topic, objectives, terms, formulas, sections,
         return content.map(c => ({ ...c, sectionTitle: section.title }));
     });
 
+    // Use the build-time fragment only when it was rendered from exactly the loaded data
+    const useFragment = Boolean(fragment?.data) && fragment.data === handoutDataHash([
+        sections.map(section => [section.title || '', getSectionContent(section.id).map(c => [
+            c.type, c.title || '', c.text || '', ['flowchart', 'image'].includes(c.type) ? c.imageUrl || '' : ''
+        ])]),
+        terms.map(term => [term.term || '', term.definition || '']),
+        formulas.map(f => [f.label || '', f.formula || f.text || ''])
+    ]);
+
     return (
         <div className={cn("min-h-full", darkMode ? "bg-slate-900" : "bg-slate-50")}>
             {/* Print Styles */}
@@ -91,6 +112,9 @@ const HandoutInline = ({ subject, topic, objectives, terms, formulas, sections,
                         </div>
                     </div>
 
+                    {useFragment ? (
+                        <div className={darkMode ? 'dark' : ''} dangerouslySetInnerHTML={{ __html: fragment.html }} />
+                    ) : (
                     <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
                         {/* Main Column */}
                         <div className="lg:col-span-2 space-y-8">
@@ -209,6 +233,7 @@ const HandoutInline = ({ subject, topic, objectives, terms, formulas, sections,
                             )}
                         </div>
                     </div>
+                    )}
 
 
                 </div>
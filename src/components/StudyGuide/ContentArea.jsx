@@ -10,7 +10,8 @@ import {
   RealWorldBlock,
   VideoBlock,
   ImageBlock,
-  MisconceptionBlock
+  MisconceptionBlock,
+  BlockText
 } from './ContentBlocks';
 import QuizSection from '../QuizSection';
 import ContentErrorBoundary from '../ErrorBoundary';
@@ -111,11 +112,13 @@ const ContentArea = memo(({
             )}>
               📚 {content.title}
             </h4>
-            <p className={cn(
-              darkMode ? "text-slate-300" : "text-slate-700"
-            )}>
-              {content.text}
-            </p>
+            <BlockText
+              content={content}
+              className={cn(
+                darkMode ? "text-slate-300" : "text-slate-700"
+              )}
+              darkMode={darkMode}
+            />
           </div>
         );
 
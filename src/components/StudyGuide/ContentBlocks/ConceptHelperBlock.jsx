@@ -1,5 +1,6 @@
 import React, { memo } from 'react';
 import { Lightbulb } from 'lucide-react';
+import { BlockText } from './MarkdownNodes';
 
 const cn = (...classes) => classes.flat().filter(Boolean).join(' ').replace(/\s+/g, ' ').trim();
 
@@ -33,9 +34,11 @@ const ConceptHelperBlock = memo(({ content, darkMode }) => {
           {content.title || 'Concept Helper'}
         </span>
       </div>
-      <p className={darkMode ? "text-blue-200" : "text-blue-900"}>
-        {content.text}
-      </p>
+      <BlockText
+        content={content}
+        className={darkMode ? "text-blue-200" : "text-blue-900"}
+        darkMode={darkMode}
+      />
     </div>
   );
 });
@@ -5,6 +5,7 @@ import MathFormula from '../../MathFormula';
 /**
  * FormulaBlock Component
  * Renders mathematical formulas with variables legend and copy button
+ * Uses the build-time pre-rendered SVG (svgUrl) when available, falling back to MathFormula
  *
  * @param {Object} props
  * @param {Object} props.content - Content object { title, text }
@@ -13,6 +14,7 @@ import MathFormula from '../../MathFormula';
  */
 const FormulaBlock = memo(({ content, formula, darkMode }) => {
   const [copied, setCopied] = useState(false);
+  const [svgFailed, setSvgFailed] = useState(false);
 
   const handleCopy = () => {
     const textToCopy = formula?.formula || content?.text || '';
@@ -25,6 +27,8 @@ const FormulaBlock = memo(({ content, formula, darkMode }) => {
   const displayFormula = formula?.formulaDisplay || formula?.formula || content?.text || '';
   const variables = formula?.variables || [];
   const label = formula?.label || content?.title || '';
+  const svgPath = content?.svgUrl || formula?.svgUrl || '';
+  const svgUrl = svgPath && !svgFailed ? `${process.env.PUBLIC_URL || ''}/${svgPath}` : '';
 
   return (
     <div className="bg-slate-900 rounded-2xl p-6 sm:p-8 relative overflow-hidden">
@@ -40,11 +44,20 @@ const FormulaBlock = memo(({ content, formula, darkMode }) => {
 
         {/* Formula Display */}
         <div className="flex items-center justify-center gap-4 mb-6">
-          <MathFormula
-            formula={displayFormula}
-            size="large"
-            className="text-white"
-          />
+          {svgUrl ? (
+            <img
+              src={svgUrl}
+              alt={displayFormula}
+              className="max-w-full h-auto"
+              onError={() => setSvgFailed(true)}
+            />
+          ) : (
+            <MathFormula
+              formula={displayFormula}
+              size="large"
+              className="text-white"
+            />
+          )}
         </div>
 
         {/* Variables Legend */}
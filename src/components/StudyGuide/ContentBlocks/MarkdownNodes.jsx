@@ -0,0 +1,146 @@
+import React, { memo } from 'react';
+
+const cn = (...classes) => classes.flat().filter(Boolean).join(' ').replace(/\s+/g, ' ').trim();
+
+const INLINE_TAGS = new Set(['b', 'i', 'code', 'a', 'br']);
+
+const HEADING_CLASSES = {
+  1: 'text-xl font-bold',
+  2: 'text-lg font-bold',
+  3: 'text-base font-bold'
+};
+
+/**
+ * True for http(s):, mailto: and relative URLs. The parser already drops
+ * other links; this guards sidecars written by older parsers or by hand.
+ */
+const isSafeHref = (href) => {
+  if (typeof href !== 'string' || /[\u0000-\u0020\u007f]/.test(href)) return false;
+  const scheme = /^([a-z][a-z0-9+.-]*):/i.exec(href);
+  return !scheme || ['http', 'https', 'mailto'].includes(scheme[1].toLowerCase());
+};
+
+/**
+ * True when a list item holds inline nodes (a single-paragraph item)
+ * rather than block nodes
+ */
+const isInline = (nodes) =>
+  nodes.length > 0 && (typeof nodes[0] === 'string' || INLINE_TAGS.has(nodes[0][0]));
+
+const renderInline = (nodes, darkMode) =>
+  nodes.map((node, index) => {
+    if (typeof node === 'string') return node;
+    switch (node[0]) {
+      case 'b':
+        return <strong key={index} className="font-semibold">{renderInline(node[1], darkMode)}</strong>;
+      case 'i':
+        return <em key={index}>{renderInline(node[1], darkMode)}</em>;
+      case 'code':
+        return (
+          <code
+            key={index}
+            className={cn("px-1 rounded font-mono text-sm", darkMode ? "bg-slate-700" : "bg-slate-100")}
+          >
+            {node[1]}
+          </code>
+        );
+      case 'a':
+        if (!isSafeHref(node[1])) {
+          return <React.Fragment key={index}>{renderInline(node[2], darkMode)}</React.Fragment>;
+        }
+        return (
+          <a key={index} href={node[1]} target="_blank" rel="noopener noreferrer" className="underline">
+            {renderInline(node[2], darkMode)}
+          </a>
+        );
+      case 'br':
+        return <br key={index} />;
+      default:
+        return null;
+    }
+  });
+
+const renderItem = (item, darkMode) =>
+  isInline(item) ? renderInline(item, darkMode) : renderBlocks(item, darkMode);
+
+const renderBlocks = (nodes, darkMode) =>
+  nodes.map((node, index) => {
+    switch (node[0]) {
+      case 'p':
+        return <p key={index}>{renderInline(node[1], darkMode)}</p>;
+      case 'h':
+        return (
+          <p key={index} className={HEADING_CLASSES[node[1]] || HEADING_CLASSES[3]}>
+            {renderInline(node[2], darkMode)}
+          </p>
+        );
+      case 'ul':
+        return (
+          <ul key={index} className="list-disc pl-6 space-y-1">
+            {node[1].map((item, i) => <li key={i}>{renderItem(item, darkMode)}</li>)}
+          </ul>
+        );
+      case 'ol':
+        return (
+          <ol key={index} start={node[1]} className="list-decimal pl-6 space-y-1">
+            {node[2].map((item, i) => <li key={i}>{renderItem(item, darkMode)}</li>)}
+          </ol>
+        );
+      case 'quote':
+        return (
+          <blockquote
+            key={index}
+            className={cn("border-l-4 pl-4 italic space-y-2", darkMode ? "border-slate-600" : "border-slate-300")}
+          >
+            {renderBlocks(node[1], darkMode)}
+          </blockquote>
+        );
+      case 'pre':
+        return (
+          <pre
+            key={index}
+            className={cn("p-3 rounded-lg overflow-x-auto font-mono text-sm", darkMode ? "bg-slate-900" : "bg-slate-100")}
+          >
+            {node[1]}
+          </pre>
+        );
+      case 'hr':
+        return <hr key={index} className={darkMode ? "border-slate-700" : "border-slate-200"} />;
+      default:
+        return null;
+    }
+  });
+
+/**
+ * MarkdownNodes Component
+ * Renders a content block's pre-parsed markdown AST (scripts/markdown_ast.py)
+ * without parsing markdown in the browser
+ *
+ * @param {Object} props
+ * @param {Array} props.nodes - Block nodes
+ * @param {boolean} props.darkMode - Dark mode flag
+ */
+const MarkdownNodes = memo(({ nodes, darkMode }) => (
+  <>{renderBlocks(nodes, darkMode)}</>
+));
+
+MarkdownNodes.displayName = 'MarkdownNodes';
+
+/**
+ * BlockText Component
+ * A content block's body: the pre-parsed AST when there is one, else the raw text
+ *
+ * @param {Object} props
+ * @param {Object} props.content - Content object { text, ast }
+ * @param {string} props.className - Classes for the text container
+ * @param {boolean} props.darkMode - Dark mode flag
+ */
+export const BlockText = memo(({ content, className, darkMode }) => (
+  content.ast
+    ? <div className={cn(className, "space-y-2")}><MarkdownNodes nodes={content.ast} darkMode={darkMode} /></div>
+    : <p className={className}>{content.text}</p>
+));
+
+BlockText.displayName = 'BlockText';
+
+export default MarkdownNodes;
@@ -1,5 +1,6 @@
 import React, { memo } from 'react';
 import { Globe } from 'lucide-react';
+import { BlockText } from './MarkdownNodes';
 
 const cn = (...classes) => classes.flat().filter(Boolean).join(' ').replace(/\s+/g, ' ').trim();
 
@@ -33,9 +34,11 @@ const RealWorldBlock = memo(({ content, darkMode }) => {
           {content.title || 'Real-World Application'}
         </span>
       </div>
-      <p className={darkMode ? "text-emerald-200" : "text-emerald-900"}>
-        {content.text}
-      </p>
+      <BlockText
+        content={content}
+        className={darkMode ? "text-emerald-200" : "text-emerald-900"}
+        darkMode={darkMode}
+      />
     </div>
   );
 });
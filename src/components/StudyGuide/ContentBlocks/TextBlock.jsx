@@ -1,4 +1,5 @@
 import React, { memo } from 'react';
+import { BlockText } from './MarkdownNodes';
 
 const cn = (...classes) => classes.flat().filter(Boolean).join(' ').replace(/\s+/g, ' ').trim();
 
@@ -26,12 +27,14 @@ const TextBlock = memo(({ content, darkMode }) => {
           {content.title}
         </h3>
       )}
-      <p className={cn(
-        "text-base leading-relaxed",
-        darkMode ? "text-slate-300" : "text-slate-600"
-      )}>
-        {content.text}
-      </p>
+      <BlockText
+        content={content}
+        className={cn(
+          "text-base leading-relaxed",
+          darkMode ? "text-slate-300" : "text-slate-600"
+        )}
+        darkMode={darkMode}
+      />
     </div>
   );
 });
@@ -1,5 +1,6 @@
 import React, { memo } from 'react';
 import { AlertTriangle } from 'lucide-react';
+import { BlockText } from './MarkdownNodes';
 
 const cn = (...classes) => classes.flat().filter(Boolean).join(' ').replace(/\s+/g, ' ').trim();
 
@@ -33,9 +34,11 @@ const WarningBlock = memo(({ content, darkMode }) => {
           {content.title || 'Warning'}
         </span>
       </div>
-      <p className={darkMode ? "text-red-200" : "text-red-900"}>
-        {content.text}
-      </p>
+      <BlockText
+        content={content}
+        className={darkMode ? "text-red-200" : "text-red-900"}
+        darkMode={darkMode}
+      />
     </div>
   );
 });
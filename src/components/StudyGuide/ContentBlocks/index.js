@@ -8,6 +8,7 @@ export { default as RealWorldBlock } from './RealWorldBlock';
 export { default as VideoBlock } from './VideoBlock';
 export { default as ImageBlock } from './ImageBlock';
 export { default as MisconceptionBlock } from './MisconceptionBlock';
+export { default as MarkdownNodes, BlockText } from './MarkdownNodes';
 
 /**
  * Map content types to their respective block components
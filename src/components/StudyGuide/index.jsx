@@ -133,11 +133,6 @@ const StudyGuide = memo(({
 
       setXpGain(totalXP);
 
-      const newAchievements = [...(progress?.achievements || [])];
-      if (newProgress === 100 && !newAchievements.includes('topic-complete')) {
-        newAchievements.push('topic-complete');
-      }
-
       updateProgress?.({
         xp: (progress?.xp || 0) + totalXP,
         topics: {
@@ -147,8 +142,7 @@ const StudyGuide = memo(({
             lastAccessed: new Date().toISOString()
           }
         },
-        studyTimeMinutes: (progress?.studyTimeMinutes || 0) + 2,
-        achievements: newAchievements
+        studyTimeMinutes: (progress?.studyTimeMinutes || 0) + 2
       });
 
       setTimeout(() => setXpGain(null), 1500);
@@ -199,17 +193,8 @@ const StudyGuide = memo(({
 
   // Quiz completion
   const handleQuizComplete = useCallback((score, earnedXp, results) => {
-    const newAchievements = [...(progress?.achievements || [])];
-    if (!newAchievements.includes('first-quiz')) {
-      newAchievements.push('first-quiz');
-    }
-    if (score === 100 && !newAchievements.includes('perfect-quiz')) {
-      newAchievements.push('perfect-quiz');
-    }
-
     updateProgress?.({
       xp: (progress?.xp || 0) + earnedXp,
-      achievements: newAchievements,
       quizScores: {
         ...(progress?.quizScores || {}),
         [topicKey]: score
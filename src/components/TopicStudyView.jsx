@@ -95,16 +95,10 @@ const TopicStudyView = memo(({ subject, topicIndex, onBack, onOpenSettings }) =>
             const xpEarned = 10;
             setXpGain(xpEarned);
 
-            const newAchievements = [...progress.achievements];
-            if (newProgress === 100 && !newAchievements.includes('topic-complete')) {
-                newAchievements.push('topic-complete');
-            }
-
             updateProgress({
                 xp: progress.xp + xpEarned,
                 topics: { [topicKey]: { progress: newProgress, xp: (progress.topics[topicKey]?.xp || 0) + xpEarned, lastAccessed: new Date().toISOString() } },
-                studyTimeMinutes: progress.studyTimeMinutes + 2,
-                achievements: newAchievements
+                studyTimeMinutes: progress.studyTimeMinutes + 2
             });
 
             setTimeout(() => setXpGain(null), 1500);
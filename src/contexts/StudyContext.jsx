@@ -4,6 +4,7 @@ import { CheckCircle2, AlertCircle } from 'lucide-react';
 import { cn } from '../utils';
 import { calculateLevel } from '../constants';
 import { soundManager } from '../utils/SoundManager';
+import { loadAchievementRules, findUnlockedAchievements } from '../services/achievementRules';
 
 const DEFAULT_PROGRESS = {
     topics: {},
@@ -150,6 +151,23 @@ export const StudyProvider = ({ children }) => {
         }));
     }, [setSavedData]);
 
+    // Compiled achievement conditions (public/data/achievements.json): evaluate all
+    // of them once the rules arrive, then only those reading a changed progress field
+    const [achievementRules, setAchievementRules] = useState(null);
+    const rulesProgressRef = React.useRef(null);
+    useEffect(() => {
+        loadAchievementRules().then(setAchievementRules);
+    }, []);
+
+    useEffect(() => {
+        if (!achievementRules) return;
+        const unlocked = findUnlockedAchievements(achievementRules, rulesProgressRef.current, progress, data?.subjects);
+        rulesProgressRef.current = progress;
+        if (unlocked.length > 0) {
+            updateProgress({ achievements: [...progress.achievements, ...unlocked] });
+        }
+    }, [achievementRules, progress, data?.subjects, updateProgress]);
+
     const scheduleReview = useCallback((questionId, wasCorrect) => {
         const now = Date.now();
         const existing = savedData.progress.reviewSchedule?.[questionId];
@@ -211,13 +229,9 @@ export const StudyProvider = ({ children }) => {
             yesterday.setDate(yesterday.getDate() - 1);
             const newStreak = progress.lastStudyDate === yesterday.toDateString() ? progress.streak + 1 : 1;
 
-            const newAchievements = [...progress.achievements];
-            if (newStreak >= 5 && !newAchievements.includes('streak-5')) newAchievements.push('streak-5');
-            if (newStreak >= 10 && !newAchievements.includes('streak-10')) newAchievements.push('streak-10');
-
-            updateProgress({ streak: newStreak, lastStudyDate: today, achievements: newAchievements });
+            updateProgress({ streak: newStreak, lastStudyDate: today });
         }
-    }, [progress.lastStudyDate, progress.streak, progress.achievements, updateProgress]);
+    }, [progress.lastStudyDate, progress.streak, updateProgress]);
 
     // DEBUG: Log sections data
     console.log('🟡 [StudyContext] Sections received from data:', data?.sections);
@@ -3,6 +3,7 @@ import ReactDOM from 'react-dom/client';
 import './index.css';
 import App from './App';
 import ErrorBoundary from './components/ErrorBoundary';
+import { registerDataServiceWorker } from './services/precache';
 
 const root = ReactDOM.createRoot(document.getElementById('root'));
 root.render(
@@ -12,3 +13,5 @@ root.render(
     </ErrorBoundary>
   </React.StrictMode>
 );
+
+registerDataServiceWorker();
@@ -151,9 +151,11 @@ export class DataTransformer {
                 type: row.content_type || 'text',
                 title: row.content_title || '',
                 text: row.content_text || '',
+                ast: row.content_ast || null,
                 orderIndex: parseInt(row.order_index) || 0,
                 imageUrl: row.image_url || '',
                 videoUrl: row.video_url || '',
+                svgUrl: row.svg_url || '',
                 interactiveData: interactiveData
             });
         });
@@ -193,6 +195,7 @@ export class DataTransformer {
                 id: row.formula_id,
                 formula: row.formula_text,
                 label: row.formula_label || '',
+                svgUrl: row.svg_url || '',
                 variables
             });
         });
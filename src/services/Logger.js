@@ -6,10 +6,63 @@
 
 const MAX_LOGS = 1000;
 
+// Optional telemetry collector (scripts/telemetry_collector.py)
+const TELEMETRY_URL = process.env.REACT_APP_TELEMETRY_URL;
+const TELEMETRY_BATCH_SIZE = 50;
+const TELEMETRY_FLUSH_MS = 10000;
+// Only these levels are sent: their messages are fixed action/gate names, so
+// the collector sees a bounded set of event names
+const TELEMETRY_LEVELS = ['ACTION', 'GATE'];
+
 class LoggerService {
   constructor() {
     this.logs = [];
     this.listeners = [];
+    this.telemetryQueue = [];
+    this.telemetryTimer = null;
+    this.session = Math.random().toString(36).slice(2, 10);
+
+    if (TELEMETRY_URL && typeof window !== 'undefined') {
+      window.addEventListener('pagehide', () => this.flushTelemetry(true));
+    }
+  }
+
+  /**
+   * Queue an entry for the telemetry collector (name and duration only, no payload data)
+   */
+  _queueTelemetry(entry) {
+    this.telemetryQueue.push({
+      ts: entry.timestamp,
+      level: entry.level,
+      name: entry.message,
+      durationMs: typeof entry.data?.durationMs === 'number' ? entry.data.durationMs : null
+    });
+
+    if (this.telemetryQueue.length >= TELEMETRY_BATCH_SIZE) {
+      this.flushTelemetry();
+    } else if (!this.telemetryTimer) {
+      this.telemetryTimer = setTimeout(() => this.flushTelemetry(), TELEMETRY_FLUSH_MS);
+    }
+  }
+
+  /**
+   * Send queued events in one batch (sendBeacon while the page is unloading)
+   */
+  flushTelemetry(unloading = false) {
+    clearTimeout(this.telemetryTimer);
+    this.telemetryTimer = null;
+    if (!TELEMETRY_URL || this.telemetryQueue.length === 0) return;
+
+    const body = JSON.stringify({ session: this.session, events: this.telemetryQueue });
+    this.telemetryQueue = [];
+    const url = `${TELEMETRY_URL.replace(/\/$/, '')}/events`;
+
+    if (unloading && navigator.sendBeacon) {
+      navigator.sendBeacon(url, body);
+      return;
+    }
+    fetch(url, { method: 'POST', headers: { 'Content-Type': 'application/json' }, body, keepalive: true })
+      .catch(() => { /* telemetry is best-effort */ });
   }
 
   /**
@@ -29,6 +82,10 @@ class LoggerService {
       this.logs.pop();
     }
 
+    if (TELEMETRY_URL && TELEMETRY_LEVELS.includes(level)) {
+      this._queueTelemetry(entry);
+    }
+
     // Notify listeners (e.g., UI components)
     this.listeners.forEach(listener => listener(this.logs));
 
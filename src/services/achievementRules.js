@@ -0,0 +1,112 @@
+/**
+ * Achievement Rules Service for Harshi-App
+ * Evaluates the unlock conditions compiled by scripts/compile_achievements.py
+ * (public/data/achievements.json). Only achievements whose progress fields
+ * changed are re-evaluated, using the compiled dependency index.
+ */
+
+import { calculateSubjectProgress } from '../constants';
+import { Logger } from './Logger';
+import { resolveAssetPath } from './assetManifest';
+
+let rulesPromise = null;
+
+/**
+ * Load (once) the compiled rules; resolves to null when they are unavailable
+ * @returns {Promise<Object|null>} { achievements: { id: { ast, fields } }, dependencies: { field: [id] } }
+ */
+export function loadAchievementRules() {
+    if (!rulesPromise) {
+        const publicUrl = process.env.PUBLIC_URL || '';
+        rulesPromise = resolveAssetPath('data/achievements.json')
+            .then(path => fetch(`${publicUrl}/${path}`))
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                Logger.warn('Achievement rules unavailable', { error: error.message });
+                return null;
+            });
+    }
+    return rulesPromise;
+}
+
+const compare = (left, op, right) => {
+    switch (op) {
+        case '==': return left === right;
+        case '!=': return left !== right;
+        case '>=': return left >= right;
+        case '<=': return left <= right;
+        case '>': return left > right;
+        case '<': return left < right;
+        default: return false;
+    }
+};
+
+const readPath = (object, path) => path.split('.').reduce((value, key) => value?.[key], object);
+
+const quantify = (values, quantifier) => {
+    if (quantifier === 'all') return values.length > 0 && values.every(Boolean);
+    if (quantifier?.atLeast !== undefined) return values.filter(Boolean).length >= quantifier.atLeast;
+    return values.some(Boolean);
+};
+
+/**
+ * Evaluate one compiled condition against the progress state
+ * @param {Object} ast - Compiled condition
+ * @param {Object} progress - StudyContext progress
+ * @param {Object} subjects - Subject config ({ key: { topics: [{ id }] } })
+ * @returns {boolean}
+ */
+export function evaluateCondition(ast, progress, subjects = {}) {
+    switch (ast.kind) {
+        case 'always':
+            return true;
+        case 'compare':
+            return compare(Number(readPath(progress, ast.field) || 0), ast.op, ast.value);
+        case 'collection': {
+            const entries = Object.values(progress[ast.field] || {});
+            const values = entries.map(entry => {
+                const value = ast.metric ? entry?.[ast.metric] : entry;
+                return ast.op ? compare(Number(value || 0), ast.op, ast.value) : value !== undefined && value !== null;
+            });
+            return quantify(values, ast.quantifier);
+        }
+        case 'subjects': {
+            const userTopics = progress.topics || {};
+            const values = Object.entries(subjects).map(([key, subject]) => {
+                if (ast.metric === 'accessed') {
+                    return (subject.topics || []).some(topic => userTopics[topic.id]);
+                }
+                return compare(calculateSubjectProgress(key, userTopics, subject.topics), ast.op, ast.value);
+            });
+            return quantify(values, ast.quantifier);
+        }
+        default:
+            return false;
+    }
+}
+
+/**
+ * Achievements newly satisfied by a progress update. Only achievements that
+ * depend on a top-level field whose value changed are evaluated; with no
+ * previous state, every achievement is evaluated.
+ * @returns {Array<string>} Achievement ids to unlock
+ */
+export function findUnlockedAchievements(rules, prevProgress, progress, subjects) {
+    if (!rules) return [];
+    const owned = new Set(progress.achievements || []);
+
+    let candidates;
+    if (!prevProgress) {
+        candidates = Object.keys(rules.achievements);
+    } else {
+        const changed = Object.keys(rules.dependencies).filter(field => prevProgress[field] !== progress[field]);
+        candidates = [...new Set(changed.flatMap(field => rules.dependencies[field]))];
+    }
+
+    return candidates.filter(id => !owned.has(id) && evaluateCondition(rules.achievements[id].ast, progress, subjects));
+}
@@ -0,0 +1,46 @@
+/**
+ * Asset Manifest Service for Harshi-App
+ * Resolves logical content paths (e.g. questionnaire/Physics/X/questions.csv)
+ * to the content-hashed copies under public/hashed/ listed in
+ * public/content-manifest.json, written by `scripts/convert_to_csv.py --hashed`
+ * (and refreshed by every later conversion). Hashed files are immutable, so only
+ * the manifest is revalidated. Without a manifest, paths resolve to themselves.
+ */
+
+import { Logger } from './Logger';
+
+let manifestPromise = null;
+
+/**
+ * Load (once) the asset manifest; resolves to null when it is unavailable
+ * @returns {Promise<Object|null>} { generation, assets: { logicalPath: hashedPath } }
+ */
+export function loadAssetManifest() {
+    if (!manifestPromise) {
+        const publicUrl = process.env.PUBLIC_URL || '';
+        manifestPromise = fetch(`${publicUrl}/content-manifest.json`, { cache: 'no-cache' })
+            .then(response => (response.ok ? response.json() : null))
+            .catch(error => {
+                Logger.warn('Asset manifest unavailable', { error: error.message });
+                return null;
+            });
+    }
+    return manifestPromise;
+}
+
+/**
+ * Hashed path for a logical path, keeping its form (leading slash, PUBLIC_URL prefix)
+ * @param {string} path - Path as the caller would fetch it
+ * @returns {Promise<string>} Hashed path, or the path itself when it is not in the manifest
+ */
+export async function resolveAssetPath(path) {
+    const manifest = await loadAssetManifest();
+    if (!manifest?.assets) return path;
+
+    const publicUrl = process.env.PUBLIC_URL || '';
+    const prefix = publicUrl && path.startsWith(publicUrl) ? publicUrl : '';
+    const rest = path.slice(prefix.length);
+    const slash = rest.startsWith('/') ? '/' : '';
+    const hashed = manifest.assets[rest.slice(slash.length)];
+    return hashed ? `${prefix}${slash}${hashed}` : path;
+}
@@ -6,6 +6,7 @@
 
 import Papa from 'papaparse';
 import { Logger } from './Logger';
+import { resolveAssetPath } from './assetManifest';
 
 /**
  * Fetch and parse CSV data from a URL or local path
@@ -18,18 +19,21 @@ export async function fetchCSV(filePath) {
         // This handles the case where homepage is set in package.json
         const publicUrl = process.env.PUBLIC_URL || '';
 
-        const fullPath = filePath.startsWith('/') && publicUrl && !filePath.startsWith(publicUrl)
+        const fullPath = await resolveAssetPath(filePath.startsWith('/') && publicUrl && !filePath.startsWith(publicUrl)
             ? `${publicUrl}${filePath}`
-            : filePath;
+            : filePath);
 
         Logger.action('CSV Fetch', `Fetching: ${fullPath}`, { publicUrl });
+        const startedAt = performance.now();
 
         const response = await fetch(fullPath);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         const text = await response.text();
-        return parseCSV(text);
+        const rows = parseCSV(text);
+        Logger.action('CSV Loaded', { path: filePath, durationMs: Math.round(performance.now() - startedAt), rows: rows.length });
+        return rows;
     } catch (error) {
         Logger.error(`Error fetching CSV from ${filePath}`, error);
         return [];
@@ -55,6 +59,28 @@ function parseCSV(csvText) {
     return result.data;
 }
 
+/**
+ * Fetch a typed JSON file written by scripts/convert_to_csv.py
+ * @param {string} filePath - Path to JSON file
+ * @returns {Promise<Array<Object>|null>} Parsed rows, or null when the file is missing
+ */
+export async function fetchJSON(filePath) {
+    const publicUrl = process.env.PUBLIC_URL || '';
+    try {
+        const fullPath = await resolveAssetPath(`${publicUrl}${filePath}`);
+        const startedAt = performance.now();
+        const response = await fetch(fullPath);
+        if (!response.ok) return null;
+        const rows = await response.json();
+        if (!Array.isArray(rows)) return null;
+        Logger.action('JSON Loaded', { path: filePath, durationMs: Math.round(performance.now() - startedAt), rows: rows.length });
+        return rows;
+    } catch (error) {
+        // Optional: hand-written trees only have the CSV
+        return null;
+    }
+}
+
 /**
  * Load master index for a content type
  * @param {string} contentType - 'questionnaire', 'studyguide', or 'Handout'
@@ -76,6 +102,18 @@ export async function loadQuizQuestions(subject, topicFolder) {
     return fetchCSV(path);
 }
 
+/**
+ * Load a topic's quiz questions as typed rows (questions.json): canonical
+ * columns, lowercase question_type/difficulty, integer xp_reward and an
+ * `options` array
+ * @param {string} subject - Subject key (e.g., 'physics')
+ * @param {string} topicFolder - Topic folder name
+ * @returns {Promise<Array<Object>|null>} Typed questions, or null when only the CSV exists
+ */
+export async function loadTypedQuizQuestions(subject, topicFolder) {
+    return fetchJSON(`/questionnaire/${subject}/${topicFolder}/questions.json`);
+}
+
 /**
  * Load study guide content for a specific subject and topic
  * @param {string} subject - Subject key (e.g., 'physics')
@@ -87,6 +125,61 @@ export async function loadStudyContent(subject, topicFolder) {
     return fetchCSV(path);
 }
 
+/**
+ * Load a topic's study content as typed rows (content.json): canonical
+ * columns, integer order_index, already sorted by section then order_index
+ * @param {string} subject - Subject key (e.g., 'physics')
+ * @param {string} topicFolder - Topic folder name
+ * @returns {Promise<Array<Object>|null>} Typed content items, or null when only the CSV exists
+ */
+export async function loadTypedStudyContent(subject, topicFolder) {
+    return fetchJSON(`/studyguide/${subject}/${topicFolder}/content.json`);
+}
+
+/**
+ * Load the pre-parsed markdown of a topic's study content (scripts/markdown_ast.py)
+ * @param {string} subject - Subject key (e.g., 'physics')
+ * @param {string} topicFolder - Topic folder name
+ * @returns {Promise<Object>} { content_id: { hash, ast } } (empty when the topic has no markdown)
+ */
+export async function loadStudyContentAst(subject, topicFolder) {
+    const publicUrl = process.env.PUBLIC_URL || '';
+    try {
+        const path = await resolveAssetPath(`${publicUrl}/studyguide/${subject}/${topicFolder}/content.ast.json`);
+        const response = await fetch(path);
+        if (!response.ok) return {};
+        const { nodes, blocks } = await response.json();
+        return Object.fromEntries(Object.entries(blocks).map(([contentId, hash]) => [contentId, { hash, ast: nodes[hash] }]));
+    } catch (error) {
+        // Optional sidecar: blocks render their raw text without it
+        return {};
+    }
+}
+
+/**
+ * Text hash used by the sidecar (first 16 hex digits of SHA-256, as text_hash in markdown_ast.py)
+ */
+async function textHash(text) {
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest).slice(0, 8), byte => byte.toString(16).padStart(2, '0')).join('');
+}
+
+/**
+ * The AST of a sidecar entry only when it was parsed from exactly this text,
+ * so a stale sidecar never renders old content (null = render the raw text)
+ * @param {Object|undefined} entry - { hash, ast } from loadStudyContentAst
+ * @param {string} text - The block's current content text
+ * @returns {Promise<Array|null>} AST or null
+ */
+export async function astForText(entry, text) {
+    if (!entry || typeof text !== 'string' || !globalThis.crypto?.subtle) return null;
+    try {
+        return (await textHash(text)) === entry.hash ? entry.ast : null;
+    } catch (error) {
+        return null;
+    }
+}
+
 /**
  * Load sections for a specific subject and topic
  * @param {string} subject - Subject key
@@ -144,9 +237,14 @@ export async function getAllSubjects() {
 
 const csvService = {
     fetchCSV,
+    fetchJSON,
     loadMasterIndex,
     loadQuizQuestions,
+    loadTypedQuizQuestions,
     loadStudyContent,
+    loadTypedStudyContent,
+    loadStudyContentAst,
+    astForText,
     loadSections,
     loadHandout,
     getTopicsForSubject,
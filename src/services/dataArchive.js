@@ -0,0 +1,69 @@
+/**
+ * Data Archive Service for Harshi-App
+ * Fetches single entries out of public/data.zip with HTTP Range requests,
+ * using the offset index written by scripts/build_data_zip.py
+ * (public/data.zip.json), so a topic workbook can be loaded without
+ * downloading the whole archive.
+ */
+
+import { Logger } from './Logger';
+
+const publicUrl = () => process.env.PUBLIC_URL || '';
+
+let indexPromise = null;
+
+/**
+ * Load (once) the data.zip entry index
+ * @returns {Promise<Object>} { archive, archive_size, entries: { name: { offset, length, size, method } } }
+ */
+export function loadArchiveIndex() {
+    if (!indexPromise) {
+        indexPromise = fetch(`${publicUrl()}/data.zip.json`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                indexPromise = null;
+                throw error;
+            });
+    }
+    return indexPromise;
+}
+
+async function inflateRaw(bytes) {
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate-raw'));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+/**
+ * Fetch one archive entry (e.g. 'data/topics/physics_electricity.xlsx')
+ * @param {string} name - Entry name inside data.zip
+ * @returns {Promise<Uint8Array>} Uncompressed entry bytes
+ */
+export async function fetchArchiveEntry(name) {
+    const index = await loadArchiveIndex();
+    const entry = index.entries[name];
+    if (!entry) {
+        throw new Error(`No entry '${name}' in ${index.archive}`);
+    }
+
+    const url = `${publicUrl()}/${index.archive}`;
+    Logger.action('Archive Fetch', `Fetching ${name} from ${index.archive}`, { offset: entry.offset, length: entry.length });
+
+    const response = await fetch(url, {
+        headers: { Range: `bytes=${entry.offset}-${entry.offset + entry.length - 1}` }
+    });
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    let bytes = new Uint8Array(await response.arrayBuffer());
+    if (response.status !== 206) {
+        // Server ignored the Range header and sent the whole archive
+        bytes = bytes.subarray(entry.offset, entry.offset + entry.length);
+    }
+    return entry.method === 'deflate' ? inflateRaw(bytes) : bytes;
+}
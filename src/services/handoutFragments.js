@@ -0,0 +1,77 @@
+/**
+ * Handout Fragments Service for Harshi-App
+ * Loads the static handout HTML pre-rendered by scripts/render_handouts.py
+ * (public/data/handouts/index.json plus one content-hashed fragment per
+ * topic). Fragment names change whenever their content does, so they are
+ * fetched with the browser cache preferred. Each index entry carries the hash
+ * of the data the fragment was rendered from (see handoutDataHash).
+ */
+
+import { Logger } from './Logger';
+
+const publicUrl = () => process.env.PUBLIC_URL || '';
+const HANDOUT_PATH = 'data/handouts';
+
+let indexPromise = null;
+const fragmentCache = new Map();
+
+/**
+ * Load (once) the handout fragment index
+ * @returns {Promise<Object|null>} { renderer, topics } or null when not built
+ */
+export function loadHandoutIndex() {
+    if (!indexPromise) {
+        indexPromise = fetch(`${publicUrl()}/${HANDOUT_PATH}/index.json`)
+            .then(response => (response.ok ? response.json() : null))
+            .catch(error => {
+                Logger.warn('Handout index unavailable', { error: error.message });
+                indexPromise = null;
+                return null;
+            });
+    }
+    return indexPromise;
+}
+
+/**
+ * FNV-1a (32-bit, hex) of the compact JSON of a value; matches data_hash in
+ * scripts/render_handouts.py for arrays of strings
+ * @param {Array} value - [sections, terms, formulas] as built by HandoutInline
+ * @returns {string} 8 hex digits
+ */
+export function handoutDataHash(value) {
+    const bytes = new TextEncoder().encode(JSON.stringify(value));
+    let hash = 0x811c9dc5;
+    for (const byte of bytes) {
+        hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+    }
+    return hash.toString(16).padStart(8, '0');
+}
+
+/**
+ * Fetch the pre-rendered handout for a topic
+ * @param {string} topicId - Topic ID (e.g. 'phys-t1')
+ * @returns {Promise<{html: string, data: string}|null>} null when no fragment exists
+ */
+export async function loadHandoutFragment(topicId) {
+    const index = await loadHandoutIndex();
+    const entry = index?.topics?.[topicId];
+    if (!entry) return null;
+
+    if (!fragmentCache.has(entry.file)) {
+        const request = fetch(`${publicUrl()}/${HANDOUT_PATH}/${entry.file}`, { cache: 'force-cache' })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.text();
+            })
+            .then(html => ({ html, data: entry.data || null }))
+            .catch(error => {
+                Logger.warn(`Failed to load handout fragment for ${topicId}`, { error: error.message });
+                fragmentCache.delete(entry.file);
+                return null;
+            });
+        fragmentCache.set(entry.file, request);
+    }
+    return fragmentCache.get(entry.file);
+}
@@ -0,0 +1,99 @@
+/**
+ * Precache Service for Harshi-App
+ * Prefetches content into the service worker's data cache during idle time,
+ * following public/precache-manifest.json (scripts/build_precache.py): entries
+ * are taken in tier order (critical indices, topics, handouts) until the byte
+ * budget is spent. Entries whose revision is already cached are skipped.
+ */
+
+import { Logger } from './Logger';
+
+const DATA_CACHE = 'studyhub-data';
+const REVISIONS_KEY = 'studyhub.precache.revisions';
+
+const publicUrl = () => process.env.PUBLIC_URL || '';
+
+const whenIdle = () => new Promise(resolve => {
+    if (typeof window.requestIdleCallback === 'function') {
+        window.requestIdleCallback(() => resolve(), { timeout: 5000 });
+    } else {
+        setTimeout(resolve, 200);
+    }
+});
+
+function loadRevisions() {
+    try {
+        return JSON.parse(localStorage.getItem(REVISIONS_KEY)) || {};
+    } catch (error) {
+        return {};
+    }
+}
+
+/**
+ * Prefetch manifest entries in order within a byte budget
+ * @param {Object} [options]
+ * @param {number} [options.budget] - Byte budget (default: the manifest's budget)
+ * @returns {Promise<{fetched: number, skipped: number, bytes: number}>}
+ */
+export async function prefetchData({ budget } = {}) {
+    const summary = { fetched: 0, skipped: 0, bytes: 0 };
+    if (typeof caches === 'undefined') return summary;
+
+    let manifest;
+    try {
+        const response = await fetch(`${publicUrl()}/precache-manifest.json`, { cache: 'no-cache' });
+        if (!response.ok) return summary;
+        manifest = await response.json();
+    } catch (error) {
+        Logger.warn('Precache manifest unavailable', { error: error.message });
+        return summary;
+    }
+
+    if (navigator.connection?.saveData) return summary;
+    const limit = budget ?? manifest.budget ?? Infinity;
+    const cache = await caches.open(DATA_CACHE);
+    const revisions = loadRevisions();
+    const current = {};
+    let planned = 0;
+
+    for (const entry of manifest.entries) {
+        if (planned + entry.size > limit) break;
+        planned += entry.size;
+
+        const path = `${publicUrl()}/${entry.url}`;
+        if (revisions[entry.url] === entry.revision && await cache.match(path)) {
+            current[entry.url] = entry.revision;
+            summary.skipped += 1;
+            continue;
+        }
+
+        await whenIdle();
+        try {
+            const response = await fetch(path, { cache: 'no-cache' });
+            if (!response.ok) continue;
+            await cache.put(path, response);
+            current[entry.url] = entry.revision;
+            summary.fetched += 1;
+            summary.bytes += entry.size;
+        } catch (error) {
+            // Offline or flaky: keep what is cached and try again next visit
+            break;
+        }
+    }
+
+    localStorage.setItem(REVISIONS_KEY, JSON.stringify({ ...revisions, ...current }));
+    Logger.action('Precache', { ...summary, revision: manifest.revision, budget: limit });
+    return summary;
+}
+
+/**
+ * Register the data service worker (production builds only) and prefetch once the page is idle
+ */
+export function registerDataServiceWorker() {
+    if (process.env.NODE_ENV !== 'production' || !('serviceWorker' in navigator)) return;
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(`${publicUrl()}/service-worker.js`)
+            .then(() => prefetchData())
+            .catch(error => Logger.warn('Service worker registration failed', { error: error.message }));
+    });
+}
@@ -8,6 +8,7 @@
  */
 import Papa from 'papaparse';
 import { Logger } from './Logger';
+import { resolveAssetPath } from './assetManifest';
 
 const PUBLIC_URL = process.env.PUBLIC_URL || '';
 
@@ -19,9 +20,8 @@ const PUBLIC_URL = process.env.PUBLIC_URL || '';
  * @returns {Promise<Array>} Parsed data or empty array
  */
 export async function loadStudyGuideCSV(path) {
-    const url = `${PUBLIC_URL}/${path}`;
-
     try {
+        const url = `${PUBLIC_URL}/${await resolveAssetPath(path)}`;
         Logger.info(`[StudyGuideData] Loading: ${path}`);
         const response = await fetch(url);
 
@@ -52,7 +52,49 @@ export async function loadAppData() {
 }
 
 /**
- * HELPER: Normalize quiz question from CSV row
+ * HELPER: Map a typed question (questions.json) to the app's question shape
+ * The converter already normalized it: lowercase type/difficulty, integer
+ * xp_reward, defaults filled in and options as an array, so fields are only renamed
+ */
+function fromTypedQuestion(row) {
+    return {
+        id: row.question_id,
+        topic_id: row.topic_id,
+        question: row.question_text,
+        options: row.options,
+        correctAnswer: row.correct_answer,
+        hint: row.hint,
+        explanation: row.explanation,
+        difficulty: row.difficulty,
+        xpReward: row.xp_reward,
+        imageUrl: row.image_url,
+        type: row.question_type,
+        acceptedAnswers: row.accepted_answers || row.correct_answer,
+        pairs: row.pairs || '',
+    };
+}
+
+/**
+ * HELPER: Map a typed content item (content.json) to the Study_Content row shape
+ * Items arrive sorted with integer order_index; only the column names differ
+ */
+function fromTypedContent(item) {
+    return {
+        content_id: item.content_id,
+        topic_id: item.topic_id,
+        section_id: item.section_id,
+        content_type: item.content_type,
+        content_title: item.title,
+        content_text: item.content,
+        image_url: item.content_type === 'video' ? '' : item.url,
+        video_url: item.content_type === 'video' ? item.url : '',
+        svg_url: item.svg_url,
+        order_index: item.order_index
+    };
+}
+
+/**
+ * HELPER: Normalize quiz question from a hand-written CSV row (no questions.json)
  * BEST PRACTICE: Always normalize the question type to lowercase
  * FALLBACK: Default to 'mcq' if type is missing or empty
  * ERROR LOGGING: Log when falling back to MCQ
@@ -154,12 +196,15 @@ async function loadFromCSV() {
         for (const topic of topics) {
             const subject = topic.subject_key.charAt(0).toUpperCase() + topic.subject_key.slice(1);
 
-            // Load quiz questions
+            // Load quiz questions: typed JSON from the converter, else the CSV normalized here
             try {
-                const rawQuestions = await csvService.loadQuizQuestions(subject, topic.topic_folder);
-                // Normalize each question to ensure type field is present
-                const normalizedQuestions = rawQuestions.map((q, idx) => normalizeQuizQuestion(q, idx));
-                quizQuestions.push(...normalizedQuestions);
+                const typedQuestions = await csvService.loadTypedQuizQuestions(subject, topic.topic_folder);
+                if (typedQuestions) {
+                    quizQuestions.push(...typedQuestions.map(fromTypedQuestion));
+                } else {
+                    const rawQuestions = await csvService.loadQuizQuestions(subject, topic.topic_folder);
+                    quizQuestions.push(...rawQuestions.map((q, idx) => normalizeQuizQuestion(q, idx)));
+                }
             } catch (error) {
                 log(`No quiz questions for ${topic.topic_id}`, error);
             }
@@ -181,12 +226,20 @@ async function loadFromCSV() {
 
             // Load study content
             try {
-                const content = await csvService.loadStudyContent(subject, topic.topic_folder);
-                // Add topic_id to each content item if not present
-                const contentWithTopicId = content.map(item => ({
+                const [typedContent, asts] = await Promise.all([
+                    csvService.loadTypedStudyContent(subject, topic.topic_folder),
+                    csvService.loadStudyContentAst(subject, topic.topic_folder)
+                ]);
+                const content = typedContent
+                    ? typedContent.map(fromTypedContent)
+                    : await csvService.loadStudyContent(subject, topic.topic_folder);
+                // Add topic_id to each content item if not present, and its pre-parsed
+                // markdown when the sidecar was built from the same text
+                const contentWithTopicId = await Promise.all(content.map(async item => ({
                     ...item,
-                    topic_id: item.topic_id || topic.topic_id
-                }));
+                    topic_id: item.topic_id || topic.topic_id,
+                    content_ast: await csvService.astForText(asts[item.content_id], item.content_text)
+                })));
                 studyContent.push(...contentWithTopicId);
             } catch (error) {
                 log(`No study content for ${topic.topic_id}`, error);
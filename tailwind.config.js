@@ -2,7 +2,8 @@
 module.exports = {
   content: [
     "./src/**/*.{js,jsx,ts,tsx}",
-    "./public/index.html"
+    "./public/index.html",
+    "./public/data/handouts/**/*.html"
   ],
   darkMode: 'class',
   theme: {
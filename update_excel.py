@@ -2,6 +2,10 @@ import pandas as pd
 import json
 import os
 import shutil
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+import parse_cache
 
 def update_excel():
     # File paths
@@ -21,7 +25,7 @@ def update_excel():
     
     # Load Excel ...
     try:
-        xls = pd.read_excel(excel_path, sheet_name=None)
+        xls = parse_cache.read_sheet_frames(excel_path)
     except:
         xls = {} # Basic fallback
 